@@ -0,0 +1,73 @@
+# Planned fleet miles and route planning time with and without clustering stops before loading
+# usage: python -m benchmarks.clustering [--stops S] [--packages N] [--trucks T]
+
+import argparse
+import math
+import random
+import time
+
+from data_structures.graph import Graph
+from wgups.assignment import assign_packages
+from wgups.clock import Clock
+from wgups.clustering import cluster_stops
+from wgups.location_registry import LocationRegistry
+from wgups.package import Package
+from wgups.routing import RoutingOptions
+from wgups.truck import Truck
+
+
+def build_locations(num_stops):
+    """
+    Hub in the middle of num_stops random stops in a 15 mile square, weights are straight-line distances
+    """
+    registry = LocationRegistry()
+    points = [(7.5, 7.5)] + [(random.uniform(0, 15), random.uniform(0, 15)) for _ in range(num_stops)]
+    locations = Graph()
+    for num, (x, y) in enumerate(points):
+        location = registry.intern(f"{num} Main St", "Salt Lake City", "UT", "84101", f"Stop {num}")
+        locations.add_vertex(location.name, location)
+        locations.set_undirected_edges(locations.get_vertex_by_index(num),
+                                       [math.hypot(x - a, y - b) for a, b in points[:num + 1]])
+    return locations
+
+
+def plan(locations, packages, num_trucks, package_limit, clustering):
+    """
+    Load and route every truck, return planned miles and seconds spent
+    """
+    start = time.perf_counter()
+    hub = locations.get_vertex_by_index(0).data
+    trucks = [Truck(truck_id, package_limit, 18, "8:00 AM", hub, verbose=False)
+              for truck_id in range(1, num_trucks + 1)]
+    clusters = cluster_stops(locations, packages, package_limit) if clustering else None
+    assign_packages(packages, trucks, "8:00 AM", "5:00 PM", clusters=clusters)
+
+    miles = 0.0
+    for truck in trucks:
+        truck.set_locations(locations)
+        truck.find_route(RoutingOptions(exact_threshold=0))
+        miles += truck.planned_distance
+    return miles, time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--stops", type=int, default=300, help="number of stops (default 300)")
+    arg_parser.add_argument("--packages", type=int, default=600, help="number of packages (default 600)")
+    arg_parser.add_argument("--trucks", type=int, default=10, help="number of trucks (default 10)")
+    args = arg_parser.parse_args()
+
+    random.seed(args.stops)
+    locations = build_locations(args.stops)
+    end_of_day = Clock.seconds_since_start("5:00 PM", "8:00 AM")
+    packages = [Package(package_id, locations.get_vertex_by_index(random.randint(1, args.stops)).data, end_of_day,
+                        1.0, "") for package_id in range(1, args.packages + 1)]
+    package_limit = math.ceil(args.packages / args.trucks)
+
+    for clustering in (False, True):
+        miles, seconds = plan(locations, packages, args.trucks, package_limit, clustering)
+        print(f"{'clustered' if clustering else 'unclustered':12} {miles:9.1f} planned miles   {seconds:7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# Late packages and planned miles of one truck's route with and without deadline aware routing
+# usage: python -m benchmarks.deadline_routing [--stops S] [--deadline-share P] [--departure TIME]
+
+import argparse
+import random
+import time
+
+from benchmarks.clustering import build_locations
+from wgups.clock import Clock
+from wgups.package import Package
+from wgups.routing import RoutingOptions
+from wgups.truck import Truck
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--stops", type=int, default=40, help="number of stops (default 40)")
+    arg_parser.add_argument("--deadline-share", type=float, default=0.1,
+                            help="share of packages due by 10:30 AM, the rest are due at end of day (default 0.1)")
+    arg_parser.add_argument("--departure", default="8:00 AM", help="time truck leaves the hub (default 8:00 AM)")
+    args = arg_parser.parse_args()
+
+    random.seed(args.stops)
+    locations = build_locations(args.stops)
+    early = Clock.seconds_since_start("10:30 AM", "8:00 AM")
+    end_of_day = Clock.seconds_since_start("5:00 PM", "8:00 AM")
+    packages = [Package(num, locations.get_vertex_by_index(num).data,
+                        early if random.random() < args.deadline_share else end_of_day, 1.0, "")
+                for num in range(1, args.stops + 1)]
+    departure = Clock.seconds_since_start(args.departure, "8:00 AM")
+
+    for deadline_aware in (False, True):
+        truck = Truck(1, len(packages), 18, "8:00 AM", locations.get_vertex_by_index(0).data, verbose=False)
+        for package in packages:
+            truck.load_package(package)
+        truck.set_locations(locations)
+        start = time.perf_counter()
+        truck.find_route(RoutingOptions(deadline_aware=deadline_aware), departure)
+        elapsed = time.perf_counter() - start
+        least_slack = min(slack for location, slack in truck.stop_slack)
+        print(f"{'deadline aware' if deadline_aware else 'distance only':15} "
+              f"{len(truck.get_planned_late_packages()):4} late   {truck.planned_distance:7.1f} miles   "
+              f"least slack {least_slack / 60:7.1f} min   {elapsed:6.3f} s")
+
+
+if __name__ == "__main__":
+    main()
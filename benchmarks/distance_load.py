@@ -0,0 +1,77 @@
+# Time and memory to load a distance table from csv and from its binary cache
+# usage: python -m benchmarks.distance_load [--locations N] [--matrix list|numpy|mapped|packed] [--tile T]
+#                                          [--closure | --no-closure]
+
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from wgups.distance_cache import cache_path
+from wgups.loader import load_locations, read_config
+from wgups.location_registry import LocationRegistry
+
+
+def write_table(file_name, num_locations):
+    """
+    Write a random lower-triangular distance table with num_locations rows
+    """
+    with open(file_name, 'w', newline="") as f:
+        writer = csv.writer(f)
+        for row in range(num_locations):
+            distances = [round(random.uniform(0.5, 15.0), 1) for _ in range(row)] + [0.0]
+            writer.writerow([f"Location {row}", f"{row} Main St", "Salt Lake City", "UT", "84101"] + distances)
+
+
+def timed_load(config):
+    """
+    Load locations graph, return seconds taken
+    """
+    start = time.perf_counter()
+    load_locations(config, LocationRegistry())
+    return time.perf_counter() - start
+
+
+def peak_heap(config):
+    """
+    Load locations graph, return peak Python heap use in MiB, memory-mapped files are not counted
+    """
+    tracemalloc.start()
+    load_locations(config, LocationRegistry())
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--locations", type=int, default=2000, help="number of locations (default 2000)")
+    arg_parser.add_argument("--matrix", default="list", help="matrix type, list, numpy or mapped (default list)")
+    arg_parser.add_argument("--tile", type=int, default=0, help="mapped matrix tile size, 0 for row-major (default 0)")
+    arg_parser.add_argument("--closure", action=argparse.BooleanOptionalAction,
+                            default=read_config("config.ini")["metric_closure"],
+                            help="replace distances with shortest path lengths (default metric_closure in config.ini)")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        table = os.path.join(directory, "distance_table.csv")
+        write_table(table, args.locations)
+        config = {"distance_table": table, "matrix": args.matrix, "matrix_dtype": "float64",
+                  "matrix_tile": args.tile, "distance_cache": True, "metric_closure": args.closure}
+
+        print(f"{args.locations} locations, {args.matrix} matrix{', metric closure' if args.closure else ''}")
+        csv_time = timed_load(config)
+        cache_time = timed_load(config)
+        cache_size = os.path.getsize(cache_path(table)) / 2 ** 20
+        cache_heap = peak_heap(config)
+        os.remove(cache_path(table))
+        csv_heap = peak_heap(config)
+
+        print(f"csv    {csv_time:8.3f} s   peak heap {csv_heap:8.1f} MiB   cache file {cache_size:.1f} MiB")
+        print(f"cache  {cache_time:8.3f} s   peak heap {cache_heap:8.1f} MiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Planned fleet miles with each truck routed on its own, and after moving stops between trucks
+# usage: python -m benchmarks.fleet_routing [--stops S] [--packages N] [--trucks T] [--time-limit SECONDS]
+
+import argparse
+import math
+import random
+import time
+
+from benchmarks.clustering import build_locations
+from wgups.assignment import assign_packages
+from wgups.clock import Clock
+from wgups.fleet import improve_fleet
+from wgups.package import Package
+from wgups.routing import RoutingOptions
+from wgups.truck import Truck
+
+
+def plan(locations, packages, num_trucks, package_limit, time_limit):
+    """
+    Load and route every truck, move stops between trucks when time_limit is not 0,
+    return planned miles and seconds spent
+    """
+    start = time.perf_counter()
+    hub = locations.get_vertex_by_index(0).data
+    trucks = [Truck(truck_id, package_limit, 18, "8:00 AM", hub, verbose=False)
+              for truck_id in range(1, num_trucks + 1)]
+    assign_packages(packages, trucks, "8:00 AM", "5:00 PM")
+
+    options = RoutingOptions(exact_threshold=0)
+    for truck in trucks:
+        truck.set_locations(locations)
+        truck.find_route(options)
+    if time_limit != 0:
+        for index in improve_fleet(trucks, locations, "8:00 AM", "5:00 PM", time_limit=time_limit):
+            trucks[index].set_locations(locations)
+            trucks[index].find_route(options)
+    return sum(truck.planned_distance for truck in trucks), time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--stops", type=int, default=300, help="number of stops (default 300)")
+    arg_parser.add_argument("--packages", type=int, default=600, help="number of packages (default 600)")
+    arg_parser.add_argument("--trucks", type=int, default=10, help="number of trucks (default 10)")
+    arg_parser.add_argument("--time-limit", type=float, default=5.0,
+                            help="seconds spent moving stops between trucks (default 5)")
+    args = arg_parser.parse_args()
+
+    random.seed(args.stops)
+    locations = build_locations(args.stops)
+    end_of_day = Clock.seconds_since_start("5:00 PM", "8:00 AM")
+    packages = [Package(package_id, locations.get_vertex_by_index(random.randint(1, args.stops)).data, end_of_day,
+                        1.0, "") for package_id in range(1, args.packages + 1)]
+    # Room for every package with 10% to spare, so stops have somewhere to move
+    package_limit = math.ceil(args.packages * 1.1 / args.trucks)
+
+    for name, time_limit in (("per truck", 0), ("fleet", args.time_limit)):
+        miles, seconds = plan(locations, packages, args.trucks, package_limit, time_limit)
+        print(f"{name:10} {miles:9.1f} planned miles   {seconds:7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# Lookup time and table size of HashTable under insert/remove churn
+# usage: python -m benchmarks.hashtable_churn [--keys N] [--rounds R]
+
+import argparse
+import time
+
+from data_structures.hashtable import HashTable
+
+
+class Item:
+    def __init__(self, key):
+        self.key = key
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--keys", type=int, default=10000, help="number of live keys (default 10000)")
+    arg_parser.add_argument("--rounds", type=int, default=10, help="rounds of churn (default 10)")
+    args = arg_parser.parse_args()
+
+    table = HashTable()
+    for key in range(args.keys):
+        table.insert(Item(key))
+
+    # Each round removes every live key and inserts the same number of new keys
+    next_key = args.keys
+    for round_num in range(1, args.rounds + 1):
+        for key in range(next_key - args.keys, next_key):
+            table.remove(key)
+            table.insert(Item(key + args.keys))
+        next_key += args.keys
+
+        start = time.perf_counter()
+        for key in range(next_key - args.keys, next_key):
+            table.search(key)
+        search_time = time.perf_counter() - start
+
+        print(f"round {round_num:3}   items {table.num_items:8}   capacity {len(table.table):8}   "
+              f"search {search_time / args.keys * 1e6:.2f} us/key")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Probe length distribution and timing of HashTable compared with the original hash scheme
+# usage: python -m benchmarks.hashtable_probes [--keys N]
+
+import argparse
+import time
+
+from data_structures.hashtable import HashTable
+
+
+class Item:
+    def __init__(self, key):
+        self.key = key
+
+
+def legacy_probe_lengths(keys):
+    """
+    Probe lengths of the original table: djb2 hash % 223, linear probing, capacity doubling at load factor 0.75
+    :param keys: keys to insert :List<int>
+    :return: probe length of every key :List<int>
+    """
+    def legacy_hash(key):
+        string_hash = 5381
+        for char in str(key):
+            string_hash = (string_hash * 33) + ord(char)
+        return string_hash % 223
+
+    capacity = 8
+    while capacity < len(keys) / 0.75:
+        capacity *= 2
+    table = [None] * capacity
+    lengths = []
+    for key in keys:
+        bucket = legacy_hash(key) % capacity
+        probes = 0
+        while table[bucket] is not None:
+            bucket = (bucket + 1) % capacity
+            probes += 1
+        table[bucket] = key
+        lengths.append(probes)
+    return lengths
+
+
+def describe(name, lengths):
+    lengths = sorted(lengths)
+    mean = sum(lengths) / len(lengths)
+    p99 = lengths[int(len(lengths) * 0.99) - 1]
+    print(f"{name:8} mean {mean:10.2f}   p99 {p99:8}   max {lengths[-1]:8}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--keys", type=int, default=20000, help="number of keys (default 20000)")
+    arg_parser.add_argument("--skip-legacy", action="store_true", help="skip the original scheme (slow above 50k)")
+    args = arg_parser.parse_args()
+    keys = list(range(1, args.keys + 1))
+
+    print(f"{args.keys} integer keys, probe length = buckets past home bucket")
+    if not args.skip_legacy:
+        describe("legacy", legacy_probe_lengths(keys))
+
+    table = HashTable()
+    start = time.perf_counter()
+    for key in keys:
+        table.insert(Item(key))
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        table.search(key)
+    search_time = time.perf_counter() - start
+
+    describe("current", table.probe_lengths())
+    print(f"insert {insert_time / len(keys) * 1e6:.2f} us/key   search {search_time / len(keys) * 1e6:.2f} us/key")
+
+
+if __name__ == "__main__":
+    main()
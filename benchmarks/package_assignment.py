@@ -0,0 +1,66 @@
+# Time to assign a large manifest with special instructions to a fleet of trucks
+# usage: python -m benchmarks.package_assignment [--packages N] [--trucks T] [--locations L]
+
+import argparse
+import math
+import random
+import time
+
+from wgups.assignment import assign_packages
+from wgups.clock import Clock
+from wgups.location_registry import LocationRegistry
+from wgups.package import Package
+from wgups.truck import Truck
+
+
+def make_packages(num_packages, num_trucks, locations):
+    """
+    Random manifest where about 1 in 10 packages has a special instruction
+    """
+    end_of_day = Clock.seconds_since_start("5:00 PM", "8:00 AM")
+    packages = []
+    for package_id in range(1, num_packages + 1):
+        deadline = random.choice([end_of_day, end_of_day, Clock.seconds_since_start("10:30 AM", "8:00 AM")])
+        instructions = ""
+        roll = random.random()
+        if roll < 0.02:
+            instructions = f"Can only be on truck {random.randint(1, num_trucks)}"
+        elif roll < 0.05:
+            instructions = "Delayed on flight---will not arrive to depot until 9:05 am"
+        elif roll < 0.08 and package_id > 2:
+            instructions = f"Must be delivered with {package_id - 1}, {package_id - 2}"
+        elif roll < 0.081:
+            instructions = "Wrong address listed"
+        packages.append(Package(package_id, random.choice(locations), deadline, 1.0, instructions))
+    return packages
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--packages", type=int, default=50000, help="number of packages (default 50000)")
+    arg_parser.add_argument("--trucks", type=int, default=200, help="number of trucks (default 200)")
+    arg_parser.add_argument("--locations", type=int, default=2000, help="number of locations (default 2000)")
+    args = arg_parser.parse_args()
+
+    random.seed(args.packages)
+    registry = LocationRegistry()
+    locations = [registry.intern(f"{num} Main St", "Salt Lake City", "UT", "84101") for num in range(args.locations)]
+    packages = make_packages(args.packages, args.trucks, locations[1:])
+
+    # Room for every package with 5% to spare
+    package_limit = math.ceil(args.packages * 1.05 / args.trucks)
+    trucks = [Truck(truck_id, package_limit, 18, "8:00 AM", locations[0], verbose=False)
+              for truck_id in range(1, args.trucks + 1)]
+
+    start = time.perf_counter()
+    unassigned = assign_packages(packages, trucks, "8:00 AM", "5:00 PM")
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.packages} packages, {args.trucks} trucks of {package_limit}: {elapsed:.3f} s, "
+          f"{len(unassigned)} unassigned")
+    for package, reason in unassigned[:5]:
+        print(f"  package {package.package_id}: {reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Route planning time of a large fleet in Simulation.setup with different numbers of route worker processes
+# usage: python -m benchmarks.parallel_routing [--stops S] [--packages N] [--trucks T] [--workers W ...]
+
+import argparse
+import math
+import os
+import random
+import time
+
+from data_structures.graph import Graph
+from wgups.clock import Clock
+from wgups.package import Package
+from wgups.routing import RoutingOptions
+from wgups.simulation import Simulation
+
+
+def build_simulation(num_stops, num_packages):
+    """
+    Simulation with a hub in the middle of num_stops random stops in a 15 mile square, weights are straight-line
+    distances, and num_packages packages due at end of day
+    """
+    random.seed(num_stops)
+    simulation = Simulation("8:00 AM", "9:05 AM", num_packages, verbose=False)
+    points = [(7.5, 7.5)] + [(random.uniform(0, 15), random.uniform(0, 15)) for _ in range(num_stops)]
+    locations = Graph()
+    for num, (x, y) in enumerate(points):
+        location = simulation.location_registry.intern(f"{num} Main St", "Salt Lake City", "UT", "84101",
+                                                       f"Stop {num}")
+        locations.add_vertex(location.name, location)
+        locations.set_undirected_edges(locations.get_vertex_by_index(num),
+                                       [math.hypot(x - a, y - b) for a, b in points[:num + 1]])
+    simulation.locations = locations
+
+    end_of_day = Clock.seconds_since_start("5:00 PM", "8:00 AM")
+    for package_id in range(1, num_packages + 1):
+        simulation.add_package(Package(package_id, locations.get_vertex_by_index(random.randint(1, num_stops)).data,
+                                       end_of_day, 1.0, ""))
+    return simulation
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--stops", type=int, default=2000, help="number of stops (default 2000)")
+    arg_parser.add_argument("--packages", type=int, default=6000, help="number of packages (default 6000)")
+    arg_parser.add_argument("--trucks", type=int, default=100, help="number of trucks (default 100)")
+    arg_parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1],
+                            help="route worker processes to compare (default 1 and number of CPUs)")
+    args = arg_parser.parse_args()
+
+    package_limit = math.ceil(args.packages / args.trucks)
+    print(f"{os.cpu_count()} CPUs, {args.trucks} trucks of {package_limit} packages")
+    for workers in args.workers:
+        simulation = build_simulation(args.stops, args.packages)
+        options = RoutingOptions(exact_threshold=0, fleet_time_limit=0, route_workers=workers)
+        start = time.perf_counter()
+        simulation.setup(args.trucks, package_limit, 18, "8:00 AM", "5:00 PM", options, clustering=True)
+        elapsed = time.perf_counter() - start
+        summary = simulation.get_summary()
+        print(f"{workers:3} workers   setup {elapsed:7.3f} s   route planning {summary['route_planning_seconds']:7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Memory per element and push/pop timing of Queue and Stack compared with the original linked list versions
+# usage: python -m benchmarks.queue_ops [--items N] [--repeat R]
+
+import argparse
+import time
+import tracemalloc
+
+from data_structures.linked_list import Node, LinkedList
+from data_structures.queue import Queue
+from data_structures.stack import Stack
+
+
+class LegacyQueue:
+    """
+    Original queue: one Node per item in a LinkedList, pop removes the head with remove_after(0)
+    """
+    def __init__(self):
+        self._queue = LinkedList()
+
+    def push(self, item):
+        self._queue.append(Node(item))
+
+    def pop(self):
+        popped_item = self._queue.head.data
+        self._queue.remove_after(0)
+        return popped_item
+
+
+class LegacyStack:
+    """
+    Original stack: one Node per item, push prepends to the LinkedList
+    """
+    def __init__(self):
+        self._stack = LinkedList()
+
+    def push(self, item):
+        self._stack.prepend(Node(item))
+
+    def pop(self):
+        popped_item = self._stack.head.data
+        self._stack.remove_after(0)
+        return popped_item
+
+
+def measure(name, factory, count, repeat):
+    # Items are preallocated ints so only the container's own memory is measured
+    items = list(range(count))
+
+    tracemalloc.start()
+    container = factory()
+    for item in items:
+        container.push(item)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del container
+
+    # Fastest of repeat runs, slower runs are noise from the rest of the machine
+    push_time = pop_time = float("inf")
+    for _ in range(repeat):
+        container = factory()
+        start = time.perf_counter()
+        for item in items:
+            container.push(item)
+        push_time = min(push_time, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in items:
+            container.pop()
+        pop_time = min(pop_time, time.perf_counter() - start)
+
+    print(f"{name:14} {memory / count:8.1f} bytes/item   push {push_time / count * 1e9:8.1f} ns/item   "
+          f"pop {pop_time / count * 1e9:8.1f} ns/item")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--items", type=int, default=100000, help="number of items (default 100000)")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="timed runs, fastest is shown (default 5)")
+    args = arg_parser.parse_args()
+
+    print(f"{args.items} items pushed then popped, fastest of {args.repeat} runs")
+    measure("legacy queue", LegacyQueue, args.items, args.repeat)
+    measure("queue", Queue, args.items, args.repeat)
+    measure("legacy stack", LegacyStack, args.items, args.repeat)
+    measure("stack", Stack, args.items, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Memory and shortest path time on a grid of streets, sparse adjacency lists compared with a dense matrix
+# usage: python -m benchmarks.road_network [--sizes S ...] [--dense-limit N]
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from data_structures.graph import Graph
+from data_structures.matrix import ListMatrix, SparseMatrix
+
+
+def build_grid(matrix, side):
+    """
+    side x side grid of intersections joined by two-way streets of random length
+    """
+    graph = Graph(matrix)
+    for num in range(side * side):
+        graph.add_vertex(num)
+    vertices = graph.get_vertex_list()
+    for y in range(side):
+        for x in range(side):
+            index = y * side + x
+            if x + 1 < side:
+                graph.add_undirected_edge(vertices[index], vertices[index + 1], round(random.uniform(0.1, 0.5), 2))
+            if y + 1 < side:
+                graph.add_undirected_edge(vertices[index], vertices[index + side], round(random.uniform(0.1, 0.5), 2))
+    return graph
+
+
+def measure(matrix, side):
+    """
+    Build a grid, return heap used in MiB and seconds to find the path between opposite corners
+    """
+    random.seed(side)
+    tracemalloc.start()
+    graph = build_grid(matrix, side)
+    heap = tracemalloc.get_traced_memory()[0] / 2 ** 20
+    tracemalloc.stop()
+
+    vertices = graph.get_vertex_list()
+    start = time.perf_counter()
+    graph.shortest_path(vertices[0], vertices[-1])
+    return heap, time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[30, 100, 300],
+                            help="grid sides, a grid of side S has S * S intersections (default 30 100 300)")
+    arg_parser.add_argument("--dense-limit", type=int, default=2500,
+                            help="largest number of intersections also run with a dense matrix (default 2500)")
+    args = arg_parser.parse_args()
+
+    for side in args.sizes:
+        sparse_heap, sparse_time = measure(SparseMatrix(), side)
+        line = f"{side * side:8} intersections   sparse {sparse_heap:8.1f} MiB {sparse_time:7.3f} s"
+        if side * side <= args.dense_limit:
+            dense_heap, dense_time = measure(ListMatrix(), side)
+            line += f"   dense {dense_heap:8.1f} MiB {dense_time:7.3f} s"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# Time to build and improve a tour as the number of stops grows, compared with the original full scan
+# usage: python -m benchmarks.tour_construction [--stops S ...] [--candidates K]
+
+import argparse
+import random
+import time
+
+from data_structures.graph import Graph
+from data_structures.matrix import ListMatrix
+
+
+def build_graph(num_stops):
+    """
+    Graph of num_stops random points in a 15 mile square, weights are straight-line distances
+    """
+    points = [(random.uniform(0, 15), random.uniform(0, 15)) for _ in range(num_stops)]
+    graph = Graph(ListMatrix())
+    for num in range(num_stops):
+        graph.add_vertex(num)
+    for vertex in graph.get_vertex_list():
+        x, y = points[vertex.index]
+        graph.set_undirected_edges(vertex, [((x - a) ** 2 + (y - b) ** 2) ** 0.5
+                                            for a, b in points[:vertex.index + 1]])
+    return graph
+
+
+def legacy_tour(graph, start_vertex):
+    """
+    Original nearest neighbor construction: scan every unvisited vertex at each step
+    """
+    route = [start_vertex]
+    unvisited = [vertex for vertex in graph.get_vertex_list() if vertex is not start_vertex]
+    current = start_vertex
+    while unvisited:
+        closest = min(unvisited, key=lambda vertex: graph.get_edge_weight(current, vertex))
+        unvisited.remove(closest)
+        route.append(closest)
+        current = closest
+    route.append(start_vertex)
+    return route
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--stops", type=int, nargs="+", default=[500, 1000, 2000],
+                            help="numbers of stops (default 500 1000 2000)")
+    arg_parser.add_argument("--candidates", type=int, default=10, help="nearest neighbors per stop (default 10)")
+    args = arg_parser.parse_args()
+
+    for num_stops in args.stops:
+        random.seed(num_stops)
+        graph = build_graph(num_stops)
+        hub = graph.get_vertex_list()[0]
+
+        start = time.perf_counter()
+        legacy_tour(graph, hub)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        graph.nearest_neighbors(args.candidates)
+        neighbor_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        route = graph.calculate_tour(hub, args.candidates)
+        tour_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        route, saved = graph.improve_tour(route, time_limit=60, candidates=args.candidates)
+        improve_time = time.perf_counter() - start
+
+        print(f"{num_stops:6} stops   legacy tour {legacy_time:7.3f} s   neighbor lists {neighbor_time:7.3f} s   "
+              f"tour {tour_time:7.4f} s   improve {improve_time:7.3f} s ({saved:.1f} miles saved)")
+
+
+if __name__ == "__main__":
+    main()
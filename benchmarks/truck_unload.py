@@ -0,0 +1,56 @@
+# Time to unload every stop of a truck as truck capacity grows, compared with the original list scan
+# usage: python -m benchmarks.truck_unload [--stops S]
+
+import argparse
+import time
+
+from wgups.location_registry import LocationRegistry
+from wgups.package import Package
+from wgups.truck import Truck
+
+
+def load_truck(capacity, locations):
+    truck = Truck(1, capacity, 18, "8:00 AM", locations[0], verbose=False)
+    for package_id in range(capacity):
+        truck.load_package(Package(package_id, locations[1 + package_id % (len(locations) - 1)], 0, 1.0, ""))
+    return truck
+
+
+def legacy_unload(packages, location):
+    """
+    Original delivery: scan the package list for the stop, then index and pop each package
+    """
+    delivered = [x for x in packages if x.location == location]
+    for package in delivered:
+        packages.pop(packages.index(package))
+    return delivered
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--stops", type=int, default=50, help="number of stops (default 50)")
+    args = arg_parser.parse_args()
+
+    registry = LocationRegistry()
+    locations = [registry.intern(f"{num} Main St", "Salt Lake City", "UT", "84101") for num in range(args.stops + 1)]
+
+    for capacity in (100, 1000, 10000):
+        # Legacy scan runs on a plain list of the same packages
+        packages = load_truck(capacity, locations).get_package_list()
+        start = time.perf_counter()
+        for location in locations[1:]:
+            legacy_unload(packages, location)
+        legacy_time = time.perf_counter() - start
+
+        truck = load_truck(capacity, locations)
+        start = time.perf_counter()
+        for location in locations[1:]:
+            truck.unload_packages(location.location_id)
+        unload_time = time.perf_counter() - start
+
+        print(f"capacity {capacity:6}   legacy {legacy_time / capacity * 1e6:8.2f} us/package   "
+              f"current {unload_time / capacity * 1e6:6.2f} us/package")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,12 @@
+import heapq
+import math
+import time
+from array import array
+
+from .matrix import ListMatrix
+from .priority_queue import PriorityQueue
 from .queue import Queue
+from .shortest_paths import floyd_warshall
 
 
 class Vertex:
@@ -35,17 +43,33 @@ class Graph:
     """
     Graph Data Structure
 
-    space complexity: O(N^2)
+    space complexity: O(N^2), O(N + E) with a SparseMatrix
     """
-    def __init__(self):
+    def __init__(self, matrix=None):
         """
         Create a graph object
+        :param matrix: matrix used to store edge weights, default is ListMatrix, may already hold the weights
+                       of the vertices that will be added
+                       :ListMatrix, NumpyMatrix, MappedMatrix, PackedMatrix, SparseMatrix, SubMatrix
 
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
-        self.adjacency_matrix = []
-        self.vertex_list = []
+        if matrix is None:
+            matrix = ListMatrix()
+        self._matrix = matrix
+        self.vertex_list = []  # vertex_list[i] is the vertex with index i
+
+        # lookup indexes maintained by add_vertex
+        self._vertices_by_label = {}
+        self._vertex_set = set()
+
+        # nearest neighbor lists, built by nearest_neighbors and cleared when vertices or edges change
+        self._neighbors = None
+        self._neighbors_k = 0
+
+        # next hops on shortest paths, set by metric_closure and cleared when vertices or edges change
+        self._next_hops = None
 
     @property
     def size(self):
@@ -58,6 +82,28 @@ class Graph:
         """
         return len(self.vertex_list)
 
+    @property
+    def matrix(self):
+        """
+        Matrix object storing the edge weights
+        :return: edge weight storage :ListMatrix, NumpyMatrix, MappedMatrix, PackedMatrix, SparseMatrix, SubMatrix
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._matrix
+
+    @property
+    def adjacency_matrix(self):
+        """
+        Edge weights indexable as adjacency_matrix[source index][destination index]
+        :return: matrix of edge weights
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._matrix.view
+
     def add_vertex(self, label, data=None):
         """
         Add a vertex to the graph
@@ -66,19 +112,21 @@ class Graph:
         :return: None
 
         Worst Case Runtime Complexity: O(N)
-        Best Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(1) (Only for SparseMatrix)
         """
         new_vertex = Vertex(label, data)
         new_vertex.index = len(self.vertex_list)
 
         self.vertex_list.append(new_vertex)
+        self._vertex_set.add(new_vertex)
 
-        self.adjacency_matrix.append([])
-        for entry in range(0, new_vertex.index + 1):
-            self.adjacency_matrix[new_vertex.index].append(0)
+        # If labels are repeated, lookup by label finds the first vertex added
+        if label not in self._vertices_by_label:
+            self._vertices_by_label[label] = new_vertex
 
-        for entry in range(0, new_vertex.index):
-            self.adjacency_matrix[entry].append(0)
+        self._matrix.grow(len(self.vertex_list))
+        self._neighbors = None
+        self._next_hops = None
 
     def add_undirected_edge(self, vertex_a, vertex_b, weight=1):
         """
@@ -89,32 +137,54 @@ class Graph:
         :param weight: optional weight, default value is 1
         :return: None
 
-        Worst Case Runtime Complexity: O(N)
+        Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
-        if vertex_a not in self.vertex_list or vertex_b not in self.vertex_list:
+        if vertex_a not in self._vertex_set or vertex_b not in self._vertex_set:
             return
 
-        self.adjacency_matrix[vertex_a.index][vertex_b.index] = weight
-        self.adjacency_matrix[vertex_b.index][vertex_a.index] = weight
+        self._matrix.set(vertex_a.index, vertex_b.index, weight)
+        self._matrix.set(vertex_b.index, vertex_a.index, weight)
+        self._neighbors = None
+        self._next_hops = None
+
+    def set_undirected_edges(self, vertex, weights):
+        """
+        Set undirected edges between vertex and the first len(weights) vertices in the graph
+        Used to fill the graph one row at a time from a lower-triangular distance table
+        :param vertex: vertex edges start from
+        :param weights: weights of edges to vertices with index 0 to len(weights) - 1 :List<float>
+        :return: None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        self._matrix.set_symmetric_row(vertex.index, weights)
+        self._neighbors = None
+        self._next_hops = None
 
     def add_directed_edge(self, source, destination, weight=1):
         """
         Add a directed edge to the graph
         Returns if either of the provided vertices is not in graph
+        Raises ValueError if the matrix is symmetric (PackedMatrix), it can only hold undirected edges
         :param source: source vertex
         :param destination: destination vertex
         :param weight: optional edge weigh, default value is 1
         :return: None
 
-        Worst Case Runtime Complexity: O(N)
+        Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
 
-        if source not in self.vertex_list or destination not in self.vertex_list:
+        if source not in self._vertex_set or destination not in self._vertex_set:
             return
+        if self._matrix.symmetric and source is not destination:
+            raise ValueError(f"Cannot add a directed edge to a graph on a symmetric {type(self._matrix).__name__}")
 
-        self.adjacency_matrix[source.index][destination.index] = weight
+        self._matrix.set(source.index, destination.index, weight)
+        self._neighbors = None
+        self._next_hops = None
 
     def get_vertex(self, vertex_label):
         """
@@ -122,13 +192,10 @@ class Graph:
         :param vertex_label: label of desired vertex
         :return: Found Vertex, None otherwise :Vertex, None
 
-        Worst Case Runtime Complexity: O(N)
+        Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
-        for vertex in self.vertex_list:
-            if vertex.label == vertex_label:
-                return vertex
-        return None
+        return self._vertices_by_label.get(vertex_label)
 
     def get_vertex_list(self):
         """
@@ -146,12 +213,11 @@ class Graph:
         :param vertex_index: index to look for :int
         :return: vertex with given id :Vertex
 
-        Worst Case Runtime Complexity: O(N)
+        Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
-        for vertex in self.vertex_list:
-            if vertex.index == vertex_index:
-                return vertex
+        if isinstance(vertex_index, int) and 0 <= vertex_index < len(self.vertex_list):
+            return self.vertex_list[vertex_index]
         return None
 
     def get_adjacent_vertices(self, start_vertex):
@@ -162,22 +228,26 @@ class Graph:
                 Empty List if no adjacent vertices or provided vertex not found :List
 
         Worst Case Runtime Complexity: O(N)
-        Best Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(D) (Only for SparseMatrix, D is number of adjacent vertices)
         """
         result = []
-        if start_vertex not in self.vertex_list:
+        if start_vertex not in self._vertex_set:
             return result
 
-        for num, entry in enumerate(self.adjacency_matrix[start_vertex.index]):
-            if entry > 0:
-                result.append(self.vertex_list[num])
+        for num in self._matrix.nonzero(start_vertex.index):
+            result.append(self.vertex_list[num])
         return result
 
     def contains(self, vertex_label):
-        if self.get_vertex(vertex_label) is not None:
-            return True
-        else:
-            return False
+        """
+        Check if graph has a vertex with the given label
+        :param vertex_label: label to look for
+        :return: True if vertex found, otherwise False :Boolean
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return vertex_label in self._vertices_by_label
 
     def get_edge_weight(self, source, destination):
         """
@@ -189,58 +259,571 @@ class Graph:
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
-        return self.adjacency_matrix[source.index][destination.index]
+        return self._matrix.get(source.index, destination.index)
+
+    def metric_closure(self, next_hops=None):
+        """
+        Replace every edge weight with the length of the shortest path between its vertices
+        Afterwards weights satisfy the triangle inequality and shortest_path gives the vertices on each path.
+        Vectorized with numpy when it is installed.
+        :param next_hops: writable buffer of size * size ints to store next hops in, paths are then found a block
+                          of rows at a time so the matrix is never held in memory, see floyd_warshall :memoryview
+        :return: number of edge weights that were shortened :int
+
+        Worst Case Runtime Complexity: O(N^3)
+        Best Case Runtime Complexity: O(N^3)
+        """
+        next_hops, shortened = floyd_warshall(self._matrix, next_hops)
+        self._neighbors = None
+        self._next_hops = next_hops
+        return shortened
+
+    @property
+    def next_hops(self):
+        """
+        Next hops found by metric_closure, next_hops[i * size + j] is the index of the vertex after vertex i
+        on the shortest path from vertex i to vertex j, -1 if there is no path
+        :return: next hops, None if metric_closure has not been run :array, memoryview, None
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._next_hops
+
+    def set_next_hops(self, next_hops):
+        """
+        Use next hops saved from an earlier metric_closure, edge weights must already be shortest path lengths
+        :param next_hops: next hops in the layout of the next_hops property :array, memoryview
+        :return: None
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        if len(next_hops) != self.size * self.size:
+            raise ValueError(f"Expected {self.size * self.size} next hops, got {len(next_hops)}")
+        self._next_hops = next_hops
+
+    def shortest_path(self, source, destination):
+        """
+        Get the vertices on the shortest path from source to destination
+        Next hops are followed if metric_closure has been run, otherwise the path is found with dijkstra
+        :param source: source vertex
+        :param destination: destination vertex
+        :return: Queue of vertices from source to destination, both included, empty if there is no path
+
+        Worst Case Runtime Complexity: O((N + E) log N) (E is number of edges, only without metric_closure)
+        Best Case Runtime Complexity: O(1)
+        """
+        path = Queue()
+        if self._next_hops is None:
+            distances, previous = self.dijkstra(source, destination)
+            if destination.index not in previous:
+                return path
+
+            # Walk back from destination to source, then push vertices in travel order
+            indexes = [destination.index]
+            while previous[indexes[-1]] is not None:
+                indexes.append(previous[indexes[-1]])
+            path.extend(self.vertex_list[index] for index in reversed(indexes))
+            return path
+
+        current = source.index
+        if self._next_hops[current * self.size + destination.index] == -1:
+            return path
+
+        path.push(source)
+        while current != destination.index:
+            current = self._next_hops[current * self.size + destination.index]
+            path.push(self.vertex_list[current])
+        return path
+
+    def dijkstra(self, source, destination=None):
+        """
+        Find shortest path lengths from source with Dijkstra's algorithm, following edges with a positive weight
+        Only the edges of each vertex reached are read, so with a SparseMatrix the search is proportional to the
+        part of the graph it explores
+        :param source: vertex to start from
+        :param destination: vertex to stop at once its distance is known, None to reach every vertex
+        :return: distance from source and index of the previous vertex on the shortest path (None for source)
+                 for each vertex index reached, only final for destination when a destination is given
+                 :2-tuple<dict, dict>
+
+        Worst Case Runtime Complexity: O((N + E) log N) (O(N^2 log N) for dense matrices, whose rows are scanned)
+        Best Case Runtime Complexity: O(1) (Only when source is destination)
+        """
+        distances = {source.index: 0}
+        previous = {source.index: None}
+        finished = set()
+        queue = PriorityQueue()
+        queue.push((0, source.index))
+
+        while not queue.is_empty():
+            distance, index = queue.pop()
+            if index in finished:
+                continue
+            finished.add(index)
+            if destination is not None and index == destination.index:
+                break
+
+            # Relax every edge leaving the closest unfinished vertex
+            for column in self._matrix.nonzero(index):
+                new_distance = distance + self._matrix.get(index, column)
+                if column not in distances or new_distance < distances[column]:
+                    distances[column] = new_distance
+                    previous[column] = index
+                    queue.push((new_distance, column))
+        return distances, previous
+
+    def nearest_neighbors(self, k):
+        """
+        For each vertex, the indexes of the k vertices closest to it, closest first
+        Ties are broken by vertex index. Lists are cached until a vertex or edge is added.
+        :param k: maximum number of neighbors per vertex :int
+        :return: neighbors[i] is the list of vertex indexes nearest to vertex i :List<List<int>>
 
-    def calculate_tour(self, start_vertex):
+        Worst Case Runtime Complexity: O(N^2 log K)
+        Best Case Runtime Complexity: O(1) (Only when lists are cached)
+        """
+        k = min(k, len(self.vertex_list) - 1)
+        if self._neighbors is not None and self._neighbors_k == k:
+            return self._neighbors
+
+        # (weight, column) pairs order by weight then column, one extra is taken in case the vertex itself is included
+        neighbors = []
+        for index in range(len(self.vertex_list)):
+            nearest = heapq.nsmallest(k + 1, zip(self._matrix.row(index), range(len(self.vertex_list))))
+            neighbors.append([column for weight, column in nearest if column != index][:k])
+        self._neighbors = neighbors
+        self._neighbors_k = k
+        return neighbors
+
+    def calculate_tour(self, start_vertex, candidates=10):
         """
         Calculate tour based on nearest neighbor
-        The next vertex is the vertex closest to current vertex
+        The next vertex is the vertex closest to current vertex, ties go to the vertex added first.
+        The current vertex's nearest neighbor list is searched first, all vertices are only scanned when every
+        vertex on the list has been visited.
         :param start_vertex:
+        :param candidates: length of nearest neighbor lists :int
         :return: Queue of vertices to visit
 
         Worst Case Runtime Complexity: O(N^2)
-        Best Case Runtime Complexity: O(N^2)
+        Best Case Runtime Complexity: O(N K) (Only when nearest neighbor lists are cached)
         """
+        neighbors = self.nearest_neighbors(candidates)
+        weight = self._matrix.get
+        num_vertices = len(self.vertex_list)
 
         # Worst Case Runtime Complexity: O(1)
         # Best Case Runtime Complexity: O(1)
         # Once the order is determined, it is saved into a queue
         route = Queue()
+        visited = bytearray(num_vertices)
 
-        # vertices that have not been visited yet
-        unvisited = []
+        current = start_vertex.index
+        visited[current] = 1
+        route.push(start_vertex)
 
-        # Worst Case Runtime Complexity: O(N)
-        # Best Case Runtime Complexity: O(N)
-        for unvisited_vertex in self.vertex_list:
-            unvisited.append(unvisited_vertex)
+        # Worst Case Runtime Complexity: O(N^2)
+        # Best Case Runtime Complexity: O(N K)
+        for num in range(num_vertices - 1):
+            closest = None
+            for candidate in neighbors[current]:
+                if not visited[candidate]:
+                    closest = candidate
+                    break
+
+            # Every listed neighbor has been visited, scan all vertices
+            # Worst Case Runtime Complexity: O(N)
+            # Best Case Runtime Complexity: O(N)
+            if closest is None:
+                for candidate in range(num_vertices):
+                    if not visited[candidate] and (closest is None or
+                                                   weight(current, candidate) < weight(current, closest)):
+                        closest = candidate
+
+            current = closest
+            visited[current] = 1
+            route.push(self.vertex_list[current])
 
         # Worst Case Runtime Complexity: O(1)
         # Best Case Runtime Complexity: O(1)
-        current_vertex = start_vertex
-        unvisited.remove(current_vertex)
-        route.push(current_vertex)
+        route.push(start_vertex)
 
-        # Worst Case Runtime Complexity: O(N^2)
-        # Best Case Runtime Complexity: O(N^2)
-        while len(unvisited) > 0:
-            closest_vertex = None
-            for candidate in unvisited:
-                if closest_vertex is None:
-                    closest_vertex = candidate
-                if self.get_edge_weight(current_vertex, candidate) < self.get_edge_weight(current_vertex, closest_vertex):
-                    closest_vertex = candidate
-
-            current_vertex = closest_vertex
-            route.push(closest_vertex)
-            unvisited.remove(closest_vertex)
+        return route
 
-        # Worst Case Runtime Complexity: O(1)
-        # Best Case Runtime Complexity: O(1)
+    def calculate_exact_tour(self, start_vertex):
+        """
+        Calculate shortest tour visiting every vertex once using Held-Karp dynamic programming
+        cost[mask][last] is the shortest path from start_vertex through the vertices in mask ending at last.
+        Tables are stored in flat typed arrays, only practical for small graphs (about 16 vertices or less).
+        :param start_vertex: vertex the tour starts and ends at
+        :return: Queue of vertices to visit
+
+        Worst Case Runtime Complexity: O(2^N * N^2)
+        Best Case Runtime Complexity: O(2^N * N^2)
+        """
+        route = Queue()
+        stops = [vertex.index for vertex in self.vertex_list if vertex is not start_vertex]
+        num_stops = len(stops)
+
+        # Distances between stops and from start vertex to each stop
+        weight = self._matrix.get
+        distances = [[weight(a, b) for b in stops] for a in stops]
+        from_start = [weight(start_vertex.index, b) for b in stops]
+        to_start = [weight(a, start_vertex.index) for a in stops]
+
+        # Worst Case Runtime Complexity: O(2^N * N)
+        # Best Case Runtime Complexity: O(2^N * N)
+        num_masks = 1 << num_stops
+        cost = array("d", [math.inf]) * (num_masks * num_stops)
+        parent = array("b", [-1]) * (num_masks * num_stops)
+        for stop in range(num_stops):
+            cost[(1 << stop) * num_stops + stop] = from_start[stop]
+
+        # Extend every path by one stop not yet visited
+        # Worst Case Runtime Complexity: O(2^N * N^2)
+        # Best Case Runtime Complexity: O(2^N * N^2)
+        for mask in range(1, num_masks):
+            base = mask * num_stops
+            unvisited = [stop for stop in range(num_stops) if not mask & (1 << stop)]
+            for last in range(num_stops):
+                path_cost = cost[base + last]
+                if path_cost == math.inf:
+                    continue
+                row = distances[last]
+                for stop in unvisited:
+                    index = (mask | (1 << stop)) * num_stops + stop
+                    new_cost = path_cost + row[stop]
+                    if new_cost < cost[index]:
+                        cost[index] = new_cost
+                        parent[index] = last
+
+        # Close the tour with the cheapest return to the start vertex
+        route.push(start_vertex)
+        if num_stops == 0:
+            route.push(start_vertex)
+            return route
+
+        mask = num_masks - 1
+        last = min(range(num_stops), key=lambda stop: cost[mask * num_stops + stop] + to_start[stop])
+
+        # Walk parent table backwards from the last stop
+        # Worst Case Runtime Complexity: O(N)
+        # Best Case Runtime Complexity: O(N)
+        order = []
+        while last != -1:
+            order.append(last)
+            previous = parent[mask * num_stops + last]
+            mask &= ~(1 << last)
+            last = previous
+
+        for stop in reversed(order):
+            route.push(self.vertex_list[stops[stop]])
         route.push(start_vertex)
 
         return route
 
+    def tour_distance(self, route):
+        """
+        Total weight of the edges along a route, route is left unchanged
+        :param route: Queue of vertices in the order visited
+        :return: total distance :float
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        return self._tour_distance([vertex.index for vertex in route])
+
+    def improve_tour(self, route, max_iterations=100, time_limit=None, candidates=10):
+        """
+        Shorten a tour with 2-opt and Or-opt local search
+        2-opt reverses a section of the tour, Or-opt moves a run of 1 to 3 vertices (optionally reversed)
+        to another position. Only moves that add an edge from a vertex to one of its nearest neighbors are tried,
+        so each pass is O(N * K) instead of O(N^2). Each move is evaluated in O(1) from the edges it changes.
+        Edge weights are assumed to be symmetric.
+        :param route: Queue of vertices starting and ending at the same vertex, as returned by calculate_tour
+        :param max_iterations: maximum number of passes over all moves :int
+        :param time_limit: maximum number of seconds to search, no limit if None :float
+        :param candidates: length of nearest neighbor lists :int
+        :return: improved Queue of vertices to visit, distance saved :2-tuple
+
+        Worst Case Runtime Complexity: O(N^2 log K + I * N^2) (I is max_iterations, reversals are O(N))
+        Best Case Runtime Complexity: O(N K)
+        """
+        tour = [vertex.index for vertex in route]
+        last = len(tour) - 1
+        neighbors = self.nearest_neighbors(candidates)
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        weight = self._matrix.get
+        epsilon = 1e-9
+        initial_distance = self._tour_distance(tour)
+
+        # position[v] is where vertex v is in the tour, the start vertex is at both 0 and last
+        position = [0] * len(self.vertex_list)
+        for num in range(last):
+            position[tour[num]] = num
+
+        def positions(vertex):
+            return (0, last) if vertex == tour[0] else (position[vertex],)
+
+        def reverse(first, end):
+            # Reverse tour[first..end] and update positions, start vertex never moves
+            tour[first:end + 1] = reversed(tour[first:end + 1])
+            for num in range(first, end + 1):
+                position[tour[num]] = num
+
+        iteration = 0
+        improved = True
+        while improved and iteration < max_iterations:
+            improved = False
+            iteration += 1
+
+            # 2-opt: replace edges (tour[p], tour[p + 1]) and (tour[q], tour[q + 1]) with
+            # (tour[p], tour[q]) and (tour[p + 1], tour[q + 1]) by reversing tour[p + 1..q]
+            # a new edge joins a vertex to one of its neighbors, taking the place of the edge to its successor
+            # (a is tour[p] or tour[q]) or predecessor (a is tour[p + 1] or tour[q + 1])
+            # Worst Case Runtime Complexity: O(N * K * N)
+            # Best Case Runtime Complexity: O(N * K)
+            for i in range(last + 1):
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+                a = tour[i]
+                for offset in (1, -1):
+                    if not 0 <= i + offset <= last:
+                        continue
+                    current_weight = weight(a, tour[i + offset])
+                    moved = False
+                    for c in neighbors[a]:
+                        if weight(a, c) >= current_weight - epsilon:
+                            break
+                        for j in positions(c):
+                            p, q = min(i, j), max(i, j)
+                            if offset == -1:
+                                p, q = p - 1, q - 1
+                            if p < 0 or q > last - 1 or q <= p + 1:
+                                continue
+                            delta = (weight(tour[p], tour[q]) + weight(tour[p + 1], tour[q + 1]) -
+                                     weight(tour[p], tour[p + 1]) - weight(tour[q], tour[q + 1]))
+                            if delta < -epsilon:
+                                reverse(p + 1, q)
+                                improved = moved = True
+                                break
+                        if moved:
+                            break
+                    if moved:
+                        break
+
+            # Or-opt: move segment tour[i..j] between tour[k] and tour[k + 1], start and end stay in place
+            # the segment is only tried next to neighbors of its first and last vertex
+            # Worst Case Runtime Complexity: O(N * K * N)
+            # Best Case Runtime Complexity: O(N * K)
+            for segment_length in range(1, 4):
+                i = 1
+                while i + segment_length <= last:
+                    if deadline is not None and time.perf_counter() > deadline:
+                        break
+                    j = i + segment_length - 1
+                    prev, first, end, nxt = tour[i - 1], tour[i], tour[j], tour[j + 1]
+                    removal_gain = weight(prev, first) + weight(end, nxt) - weight(prev, nxt)
+
+                    moved = False
+                    for vertex in (first, end):
+                        for c in neighbors[vertex]:
+                            if weight(vertex, c) >= removal_gain - epsilon:
+                                break
+                            for c_position in positions(c):
+                                for k in (c_position - 1, c_position):
+                                    if k < 0 or k > last - 1 or i - 1 <= k <= j:
+                                        continue
+                                    p, q = tour[k], tour[k + 1]
+                                    forward = weight(p, first) + weight(end, q) - weight(p, q)
+                                    backward = weight(p, end) + weight(first, q) - weight(p, q)
+                                    if min(forward, backward) - removal_gain < -epsilon:
+                                        segment = tour[i:j + 1]
+                                        if backward < forward:
+                                            segment.reverse()
+                                        del tour[i:j + 1]
+                                        if k > j:
+                                            k -= segment_length
+                                        tour[k + 1:k + 1] = segment
+                                        for num in range(min(i, k + 1), max(j, k + segment_length) + 1):
+                                            position[tour[num]] = num
+                                        improved = moved = True
+                                        break
+                                if moved:
+                                    break
+                            if moved:
+                                break
+                        if moved:
+                            break
+                    i += 1
+
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+
+        result = Queue(self.vertex_list[index] for index in tour)
+        return result, initial_distance - self._tour_distance(tour)
+
+    def tour_arrivals(self, route, speed, start_time=0):
+        """
+        Time each vertex of a route is reached, route is left unchanged
+        :param route: Queue of vertices in the order visited
+        :param speed: distance covered per unit of time :float
+        :param start_time: time the route starts :float
+        :return: arrival time of each vertex in route order, the first is start_time :List<float>
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        tour = [vertex.index for vertex in route]
+        arrivals = [start_time] if tour else []
+        distance = 0.0
+        for num in range(1, len(tour)):
+            distance += self._matrix.get(tour[num - 1], tour[num])
+            arrivals.append(start_time + distance / speed)
+        return arrivals
+
+    def repair_time_windows(self, route, deadlines, speed, start_time=0, max_iterations=100, time_limit=None,
+                            candidates=10):
+        """
+        Reorder a tour so vertices are reached by their deadlines
+        Lateness of a tour is the sum of how long after its deadline each vertex is reached. For each late vertex
+        two moves are tried: moving it to an earlier position, and moving a vertex before it to right after it or
+        after one of the moved vertex's nearest neighbors further along. The move that removes the most lateness
+        is made, shorter tours break ties. Once no move removes lateness, Or-opt and 2-opt moves to nearest neighbors
+        shorten the tour where they add no lateness. A tour with no lateness is unchanged.
+        Arrival distances and lateness are kept as prefix sums, a move is evaluated from the first position
+        it changes and stops early once it is no better than the best move so far.
+        :param route: Queue of vertices starting and ending at the same vertex
+        :param deadlines: vertex index -> latest time the vertex should be reached, other vertices have no
+                          deadline :dict
+        :param speed: distance covered per unit of time :float
+        :param start_time: time the tour starts :float
+        :param max_iterations: maximum number of moves :int
+        :param time_limit: maximum number of seconds to search, no limit if None :float
+        :param candidates: length of nearest neighbor lists :int
+        :return: reordered Queue of vertices to visit, lateness removed :2-tuple
+
+        Worst Case Runtime Complexity: O(I * L * N * (N + K)) (I is max_iterations, L number of late vertices)
+        Best Case Runtime Complexity: O(N)
+        """
+        tour = [vertex.index for vertex in route]
+        last = len(tour) - 1
+        weight = self._matrix.get
+        epsilon = 1e-9
+        stop_time = None if time_limit is None else time.perf_counter() + time_limit
+
+        # Latest distance from the start each vertex can be reached at
+        limits = {index: (deadline - start_time) * speed for index, deadline in deadlines.items()}
+
+        def suffix_lateness(suffix, previous, distance, bound):
+            # Lateness of suffix visited after previous at distance, stops once it reaches bound
+            lateness = 0.0
+            for index in suffix:
+                distance += weight(previous, index)
+                if index in limits and distance > limits[index]:
+                    lateness += distance - limits[index]
+                    if lateness > bound + epsilon:
+                        break
+                previous = index
+            return lateness
+
+        def prefix_sums():
+            # reached[p] is the distance tour[p] is reached at, late_before[p] the lateness of tour[0..p - 1]
+            reached, late_before = [0.0], [0.0]
+            for num in range(1, last + 1):
+                reached.append(reached[-1] + weight(tour[num - 1], tour[num]))
+                late_before.append(late_before[-1] + max(reached[num - 1] - limits.get(tour[num - 1], math.inf), 0))
+            late_before.append(late_before[-1] + max(reached[last] - limits.get(tour[last], math.inf), 0))
+            return reached, late_before
+
+        reached, late_before = prefix_sums()
+        initial_lateness = late_before[-1]
+        if last < 3 or initial_lateness <= epsilon:
+            return Queue(self.vertex_list[index] for index in tour), 0.0
+        neighbors = self.nearest_neighbors(candidates)
+
+        def better(best, first, suffix):
+            # (lateness, distance, tour) with tour[first..] replaced by suffix if it has less lateness than best,
+            # or the same lateness and a shorter distance, otherwise best
+            lateness = late_before[first] + suffix_lateness(suffix, tour[first - 1], reached[first - 1],
+                                                            best[0] - late_before[first])
+            if lateness > best[0] + epsilon:
+                return best
+            new_tour = tour[:first] + suffix
+            distance = self._tour_distance(new_tour)
+            if lateness < best[0] - epsilon or distance < best[1] - epsilon:
+                return lateness, distance, new_tour
+            return best
+
+        for iteration in range(max_iterations):
+            if stop_time is not None and time.perf_counter() > stop_time:
+                break
+            position = {index: num for num, index in enumerate(tour[:last])}
+            best = (late_before[-1], reached[last], None)
+
+            # Worst Case Runtime Complexity: O(L * N * (N + K))
+            # Best Case Runtime Complexity: O(N)
+            for i in range(1, last):
+                late = tour[i]
+                if reached[i] <= limits.get(late, math.inf):
+                    continue
+
+                # Late vertex moves before tour[j]
+                rest = tour[i + 1:]
+                for j in range(1, i):
+                    best = better(best, j, [late] + tour[j:i] + rest)
+
+                # A vertex before the late vertex moves after tour[m], m is i or the position of a neighbor
+                for k in range(1, i):
+                    moving = tour[k]
+                    targets = {i} | {position[x] for x in neighbors[moving] if x in position and position[x] >= i}
+                    for m in sorted(targets):
+                        best = better(best, k, tour[k + 1:m + 1] + [moving] + tour[m + 1:])
+
+            # No lateness left to remove, shorten the tour without adding lateness: move a vertex next to one of
+            # its nearest neighbors, or reverse the section after it so a nearest neighbor follows it (2-opt)
+            # Worst Case Runtime Complexity: O(N * K * N)
+            # Best Case Runtime Complexity: O(N * K)
+            if best[2] is None:
+                for k in range(1, last):
+                    moving = tour[k]
+                    for x in neighbors[moving]:
+                        if x not in position:
+                            continue
+                        for m in (position[x] - 1, position[x]):
+                            if 0 <= m < k - 1:
+                                best = better(best, m + 1, [moving] + tour[m + 1:k] + tour[k + 1:])
+                            elif m > k:
+                                best = better(best, k, tour[k + 1:m + 1] + [moving] + tour[m + 1:])
+                        if position[x] > k + 1:
+                            best = better(best, k + 1, tour[position[x]:k:-1] + tour[position[x] + 1:])
+                    if best[2] is not None:
+                        break
+
+            if best[2] is None:
+                break
+            tour = best[2]
+            reached, late_before = prefix_sums()
+
+        result = Queue(self.vertex_list[index] for index in tour)
+        return result, (initial_lateness - late_before[-1]) / speed
+
+    def _tour_distance(self, tour):
+        """
+        Total weight of the edges along a tour
+        :param tour: vertex indexes in the order visited :List<int>
+        :return: total distance :float
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        total = 0.0
+        for num in range(1, len(tour)):
+            total += self._matrix.get(tour[num - 1], tour[num])
+        return total
+
     def print_adjacency_matrix(self):
         """
         Print the adjacency matrix
@@ -249,6 +832,6 @@ class Graph:
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
-        for row in self.adjacency_matrix:
-            print(row)
+        for index in range(self._matrix.size):
+            print(self._matrix.row(index))
 
@@ -4,15 +4,26 @@ class EmptyBucket:
 
 class HashTable:
     """
-    Hashtable using Linear Probing for collision resolution
+    Hashtable using Robin Hood Linear Probing for collision resolution
+        capacity is always a power of two so a bucket is the low bits of a well-mixed hash,
+        an item that has probed further from its home bucket takes the bucket of an item that has probed less,
+        which keeps probe lengths short and even.
+        Removed items leave an EMPTY_AFTER_REMOVAL bucket, which is skipped by probing and
+        only reused when the table is rebuilt
 
     Space complexity: O(N)
     """
+    # Mask to keep hash values within 64 bits
+    HASH_MASK = (1 << 64) - 1
+
+    # Table is compacted when more than this fraction of buckets are EMPTY_AFTER_REMOVAL
+    MAX_REMOVED_RATIO = 0.25
+
     def __init__(self, initial_capacity=10):
         """
         Creates a HashTable Object
 
-        :param initial_capacity initial capacity of the hash table
+        :param initial_capacity initial capacity of the hash table, rounded up to a power of two
 
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
@@ -22,10 +33,18 @@ class HashTable:
         self.EMPTY_SINCE_START = EmptyBucket()
         self.EMPTY_AFTER_REMOVAL = EmptyBucket()
 
+        capacity = 8
+        while capacity < initial_capacity:
+            capacity *= 2
+
         # Initialize table with EMPTY_SINCE_START buckets
-        self.table = [self.EMPTY_SINCE_START] * initial_capacity
+        self.table = [self.EMPTY_SINCE_START] * capacity
+
+        # hash of the item in each bucket, None for empty buckets
+        self._hashes = [None] * capacity
 
         self._num_items = 0
+        self._num_removed = 0  # number of EMPTY_AFTER_REMOVAL buckets
 
     @property
     def num_items(self):
@@ -42,19 +61,39 @@ class HashTable:
         """
         Returns a hash of the provided key
         :param key: key to be hashed :str, int
-        :return: hashed key :int
+        :return: hashed key, 64 bit :int
 
-        Hashes a key using the multiplicative hash algorithm
-        Key can be a string or any time that can be converted to a string using the str() method
-        The value 223 was chosen for N using trial and error to minimize collisions
+        Integer keys are used directly, other keys are converted to a string and hashed with the
+        multiplicative (djb2) string hash. The result is mixed with the splitmix64 finalizer so that
+        every bit of the hash depends on every bit of the key, and the low bits alone give a good bucket.
 
-        Worst Case Runtime Complexity: O(N)
-        Best Case Runtime Complexity: O(N)
+        Worst Case Runtime Complexity: O(N) (N is length of key)
+        Best Case Runtime Complexity: O(1)
+        """
+        if isinstance(key, int):
+            value = key & self.HASH_MASK
+        else:
+            value = 5381
+            for char in str(key):
+                value = ((value * 33) + ord(char)) & self.HASH_MASK
+
+        value = (value + 0x9E3779B97F4A7C15) & self.HASH_MASK
+        value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & self.HASH_MASK
+        value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & self.HASH_MASK
+        return value ^ (value >> 31)
+
+    def _probe_length(self, bucket, key_hash):
         """
-        string_hash = 5381
-        for char in str(key):
-            string_hash = (string_hash * 33) + ord(char)
-        return string_hash % 223
+        Number of buckets between an item's home bucket and the bucket it is stored in
+        :param bucket: bucket item is stored in :int
+        :param key_hash: hash of item's key :int
+        :return: probe length :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        mask = len(self.table) - 1
+        return (bucket - (key_hash & mask)) & mask
 
     def insert(self, item):
         """
@@ -66,30 +105,88 @@ class HashTable:
         Worst Case Runtime Complexity: O(N) (Only when table is resized)
         Best Case Runtime Complexity: O(1)
         """
-        if not hasattr(item, "key"):
+        if not hasattr(item, "key") or self.search(item.key) is not None:
             return False
 
-        bucket = self.hash(item.key) % len(self.table)
+        if not self._place(item, self.hash(item.key)):
+            # Table is full, cannot be inserted
+            return False
+        self._num_items += 1
+
+        # If hashtable (including removed buckets) has a load factor greater than 0.75, resize table
+        if (self.num_items + self._num_removed) / len(self.table) > 0.75:
+            self._resize()
+
+        return True
+
+    def _place(self, item, item_hash):
+        """
+        Store item in the table using Robin Hood probing, does not check for duplicates or update counts
+        :param item: item to be stored
+        :param item_hash: hash of item's key :int
+        :return: True if item stored, False if the table is full
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(1)
+        """
+        mask = len(self.table) - 1
+        bucket = item_hash & mask
+        distance = 0
         buckets_probed = 0
         while buckets_probed < len(self.table):
-            if type(self.table[bucket]) is EmptyBucket:
-                # Bucket is empty, insert item
+            if self.table[bucket] is self.EMPTY_SINCE_START:
+                # Bucket is empty, store item
                 self.table[bucket] = item
-                self._num_items += 1
-
-                # If hashtable has a load factor greater than 0.75, resize table
-                if self.num_items / len(self.table) > 0.75:
-                    self._resize()
-
+                self._hashes[bucket] = item_hash
                 return True
 
+            # Bucket holds an item closer to its home bucket, take its place and keep probing with it
+            # Buckets emptied by removal are skipped, filling them could hide items further along
+            if self.table[bucket] is not self.EMPTY_AFTER_REMOVAL and \
+                    self._probe_length(bucket, self._hashes[bucket]) < distance:
+                existing_distance = self._probe_length(bucket, self._hashes[bucket])
+                item, self.table[bucket] = self.table[bucket], item
+                item_hash, self._hashes[bucket] = self._hashes[bucket], item_hash
+                distance = existing_distance
+
             # Bucket full continue probing with next bucket in the table
-            bucket = (bucket + 1) % len(self.table)
+            bucket = (bucket + 1) & mask
+            distance += 1
             buckets_probed += 1
 
-        # Table is full, cannot be inserted
         return False
 
+    def _find_bucket(self, key):
+        """
+        Find bucket holding the item with the given key
+        Probing stops early at an item closer to its home bucket than the key would be,
+        Robin Hood insertion would have placed the key before that item
+        :param key: key of item being searched
+        :return: bucket index, None if not found :int, None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(1)
+        """
+        key_hash = self.hash(key)
+        mask = len(self.table) - 1
+        bucket = key_hash & mask
+        distance = 0
+        while self.table[bucket] is not self.EMPTY_SINCE_START and distance < len(self.table):
+            if self.table[bucket] is not self.EMPTY_AFTER_REMOVAL:
+                # Item was found
+                if self._hashes[bucket] == key_hash and self.table[bucket].key == key:
+                    return bucket
+
+                if self._probe_length(bucket, self._hashes[bucket]) < distance:
+                    return None
+
+            # bucket was occupied, keep probing
+            bucket = (bucket + 1) & mask
+            distance += 1
+
+        # Item not found
+        return None
+
     def remove(self, key):
         """
         Remove item from the hashtable if it exists
@@ -99,20 +196,21 @@ class HashTable:
         Worst Case Runtime Complexity: O(N)
         Best Case Runtime Complexity: O(1)
         """
-        bucket = self.hash(key) % len(self.table)
-        buckets_probed = 0
-        while self.table[bucket] is not self.EMPTY_SINCE_START and buckets_probed < len(self.table):
-            if type(self.table[bucket]) != EmptyBucket and self.table[bucket].key == key:
-                self.table[bucket] = self.EMPTY_AFTER_REMOVAL
-                self._num_items -= 1
-                # Item found and removed
-                return True
+        bucket = self._find_bucket(key)
+        if bucket is None:
+            # Item not found
+            return False
 
-            # bucket was occupied, so keep probing
-            bucket = (bucket + 1) % len(self.table)
-            buckets_probed += 1
-        # Item not found
-        return False
+        self.table[bucket] = self.EMPTY_AFTER_REMOVAL
+        self._hashes[bucket] = None
+        self._num_items -= 1
+        self._num_removed += 1
+
+        # Too many removed buckets lengthen probing, rebuild table at the same size without them
+        if self._num_removed / len(self.table) > self.MAX_REMOVED_RATIO:
+            self._rebuild(len(self.table))
+        # Item found and removed
+        return True
 
     def search(self, key):
         """
@@ -123,34 +221,59 @@ class HashTable:
         Worst Case Runtime Complexity: O(N)
         Best Case Runtime Complexity: O(1)
         """
-        bucket = self.hash(key) % len(self.table)
-        buckets_probed = 0
-        while self.table[bucket] is not self.EMPTY_SINCE_START and buckets_probed < len(self.table):
-
-            # Item was found
-            if type(self.table[bucket]) != EmptyBucket and self.table[bucket].key == key:
-                return self.table[bucket]
+        bucket = self._find_bucket(key)
+        if bucket is None:
+            return None
+        return self.table[bucket]
 
-            # bucket was occupied, keep probing
-            bucket = (bucket + 1) % len(self.table)
-            buckets_probed += 1
+    def probe_lengths(self):
+        """
+        Probe length of every item in the table, used to measure how well keys are spread
+        :return: probe lengths :List<int>
 
-        # Item not found
-        return None
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        return [self._probe_length(bucket, key_hash) for bucket, key_hash in enumerate(self._hashes)
+                if key_hash is not None]
 
     def _resize(self):
         """
         Resize table to make more room for new items
+        If most of the used buckets are removed buckets, the table is compacted at the same size instead
 
         Worst Case Runtime Complexity: O(N)
         Best Case Runtime Complexity: O(N)
         :return: None
         """
-        temp = self.table
-        self.table = [self.EMPTY_SINCE_START] * (len(self.table) * 2)
+        if self.num_items / len(self.table) > 0.375:
+            self._rebuild(len(self.table) * 2)
+        else:
+            self._rebuild(len(self.table))
+
+    def _rebuild(self, capacity):
+        """
+        Rebuild table with the given capacity from live items only, removed buckets are dropped
+        Stored hashes are reused so keys are not hashed again and the item count does not change.
+        When capacity is unchanged the existing lists are reused.
+        :param capacity: new capacity, power of two :int
+        :return: None
 
-        for item in temp:
-            self.insert(item)
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        live_items = [(item, key_hash) for item, key_hash in zip(self.table, self._hashes) if key_hash is not None]
+
+        if capacity == len(self.table):
+            self.table[:] = [self.EMPTY_SINCE_START] * capacity
+            self._hashes[:] = [None] * capacity
+        else:
+            self.table = [self.EMPTY_SINCE_START] * capacity
+            self._hashes = [None] * capacity
+        self._num_removed = 0
+
+        for item, key_hash in live_items:
+            self._place(item, key_hash)
 
     def __iter__(self):
         return HashTableIterator(self)
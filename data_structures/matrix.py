@@ -0,0 +1,950 @@
+from array import array
+
+try:
+    import numpy
+except ImportError:  # numpy is optional, only needed for NumpyMatrix
+    numpy = None
+
+
+class ListMatrix:
+    """
+    Square matrix of edge weights stored as a list of Python lists
+
+    space complexity: O(N^2)
+    """
+    symmetric = False  # true when weight (row, column) is always weight (column, row)
+
+    def __init__(self):
+        """
+        Create an empty matrix
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self.rows = []
+
+    @property
+    def size(self):
+        """
+        Number of rows (and columns) in the matrix
+        :return: size of matrix :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return len(self.rows)
+
+    @property
+    def view(self):
+        """
+        Matrix indexable as view[row][column]
+        :return: list of rows :List<List<float>>
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self.rows
+
+    def grow(self, new_size):
+        """
+        Add rows and columns of zeros until matrix has new_size rows
+        :param new_size: new number of rows :int
+        :return: None
+
+        Worst Case Runtime Complexity: O(N^2)
+        Best Case Runtime Complexity: O(N)
+        """
+        added = new_size - len(self.rows)
+        if added <= 0:
+            return
+
+        for row in self.rows:
+            row.extend([0] * added)
+        for num in range(added):
+            self.rows.append([0] * new_size)
+
+    def get(self, row, column):
+        """
+        Get weight at row, column
+        :return: weight :float
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self.rows[row][column]
+
+    def set(self, row, column, weight):
+        """
+        Set weight at row, column
+        :return: None
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self.rows[row][column] = weight
+
+    def set_symmetric_row(self, index, weights):
+        """
+        Set weights between index and the first len(weights) rows in both directions
+        :param index: row to set :int
+        :param weights: weights for columns 0 to len(weights) - 1 :List<float>
+        :return: None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        for column, weight in enumerate(weights):
+            self.rows[index][column] = weight
+            self.rows[column][index] = weight
+
+    def set_row(self, index, weights):
+        """
+        Set the first len(weights) weights of a row, used to copy rows from another matrix
+        :param index: row to set :int
+        :param weights: weights for columns 0 to len(weights) - 1 :Iterable<float>
+        :return: None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        self.rows[index][:len(weights)] = weights
+
+    def row(self, index):
+        """
+        Get a whole row of the matrix
+        :param index: row index :int
+        :return: row of weights :List<float>
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self.rows[index]
+
+    def nonzero(self, index):
+        """
+        Get columns with a positive weight in a row
+        :param index: row index :int
+        :return: column indexes :List<int>
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        return [column for column, weight in enumerate(self.rows[index]) if weight > 0]
+
+
+class PackedMatrix:
+    """
+    Symmetric matrix of edge weights, only the lower triangle is stored, packed row by row in one flat typed array
+        weight (row, column) with column <= row is at row * (row + 1) / 2 + column, (row, column) and (column, row)
+        are the same weight so setting one sets both
+        adding a row appends to the end of the array, nothing is moved
+
+    space complexity: O(N^2 / 2)
+    """
+    symmetric = True  # true when weight (row, column) is always weight (column, row)
+
+    def __init__(self, typecode="d"):
+        """
+        Create an empty matrix
+        :param typecode: array typecode of weights, "d" for 64-bit or "f" for 32-bit floats :str
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._data = array(typecode)
+        self._size = 0
+
+    @property
+    def size(self):
+        """
+        Number of rows (and columns) in the matrix
+        :return: size of matrix :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._size
+
+    @property
+    def view(self):
+        """
+        Matrix indexable as view[row][column] for reading, rows are copies
+        :return: the matrix itself, indexing it returns a row :PackedMatrix
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self
+
+    def __getitem__(self, index):
+        """
+        Get a whole row of the matrix, allows view[row][column]
+        :param index: row index :int
+        :return: copy of row :array
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        return self.row(index)
+
+    def grow(self, new_size):
+        """
+        Add rows and columns of zeros until matrix has new_size rows
+        :param new_size: new number of rows :int
+        :return: None
+
+        Worst Case Runtime Complexity: O(N^2) (Only when the array has to be moved to grow)
+        Best Case Runtime Complexity: O(N)
+        """
+        if new_size <= self._size:
+            return
+        zeros = array(self._data.typecode, [0]) * (new_size * (new_size + 1) // 2 - len(self._data))
+        if self._data:
+            self._data.extend(zeros)
+        else:
+            self._data = zeros
+        self._size = new_size
+
+    def get(self, row, column):
+        """
+        Get weight at row, column
+        :return: weight :float
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        if column > row:
+            row, column = column, row
+        return self._data[row * (row + 1) // 2 + column]
+
+    def set(self, row, column, weight):
+        """
+        Set weight at row, column and column, row
+        :return: None
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        if column > row:
+            row, column = column, row
+        self._data[row * (row + 1) // 2 + column] = weight
+
+    def set_symmetric_row(self, index, weights):
+        """
+        Set weights between index and the first len(weights) rows in both directions
+        :param index: row to set :int
+        :param weights: weights for columns 0 to len(weights) - 1 :List<float>
+        :return: None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        self.set_row(index, weights)
+        for column in range(index + 1, len(weights)):
+            self.set(index, column, weights[column])
+
+    def set_row(self, index, weights):
+        """
+        Set the first len(weights) weights of a row, used to copy rows from another symmetric matrix
+        Only columns up to index are stored, the rest of the row is the same weights as the rows after it
+        which are stored when those rows are set
+        :param index: row to set :int
+        :param weights: weights for columns 0 to len(weights) - 1 :Iterable<float>
+        :return: None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        stored = array(self._data.typecode, weights[:index + 1])
+        start = index * (index + 1) // 2
+        self._data[start:start + len(stored)] = stored
+
+    def row(self, index):
+        """
+        Get a whole row of the matrix
+        :param index: row index :int
+        :return: copy of row :array
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        start = index * (index + 1) // 2
+        result = self._data[start:start + index + 1]
+        result.extend(self._data[column * (column + 1) // 2 + index] for column in range(index + 1, self._size))
+        return result
+
+    def nonzero(self, index):
+        """
+        Get columns with a positive weight in a row
+        :param index: row index :int
+        :return: column indexes :List<int>
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        return [column for column, weight in enumerate(self.row(index)) if weight > 0]
+
+
+class SparseMatrix:
+    """
+    Square matrix of edge weights stored as adjacency lists, one dict of column: weight per row
+        only positive weights are stored, a weight of 0 is no edge just as in the dense matrices
+        rows with no edges take no space, so memory is proportional to vertices and edges, suited to
+        road networks where each vertex has few edges
+
+    space complexity: O(N + E) (E is number of edges)
+    """
+    symmetric = False  # true when weight (row, column) is always weight (column, row)
+
+    def __init__(self):
+        """
+        Create an empty matrix
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._rows = []  # _rows[i] is a dict of column: weight, None if row i has no edges
+
+    @property
+    def size(self):
+        """
+        Number of rows (and columns) in the matrix
+        :return: size of matrix :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return len(self._rows)
+
+    @property
+    def view(self):
+        """
+        Matrix indexable as view[row][column] for reading, rows are dense copies
+        :return: the matrix itself, indexing it returns a row :SparseMatrix
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self
+
+    def __getitem__(self, index):
+        """
+        Get a whole row of the matrix, allows view[row][column]
+        :param index: row index :int
+        :return: dense copy of row :List<float>
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        return self.row(index)
+
+    def grow(self, new_size):
+        """
+        Add rows and columns with no edges until matrix has new_size rows
+        :param new_size: new number of rows :int
+        :return: None
+
+        Worst Case Runtime Complexity: O(N) (Only when the row list has to be moved to grow)
+        Best Case Runtime Complexity: O(1) (Only when adding one row)
+        """
+        if new_size > len(self._rows):
+            self._rows.extend([None] * (new_size - len(self._rows)))
+
+    def get(self, row, column):
+        """
+        Get weight at row, column
+        :return: weight, 0 if there is no edge :float
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        edges = self._rows[row]
+        return edges.get(column, 0) if edges else 0
+
+    def set(self, row, column, weight):
+        """
+        Set weight at row, column, a weight of 0 removes the edge
+        :return: None
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        edges = self._rows[row]
+        if weight > 0:
+            if edges is None:
+                edges = self._rows[row] = {}
+            edges[column] = weight
+        elif edges:
+            edges.pop(column, None)
+
+    def set_symmetric_row(self, index, weights):
+        """
+        Set weights between index and the first len(weights) rows in both directions
+        :param index: row to set :int
+        :param weights: weights for columns 0 to len(weights) - 1 :List<float>
+        :return: None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        for column, weight in enumerate(weights):
+            self.set(index, column, weight)
+            self.set(column, index, weight)
+
+    def set_row(self, index, weights):
+        """
+        Set the first len(weights) weights of a row, used to copy rows from another matrix
+        :param index: row to set :int
+        :param weights: weights for columns 0 to len(weights) - 1 :Iterable<float>
+        :return: None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        for column, weight in enumerate(weights):
+            self.set(index, column, weight)
+
+    def row(self, index):
+        """
+        Get a whole row of the matrix
+        :param index: row index :int
+        :return: dense copy of row :List<float>
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        result = [0] * len(self._rows)
+        for column, weight in (self._rows[index] or {}).items():
+            result[column] = weight
+        return result
+
+    def nonzero(self, index):
+        """
+        Get columns with a positive weight in a row
+        :param index: row index :int
+        :return: column indexes :List<int>
+
+        Worst Case Runtime Complexity: O(D) (D is number of edges in the row)
+        Best Case Runtime Complexity: O(1)
+        """
+        return list(self._rows[index] or ())
+
+    def num_edges(self):
+        """
+        Number of positive weights in the matrix
+        :return: number of edges :int
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        return sum(len(edges) for edges in self._rows if edges)
+
+
+class NumpyMatrix:
+    """
+    Square matrix of edge weights stored in one contiguous numpy array
+        capacity grows by doubling so adding a row is amortized O(N)
+        requires numpy
+
+    space complexity: O(N^2)
+    """
+    symmetric = False  # true when weight (row, column) is always weight (column, row)
+
+    def __init__(self, dtype="float64", capacity=0):
+        """
+        Create an empty matrix
+        :param dtype: numpy dtype of weights, "float32" halves memory :str
+        :param capacity: number of rows to allocate up front :int
+
+        Worst Case Runtime Complexity: O(C^2) (C is capacity)
+        Best Case Runtime Complexity: O(1)
+        """
+        if numpy is None:
+            raise ImportError("NumpyMatrix requires numpy, install it with: pip install numpy")
+        self._data = numpy.zeros((capacity, capacity), dtype=dtype)
+        self._size = 0
+
+    @property
+    def size(self):
+        """
+        Number of rows (and columns) in the matrix
+        :return: size of matrix :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._size
+
+    @property
+    def view(self):
+        """
+        Matrix indexable as view[row][column], no data is copied
+        :return: array of size x size :numpy.ndarray
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._data[:self._size, :self._size]
+
+    def grow(self, new_size):
+        """
+        Add rows and columns of zeros until matrix has new_size rows
+        :param new_size: new number of rows :int
+        :return: None
+
+        Worst Case Runtime Complexity: O(N^2) (Only when capacity is exceeded)
+        Best Case Runtime Complexity: O(1)
+        """
+        capacity = self._data.shape[0]
+        if new_size > capacity:
+            new_data = numpy.zeros((max(new_size, capacity * 2), max(new_size, capacity * 2)), dtype=self._data.dtype)
+            new_data[:self._size, :self._size] = self._data[:self._size, :self._size]
+            self._data = new_data
+        self._size = max(self._size, new_size)
+
+    def get(self, row, column):
+        """
+        Get weight at row, column
+        :return: weight :float
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return float(self._data[row, column])
+
+    def set(self, row, column, weight):
+        """
+        Set weight at row, column
+        :return: None
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._data[row, column] = weight
+
+    def set_symmetric_row(self, index, weights):
+        """
+        Set weights between index and the first len(weights) rows in both directions
+        :param index: row to set :int
+        :param weights: weights for columns 0 to len(weights) - 1 :List<float>
+        :return: None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        self._data[index, :len(weights)] = weights
+        self._data[:len(weights), index] = weights
+
+    def set_row(self, index, weights):
+        """
+        Set the first len(weights) weights of a row, used to copy rows from another matrix
+        :param index: row to set :int
+        :param weights: weights for columns 0 to len(weights) - 1 :Iterable<float>
+        :return: None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        self._data[index, :len(weights)] = weights
+
+    def row(self, index):
+        """
+        Get a whole row of the matrix, no data is copied
+        :param index: row index :int
+        :return: row of weights :numpy.ndarray
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._data[index, :self._size]
+
+    def nonzero(self, index):
+        """
+        Get columns with a positive weight in a row
+        :param index: row index :int
+        :return: column indexes :List<int>
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        return numpy.flatnonzero(self.row(index) > 0).tolist()
+
+
+class MappedMatrix:
+    """
+    Square matrix of float64 edge weights stored in a buffer, such as a memory-mapped file
+        nothing is copied, reading a weight only touches the page holding it
+        weights are laid out row-major, or in tiles of tile_size x tile_size weights (each tile row-major,
+        tiles in row-major order) so nearby rows and columns share pages
+        size is fixed by the buffer, the matrix is read-only if the buffer is
+
+    space complexity: O(1) (weights stay in the buffer)
+    """
+    symmetric = False  # true when weight (row, column) is always weight (column, row)
+
+    def __init__(self, buffer, size, offset=0, tile_size=0):
+        """
+        Create a matrix over existing weights
+        :param buffer: object supporting the buffer protocol holding the weights, e.g. mmap.mmap
+        :param size: number of rows (and columns) :int
+        :param offset: byte offset of the first weight in buffer, multiple of 8 :int
+        :param tile_size: rows and columns per tile, 0 for row-major layout :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._size = size
+        self._tile_size = tile_size
+        self._tiles_per_row = -(-size // tile_size) if tile_size else 0
+        cells = MappedMatrix.num_cells(size, tile_size)
+        self._data = memoryview(buffer)[offset:offset + cells * 8].cast("d")
+        if len(self._data) != cells:
+            raise ValueError(f"Buffer too small for a {size} x {size} matrix")
+
+    @staticmethod
+    def num_cells(size, tile_size=0):
+        """
+        Number of weights stored for a matrix, tiled matrices are padded to a whole number of tiles
+        :param size: number of rows (and columns) :int
+        :param tile_size: rows and columns per tile, 0 for row-major layout :int
+        :return: number of weights, the buffer needs 8 bytes per weight :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        if not tile_size:
+            return size * size
+        padded = -(-size // tile_size) * tile_size
+        return padded * padded
+
+    @property
+    def size(self):
+        """
+        Number of rows (and columns) in the matrix
+        :return: size of matrix :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._size
+
+    @property
+    def tile_size(self):
+        """
+        Rows and columns per tile
+        :return: tile size, 0 for row-major layout :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._tile_size
+
+    @property
+    def view(self):
+        """
+        Matrix indexable as view[row][column]
+        :return: the matrix itself, indexing it returns a row :MappedMatrix
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self
+
+    def __getitem__(self, index):
+        """
+        Get a whole row of the matrix, allows view[row][column]
+        :param index: row index :int
+        :return: row of weights :memoryview, array
+
+        Worst Case Runtime Complexity: O(N) (Only for tiled layout)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self.row(index)
+
+    def _position(self, row, column):
+        """
+        Position of a weight in the buffer
+        :return: index into buffer of weights :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        tile_size = self._tile_size
+        if not tile_size:
+            return row * self._size + column
+        tile = (row // tile_size) * self._tiles_per_row + column // tile_size
+        return tile * tile_size * tile_size + (row % tile_size) * tile_size + column % tile_size
+
+    def grow(self, new_size):
+        """
+        Matrix cannot grow past the size of its buffer, smaller sizes are ignored
+        :param new_size: new number of rows :int
+        :return: None
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        if new_size > self._size:
+            raise ValueError(f"MappedMatrix cannot grow past its size of {self._size}")
+
+    def get(self, row, column):
+        """
+        Get weight at row, column
+        :return: weight :float
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._data[self._position(row, column)]
+
+    def set(self, row, column, weight):
+        """
+        Set weight at row, column
+        :return: None
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._data[self._position(row, column)] = weight
+
+    def set_symmetric_row(self, index, weights):
+        """
+        Set weights between index and the first len(weights) rows in both directions
+        :param index: row to set :int
+        :param weights: weights for columns 0 to len(weights) - 1 :List<float>
+        :return: None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        self.set_row(index, weights)
+        for column, weight in enumerate(weights):
+            self._data[self._position(column, index)] = weight
+
+    def set_row(self, index, weights):
+        """
+        Set the first len(weights) weights of a row, used to copy rows from another matrix
+        :param index: row to set :int
+        :param weights: weights for columns 0 to len(weights) - 1 :Iterable<float>
+        :return: None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        weights = array("d", weights)
+        if not self._tile_size:
+            start = index * self._size
+            self._data[start:start + len(weights)] = weights
+            return
+
+        # Row is split into one run of tile_size weights per tile
+        tile_size = self._tile_size
+        start = self._position(index, 0)
+        for column in range(0, len(weights), tile_size):
+            run = weights[column:column + tile_size]
+            run_start = start + (column // tile_size) * tile_size * tile_size
+            self._data[run_start:run_start + len(run)] = run
+
+    def row(self, index):
+        """
+        Get a whole row of the matrix, no data is copied for row-major layout
+        :param index: row index :int
+        :return: row of weights, a copy for tiled layout :memoryview, array
+
+        Worst Case Runtime Complexity: O(N) (Only for tiled layout)
+        Best Case Runtime Complexity: O(1)
+        """
+        if not self._tile_size:
+            start = index * self._size
+            return self._data[start:start + self._size]
+
+        # Row is split into one run of tile_size weights per tile
+        tile_size = self._tile_size
+        result = array("d")
+        start = self._position(index, 0)
+        for tile in range(self._tiles_per_row):
+            run_start = start + tile * tile_size * tile_size
+            result.frombytes(self._data[run_start:run_start + tile_size].cast("B"))
+        del result[self._size:]
+        return result
+
+    def nonzero(self, index):
+        """
+        Get columns with a positive weight in a row
+        :param index: row index :int
+        :return: column indexes :List<int>
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        return [column for column, weight in enumerate(self.row(index)) if weight > 0]
+
+    def release(self):
+        """
+        Stop using the buffer so it can be closed, the matrix cannot be used afterwards
+        Rows returned by row() must not be in use
+        :return: None
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._data.release()
+
+
+class SubMatrix:
+    """
+    View of the rows and columns of another matrix picked by an index array, no weights are copied
+        weight (row, column) of the view is weight (indexes[row], indexes[column]) of the matrix,
+        setting a weight sets it in the matrix
+
+    space complexity: O(N) (N is number of rows in the view)
+    """
+    def __init__(self, matrix, indexes):
+        """
+        Create a view
+        :param matrix: matrix to view :ListMatrix, NumpyMatrix, MappedMatrix, PackedMatrix
+        :param indexes: row of matrix for each row of the view :Iterable<int>
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        self._matrix = matrix
+        self._indexes = array("q", indexes)
+        self._get = matrix.get
+
+    @property
+    def size(self):
+        """
+        Number of rows (and columns) in the view
+        :return: size of view :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return len(self._indexes)
+
+    @property
+    def indexes(self):
+        """
+        Row of the viewed matrix for each row of the view
+        :return: index array :array
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._indexes
+
+    @property
+    def view(self):
+        """
+        Matrix indexable as view[row][column] for reading, rows are copies
+        :return: the view itself, indexing it returns a row :SubMatrix
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self
+
+    @property
+    def symmetric(self):
+        """
+        Whether weight (row, column) is always weight (column, row), true when the viewed matrix is
+        :return: True if the viewed matrix is symmetric :bool
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._matrix.symmetric
+
+    def __getitem__(self, index):
+        """
+        Get a whole row of the view, allows view[row][column]
+        :param index: row index :int
+        :return: copy of row :array
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        return self.row(index)
+
+    def grow(self, new_size):
+        """
+        View cannot grow past its number of indexes, smaller sizes are ignored
+        :param new_size: new number of rows :int
+        :return: None
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        if new_size > len(self._indexes):
+            raise ValueError(f"SubMatrix cannot grow past its {len(self._indexes)} indexes")
+
+    def get(self, row, column):
+        """
+        Get weight at row, column
+        :return: weight :float
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._get(self._indexes[row], self._indexes[column])
+
+    def set(self, row, column, weight):
+        """
+        Set weight at row, column in the viewed matrix
+        :return: None
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._matrix.set(self._indexes[row], self._indexes[column], weight)
+
+    def set_symmetric_row(self, index, weights):
+        """
+        Set weights between index and the first len(weights) rows in both directions in the viewed matrix
+        :param index: row to set :int
+        :param weights: weights for columns 0 to len(weights) - 1 :List<float>
+        :return: None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        for column, weight in enumerate(weights):
+            self.set(index, column, weight)
+            self.set(column, index, weight)
+
+    def set_row(self, index, weights):
+        """
+        Set the first len(weights) weights of a row in the viewed matrix
+        :param index: row to set :int
+        :param weights: weights for columns 0 to len(weights) - 1 :Iterable<float>
+        :return: None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        for column, weight in enumerate(weights):
+            self.set(index, column, weight)
+
+    def row(self, index):
+        """
+        Get a whole row of the view
+        :param index: row index :int
+        :return: copy of row :array
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        matrix_row = self._indexes[index]
+        return array("d", (self._get(matrix_row, column) for column in self._indexes))
+
+    def nonzero(self, index):
+        """
+        Get columns with a positive weight in a row
+        :param index: row index :int
+        :return: column indexes :List<int>
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        return [column for column, weight in enumerate(self.row(index)) if weight > 0]
@@ -0,0 +1,97 @@
+class PriorityQueue:
+    """
+    Binary Min-Heap Priority Queue
+        items must be comparable with the < operator, the smallest item is always popped first
+
+    space complexity: O(N)
+    """
+    def __init__(self):
+        """
+        Creates an empty priority queue
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._heap = []
+
+    def __len__(self):
+        """
+        Returns number of items in the queue
+        :return: number of items in queue :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return len(self._heap)
+
+    def is_empty(self):
+        """
+        Determines if the queue is empty or not
+        :return: True if queue is empty, False otherwise
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return len(self._heap) == 0
+
+    def push(self, item):
+        """
+        Add an item to the queue
+        :param item: item to be added
+        :return: None
+
+        Worst Case Runtime Complexity: O(log N)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._heap.append(item)
+
+        # Move new item up until its parent is not larger than it
+        index = len(self._heap) - 1
+        while index > 0:
+            parent = (index - 1) // 2
+            if not self._heap[index] < self._heap[parent]:
+                break
+            self._heap[index], self._heap[parent] = self._heap[parent], self._heap[index]
+            index = parent
+
+    def pop(self):
+        """
+        Remove the smallest item from the queue and return it
+        :return: Removed item
+
+        Worst Case Runtime Complexity: O(log N)
+        Best Case Runtime Complexity: O(1)
+        """
+        popped_item = self._heap[0]
+        last_item = self._heap.pop()
+        if len(self._heap) == 0:
+            return popped_item
+
+        # Move last item to the root and sift it down until both children are larger than it
+        self._heap[0] = last_item
+        index = 0
+        size = len(self._heap)
+        while True:
+            smallest = index
+            left = 2 * index + 1
+            right = left + 1
+            if left < size and self._heap[left] < self._heap[smallest]:
+                smallest = left
+            if right < size and self._heap[right] < self._heap[smallest]:
+                smallest = right
+            if smallest == index:
+                break
+            self._heap[index], self._heap[smallest] = self._heap[smallest], self._heap[index]
+            index = smallest
+
+        return popped_item
+
+    def peek(self):
+        """
+        Return the smallest item in the queue without removing it
+        :return: smallest item in the queue
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._heap[0]
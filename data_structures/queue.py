@@ -1,14 +1,36 @@
-from .linked_list import Node, LinkedList
-
-
 class Queue:
     """
     First-In, First-Out (FIFO) Data Structure
+        items are stored in a growable circular array (ring buffer), capacity is always a power of two
 
     space complexity: O(N)
     """
-    def __init__(self):
-        self._queue = LinkedList()
+    __slots__ = ("_items", "_head", "_size", "_mask")
+
+    def __init__(self, items=None):
+        """
+        Create a queue
+        :param items: optional items to add to the queue in order :Iterable
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._items = [None] * 8
+        self._mask = 7  # capacity - 1, index & mask wraps index around the array
+        self._head = 0  # index of first item
+        self._size = 0
+        if items is not None:
+            self.extend(items)
+
+    def __len__(self):
+        """
+        Number of items in the queue
+        :return: number of items :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._size
 
     def is_empty(self):
         """
@@ -18,7 +40,22 @@ class Queue:
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
-        return self._queue.is_empty()
+        return self._size == 0
+
+    def _grow(self, capacity):
+        """
+        Move items into a larger array, first item moves to index 0
+        :param capacity: new capacity, power of two :int
+        :return: None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        items = self._items
+        head = self._head
+        self._items = items[head:] + items[:head] + [None] * (capacity - len(items))
+        self._mask = capacity - 1
+        self._head = 0
 
     def push(self, item):
         """
@@ -26,10 +63,38 @@ class Queue:
         :param item: item to be added
         :return: None
 
-        Worst Case Runtime Complexity: O(1)
+        Worst Case Runtime Complexity: O(N) (Only when array is full)
         Best Case Runtime Complexity: O(1)
         """
-        self._queue.append(Node(item))
+        size = self._size
+        if size > self._mask:
+            self._grow(size * 2)
+        self._items[(self._head + size) & self._mask] = item
+        self._size = size + 1
+
+    def extend(self, items):
+        """
+        Add every item to the end of the queue in order
+        :param items: items to be added :Iterable
+        :return: None
+
+        Worst Case Runtime Complexity: O(N + K) (K is number of items added)
+        Best Case Runtime Complexity: O(K)
+        """
+        items = list(items)
+        capacity = len(self._items)
+        while capacity < self._size + len(items):
+            capacity *= 2
+        if capacity != len(self._items):
+            self._grow(capacity)
+
+        array = self._items
+        mask = self._mask
+        index = self._head + self._size
+        for item in items:
+            array[index & mask] = item
+            index += 1
+        self._size += len(items)
 
     def pop(self):
         """
@@ -39,17 +104,39 @@ class Queue:
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
-        popped_item = self._queue.head.data
-        self._queue.remove_after(0)
+        if self._size == 0:
+            raise IndexError("pop from empty queue")
+        items = self._items
+        head = self._head
+        popped_item = items[head]
+        items[head] = None  # release reference
+        self._head = (head + 1) & self._mask
+        self._size -= 1
 
         return popped_item
 
-    def peek(self):
+    def peek(self, n=0):
+        """
+        Return item n places from the beginning of the queue without removing it
+        :param n: position from beginning of queue, 0 is the next item to be popped :int
+        :return: Item at position n
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        if not 0 <= n < self._size:
+            raise IndexError("peek index out of range")
+        return self._items[(self._head + n) & self._mask]
+
+    def __iter__(self):
         """
-        Return item from beginning of the queue without removing it
-        :return: Item at beginning of the queue
+        Iterate over items from beginning to end of the queue without removing them
+        :return: iterator over items
 
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
-        return self._queue.head.data
+        items = self._items
+        mask = self._mask
+        head = self._head
+        return (items[(head + num) & mask] for num in range(self._size))
@@ -0,0 +1,268 @@
+import math
+from array import array
+
+try:
+    import numpy
+except ImportError:  # numpy is optional, paths are found in pure Python without it
+    numpy = None
+
+# Paths must be shorter by more than this to replace a weight, so rounding error does not reroute equal paths
+TOLERANCE = 1e-9
+# Weights in one block of rows when paths are found a block at a time, a few blocks are held in memory at once
+BLOCK_WEIGHTS = 1 << 16
+
+
+def floyd_warshall(matrix, next_hops=None):
+    """
+    Replace each weight in a matrix with the length of the shortest path between its row and column
+    A weight of 0 off the diagonal means there is no edge, pairs with no path keep a weight of 0.
+    Vectorized with numpy when it is installed, otherwise done in pure Python.
+    Without next_hops the whole matrix is held in memory while paths are found. With next_hops rows are read,
+    updated and written back a block at a time and next hops are stored in next_hops, so neither has to fit in
+    memory, the result is the same.
+    :param matrix: square matrix of edge weights, updated in place :ListMatrix, NumpyMatrix, PackedMatrix,
+                   MappedMatrix, SubMatrix
+    :param next_hops: writable buffer of size * size ints to store next hops in, such as a memory-mapped file,
+                      matrix must not be symmetric :memoryview
+    :return: next hops, next_hops[i * size + j] is the vertex after i on the shortest path from i to j,
+             -1 if there is no path, and number of weights that were shortened :2-tuple<array, int>
+
+    Worst Case Runtime Complexity: O(N^3)
+    Best Case Runtime Complexity: O(N^3)
+    """
+    if next_hops is not None:
+        if matrix.symmetric:
+            raise ValueError("Paths can not be found a block at a time in a symmetric matrix")
+        if len(next_hops) != matrix.size * matrix.size:
+            raise ValueError(f"Expected room for {matrix.size * matrix.size} next hops, got {len(next_hops)}")
+        if numpy is not None:
+            return _floyd_warshall_blocked_numpy(matrix, next_hops)
+        return _floyd_warshall_blocked_python(matrix, next_hops)
+    if numpy is not None:
+        return _floyd_warshall_numpy(matrix)
+    return _floyd_warshall_python(matrix)
+
+
+def _blocks(size):
+    """
+    Row ranges of the blocks a matrix is split into, each holding at most BLOCK_WEIGHTS weights
+
+    Worst Case Runtime Complexity: O(N)
+    Best Case Runtime Complexity: O(1)
+    """
+    block_rows = max(1, BLOCK_WEIGHTS // max(size, 1))
+    return [range(start, min(start + block_rows, size)) for start in range(0, size, block_rows)]
+
+
+def _floyd_warshall_numpy(matrix):
+    """
+    Floyd-Warshall with one vectorized step per intermediate vertex
+
+    Worst Case Runtime Complexity: O(N^3)
+    Best Case Runtime Complexity: O(N^3)
+    """
+    size = matrix.size
+    distances = numpy.array([numpy.asarray(matrix.row(index), dtype=numpy.float64)[:size] for index in range(size)],
+                            dtype=numpy.float64).reshape(size, size)
+    original = distances.copy()
+    missing = distances <= 0
+    numpy.fill_diagonal(missing, False)
+    distances[missing] = math.inf
+
+    next_hops = numpy.tile(numpy.arange(size, dtype=numpy.int32), (size, 1))
+    next_hops[missing] = -1
+
+    # work arrays are reused so each step allocates nothing
+    through = numpy.empty_like(distances)
+    limit = numpy.empty_like(distances)
+    shorter = numpy.empty(distances.shape, dtype=bool)
+    for via in range(size):
+        # paths from every i to every j through via
+        numpy.add(distances[:, via, numpy.newaxis], distances[via], out=through)
+        numpy.subtract(distances, TOLERANCE, out=limit)
+        numpy.less(through, limit, out=shorter)
+        numpy.copyto(distances, through, where=shorter)
+        numpy.copyto(next_hops, next_hops[:, via, numpy.newaxis], where=shorter)
+
+    distances[numpy.isinf(distances)] = 0
+    for index in range(size):
+        matrix.set_row(index, distances[index].tolist())
+
+    result = array("i")
+    result.frombytes(next_hops.astype(numpy.int32).tobytes())
+    return result, int(numpy.count_nonzero(distances != original))
+
+
+def _floyd_warshall_python(matrix):
+    """
+    Floyd-Warshall on lists of rows
+
+    Worst Case Runtime Complexity: O(N^3)
+    Best Case Runtime Complexity: O(N^3)
+    """
+    size = matrix.size
+    distances = []
+    next_hops = []
+    for index in range(size):
+        row = [weight if weight > 0 or column == index else math.inf
+               for column, weight in enumerate(matrix.row(index)[:size])]
+        distances.append(row)
+        next_hops.append(array("i", [column if weight < math.inf else -1 for column, weight in enumerate(row)]))
+
+    shortened = set()
+    for via in range(size):
+        via_row = distances[via]
+        for start in range(size):
+            to_via = distances[start][via]
+            if to_via == math.inf or start == via:
+                continue
+            row = distances[start]
+            hop = next_hops[start][via]
+            for column, through in enumerate([to_via + weight for weight in via_row]):
+                if through < row[column] - TOLERANCE:
+                    row[column] = through
+                    next_hops[start][column] = hop
+                    shortened.add((start, column))
+
+    result = array("i")
+    for index in range(size):
+        matrix.set_row(index, [0.0 if weight == math.inf else weight for weight in distances[index]])
+        result.extend(next_hops[index])
+    return result, len(shortened)
+
+
+def _floyd_warshall_blocked_numpy(matrix, next_hops):
+    """
+    Floyd-Warshall a block of rows at a time, vectorized
+    For each block of intermediate vertices their rows are updated first, keeping a copy of each row as it was
+    when its vertex is the intermediate, then every other block is updated from those copies. Each weight sees
+    the same sums in the same order as the whole-matrix version.
+
+    Worst Case Runtime Complexity: O(N^3)
+    Best Case Runtime Complexity: O(N^3)
+    """
+    size = matrix.size
+    blocks = _blocks(size)
+    hops = numpy.frombuffer(next_hops, dtype=numpy.int32).reshape(size, size)  # writes go straight to next_hops
+
+    def read(rows):
+        return numpy.array([numpy.asarray(matrix.row(index), dtype=numpy.float64)[:size] for index in rows],
+                           dtype=numpy.float64).reshape(len(rows), size)
+
+    def write(rows, distances):
+        for offset, index in enumerate(rows):
+            matrix.set_row(index, distances[offset].tolist())
+
+    # missing edges become infinite while paths are found
+    for rows in blocks:
+        distances = read(rows)
+        missing = distances <= 0
+        missing[numpy.arange(len(rows)), rows.start + numpy.arange(len(rows))] = False
+        distances[missing] = math.inf
+        hops[rows.start:rows.stop] = numpy.arange(size, dtype=numpy.int32)
+        hops[rows.start:rows.stop][missing] = -1
+        write(rows, distances)
+
+    via_rows = numpy.empty((len(blocks[0]), size), dtype=numpy.float64)
+    through = numpy.empty_like(via_rows)
+    limit = numpy.empty_like(via_rows)
+    shorter = numpy.empty(via_rows.shape, dtype=bool)
+
+    def relax(distances, block_hops, via, via_row):
+        rows = len(distances)
+        numpy.add(distances[:, via, numpy.newaxis], via_row, out=through[:rows])
+        numpy.subtract(distances, TOLERANCE, out=limit[:rows])
+        numpy.less(through[:rows], limit[:rows], out=shorter[:rows])
+        numpy.copyto(distances, through[:rows], where=shorter[:rows])
+        numpy.copyto(block_hops, block_hops[:, via, numpy.newaxis], where=shorter[:rows])
+
+    for via_block in blocks:
+        # rows of the intermediate vertices, each copied before its own step leaves it unchanged
+        distances = read(via_block)
+        for offset, via in enumerate(via_block):
+            via_rows[offset] = distances[offset]
+            relax(distances, hops[via_block.start:via_block.stop], via, via_rows[offset])
+        write(via_block, distances)
+
+        for rows in blocks:
+            if rows is via_block:
+                continue
+            distances = read(rows)
+            for offset, via in enumerate(via_block):
+                relax(distances, hops[rows.start:rows.stop], via, via_rows[offset])
+            write(rows, distances)
+
+    # a weight was shortened exactly when its next hop is no longer its own column
+    shortened = 0
+    for rows in blocks:
+        distances = read(rows)
+        distances[numpy.isinf(distances)] = 0
+        write(rows, distances)
+        block_hops = hops[rows.start:rows.stop]
+        shortened += int(numpy.count_nonzero((block_hops != -1) & (block_hops != numpy.arange(size))))
+    del hops
+    return next_hops, shortened
+
+
+def _floyd_warshall_blocked_python(matrix, next_hops):
+    """
+    Floyd-Warshall a block of rows at a time on lists of rows, see _floyd_warshall_blocked_numpy
+
+    Worst Case Runtime Complexity: O(N^3)
+    Best Case Runtime Complexity: O(N^3)
+    """
+    size = matrix.size
+    blocks = _blocks(size)
+
+    def read(rows):
+        return ([list(matrix.row(index))[:size] for index in rows],
+                [list(next_hops[index * size:(index + 1) * size]) for index in rows])
+
+    def write(rows, distances, hops):
+        for offset, index in enumerate(rows):
+            matrix.set_row(index, distances[offset])
+            next_hops[index * size:(index + 1) * size] = array("i", hops[offset])
+
+    # missing edges become infinite while paths are found
+    for rows in blocks:
+        distances = [[weight if weight > 0 or column == index else math.inf
+                      for column, weight in enumerate(list(matrix.row(index))[:size])] for index in rows]
+        hops = [[column if weight < math.inf else -1 for column, weight in enumerate(row)] for row in distances]
+        write(rows, distances, hops)
+
+    def relax(distances, hops, rows, via, via_row):
+        for offset, start in enumerate(rows):
+            row = distances[offset]
+            to_via = row[via]
+            if to_via == math.inf or start == via:
+                continue
+            hop = hops[offset][via]
+            for column, through in enumerate([to_via + weight for weight in via_row]):
+                if through < row[column] - TOLERANCE:
+                    row[column] = through
+                    hops[offset][column] = hop
+
+    for via_block in blocks:
+        # rows of the intermediate vertices, each copied before its own step leaves it unchanged
+        distances, hops = read(via_block)
+        via_rows = []
+        for offset, via in enumerate(via_block):
+            via_rows.append(list(distances[offset]))
+            relax(distances, hops, via_block, via, via_rows[offset])
+        write(via_block, distances, hops)
+
+        for rows in blocks:
+            if rows is via_block:
+                continue
+            distances, hops = read(rows)
+            for offset, via in enumerate(via_block):
+                relax(distances, hops, rows, via, via_rows[offset])
+            write(rows, distances, hops)
+
+    # a weight was shortened exactly when its next hop is no longer its own column
+    shortened = 0
+    for rows in blocks:
+        distances, hops = read(rows)
+        write(rows, [[0.0 if weight == math.inf else weight for weight in row] for row in distances], hops)
+        shortened += sum(1 for row in hops for column, hop in enumerate(row) if hop not in (-1, column))
+    return next_hops, shortened
@@ -1,21 +1,34 @@
-from .linked_list import Node, LinkedList
-
-
 class Stack:
     """
     Stack Data Structure
+        items are stored in a growable array, the top of the stack is the end of the array
 
     space complexity: O(N)
     """
-    def __init__(self):
+    __slots__ = ("_stack",)
+
+    def __init__(self, items=None):
         """
         Creates a new stack
+        :param items: optional items to push in order :Iterable
         :return: new stack object :Stack
 
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._stack = []
+        if items is not None:
+            self.extend(items)
+
+    def __len__(self):
+        """
+        Number of items on the stack
+        :return: number of items :int
+
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
-        self._stack = LinkedList()
+        return len(self._stack)
 
     def push(self, item):
         """
@@ -23,11 +36,21 @@ class Stack:
         :param item: item to be added
         :return: Void
 
-        Worst Case Runtime Complexity: O(1)
+        Worst Case Runtime Complexity: O(N) (Only when array is full)
         Best Case Runtime Complexity: O(1)
         """
-        new_node = Node(item)
-        self._stack.prepend(new_node)
+        self._stack.append(item)
+
+    def extend(self, items):
+        """
+        Push every item in order, the last item ends on top
+        :param items: items to be added :Iterable
+        :return: Void
+
+        Worst Case Runtime Complexity: O(N + K) (K is number of items added)
+        Best Case Runtime Complexity: O(K)
+        """
+        self._stack.extend(items)
 
     def pop(self):
         """
@@ -37,20 +60,22 @@ class Stack:
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
-        popped_item = self._stack.head.data
-        self._stack.remove_after(0)
+        if not self._stack:
+            raise IndexError("pop from empty stack")
+        return self._stack.pop()
 
-        return popped_item
-
-    def peek(self):
+    def peek(self, n=0):
         """
-        Returns item at top of stack without removing it
-        :return: item at top of stack :<Item>
+        Returns item n places below the top of stack without removing it
+        :param n: position from top of stack, 0 is the top item :int
+        :return: item at position n :<Item>
 
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
-        return self._stack.head.data
+        if not 0 <= n < len(self._stack):
+            raise IndexError("peek index out of range")
+        return self._stack[-1 - n]
 
     def is_empty(self):
         """
@@ -60,4 +85,14 @@ class Stack:
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
-        return self._stack.is_empty()
+        return len(self._stack) == 0
+
+    def __iter__(self):
+        """
+        Iterate over items from top to bottom of the stack without removing them
+        :return: iterator over items
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return reversed(self._stack)
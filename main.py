@@ -2,66 +2,88 @@
 # runtime complexity: O(N^2)
 # space complexity: O(N^2)
 
-import csv
-from configparser import ConfigParser
-
-from data_structures.graph import Graph
-from data_structures.hashtable import HashTable
-from wgups.clock import Clock
-from wgups.location import Location
-from wgups.package import Package
-from wgups.simulation import Simulation
-
-# Get configuration data
-parser = ConfigParser()
-parser.read("config.ini")
-
-# Application Constants
-START_OF_DAY = parser.get("application", "start_of_day")
-END_OF_DAY = parser.get("application", "end_of_day")
-PACKAGE_FILE = parser.get("files", "package_file")
-DISTANCE_TABLE = parser.get("files", "distance_table")
-NUM_TRUCKS = int(parser.get("trucks", "num_trucks"))
-NUM_DRIVERS = int(parser.get("trucks", "num_drivers"))
-PACKAGES_PER_TRUCK = int(parser.get("trucks", "packages_per_truck"))
-TRUCK_MPH = int(parser.get("trucks", "truck_mph"))
-DELAYED_FLIGHT_TIME = parser.get("application", "delayed_flight_time")
-
-simulation = Simulation(START_OF_DAY, DELAYED_FLIGHT_TIME, 120)
-
-# Read package data from file
-with open(PACKAGE_FILE, 'r') as f:
-    reader = csv.reader(f)
-    for row in reader:
-        # Create Location Object
-        location = Location(row[1], row[2], row[3], row[4])
-
-        # If deadline is EOD convert to time for end of day
-        deadline = row[5]
-        if deadline == "EOD":
-            deadline = END_OF_DAY
-
-        # Create package object and insert into hashtable
-        package = Package(int(row[0]), location, Clock.seconds_since_start(deadline, START_OF_DAY), float(row[6]), row[7])
-        simulation.add_package(package)
-
-# Read distance table from file
-with open(DISTANCE_TABLE, 'r') as f:
-    reader = csv.reader(f)
-    temp_locations = []
-    for row in reader:
-        # Create a Location object
-        location = Location(row[1], row[2], row[3], row[4], row[0])
-        # Add location to temp_locations and to locations graph
-        temp_locations.append(location)
-        simulation.locations.add_vertex(location.name, location)
-
-        # Add undirected edge to graph with each distance value
-        for index, distance in enumerate(row[5:]):
-            vertex_a = simulation.locations.get_vertex(location.name)
-            vertex_b = simulation.locations.get_vertex(temp_locations[index].name)
-            simulation.locations.add_undirected_edge(vertex_a, vertex_b, float(distance))
-
-# Start simulation
-simulation.setup(NUM_TRUCKS, PACKAGES_PER_TRUCK, TRUCK_MPH, START_OF_DAY, END_OF_DAY)
-simulation.start_simulation()
+import argparse
+import configparser
+import json
+import sys
+import time
+
+from wgups.loader import read_config, load_simulation, setup_simulation
+from wgups.scenarios import run_scenarios
+
+# Exit codes for batch mode
+EXIT_OK = 0  # every package delivered on time
+EXIT_LATE_OR_UNDELIVERED = 1  # simulation ran, but some packages were late or never delivered
+EXIT_ERROR = 2  # input files could not be read
+
+
+def write_output(result, output_file):
+    """
+    Write batch result as JSON to a file or standard output
+    :param result: result to be written :dict
+    :param output_file: file path, standard output if None :str
+    :return: None
+    """
+    if output_file:
+        with open(output_file, 'w') as f:
+            json.dump(result, f, indent=2)
+    else:
+        print(json.dumps(result, indent=2))
+
+
+def main():
+    # Command line arguments
+    arg_parser = argparse.ArgumentParser(description="WGUPS package delivery simulation")
+    arg_parser.add_argument("--config", default="config.ini", help="application config file (default: config.ini)")
+    arg_parser.add_argument("--batch", action="store_true",
+                            help="run the whole day without menus and write the summary as JSON")
+    arg_parser.add_argument("--scenarios",
+                            help="directory with one sub directory (config.ini, packages, distance table) per scenario, "
+                                 "every scenario is run in batch mode")
+    arg_parser.add_argument("--workers", type=int,
+                            help="number of worker processes for --scenarios (default: number of CPU cores)")
+    arg_parser.add_argument("--output", help="file to write the batch summary to (default: standard output)")
+    args = arg_parser.parse_args()
+
+    # Run every scenario in a directory across a process pool
+    if args.scenarios:
+        try:
+            report = run_scenarios(args.scenarios, args.workers)
+        except (OSError, ValueError) as error:
+            print(f"Unable to run scenarios: {error}", file=sys.stderr)
+            return EXIT_ERROR
+
+        write_output(report, args.output)
+        if report["failed"]:
+            return EXIT_ERROR
+        if report["late_or_undelivered"]:
+            return EXIT_LATE_OR_UNDELIVERED
+        return EXIT_OK
+
+    # Get configuration data and load package and distance data
+    start = time.perf_counter()
+    try:
+        config = read_config(args.config)
+        simulation = load_simulation(config, verbose=not args.batch)
+    except (OSError, ValueError, IndexError, ImportError, configparser.Error) as error:
+        print(f"Unable to load simulation: {error}", file=sys.stderr)
+        return EXIT_ERROR
+
+    setup_simulation(simulation, config)
+
+    # Start simulation
+    if not args.batch:
+        simulation.start_simulation()
+        return EXIT_OK
+
+    summary = simulation.run_to_completion()
+    summary["runtime_seconds"] = round(time.perf_counter() - start, 6)
+    write_output(summary, args.output)
+
+    if summary["late_packages"] or summary["undelivered_packages"]:
+        return EXIT_LATE_OR_UNDELIVERED
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
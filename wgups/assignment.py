@@ -0,0 +1,315 @@
+from .clock import Clock
+
+# Special instructions that constrain which truck a package can go on
+DELIVER_WITH = "Must be delivered with"
+ONLY_ON_TRUCK = "Can only be on truck"
+DELAYED = "Delayed on flight"
+WRONG_ADDRESS = "Wrong address listed"
+
+# Units are assigned most constrained first
+RANK_REQUIRED_TRUCK = 0
+RANK_GROUP = 1
+RANK_WRONG_ADDRESS = 2
+RANK_DELAYED = 3
+RANK_DEADLINE = 4
+RANK_END_OF_DAY = 5
+
+
+class PackageConstraints:
+    """
+    Truck constraints of one package, compiled once from its special instructions
+    """
+    __slots__ = ("package", "required_truck", "delayed", "wrong_address", "deliver_with")
+
+    def __init__(self, package):
+        """
+        Compile the special instructions of a package
+        Unrecognized instructions do not constrain the package
+        :param package: package to compile :Package
+
+        Worst Case Runtime Complexity: O(L) (L is length of special instructions)
+        Best Case Runtime Complexity: O(1)
+        """
+        self.package = package
+        self.required_truck = None  # truck id the package must be on
+        self.delayed = False  # package arrives on the delayed flight
+        self.wrong_address = False  # package address is corrected during the day
+        self.deliver_with = []  # ids of packages that must be on the same truck
+
+        instructions = package.special_instructions.strip()
+        if not instructions:
+            return
+        if instructions.startswith(DELIVER_WITH):
+            self.deliver_with = [int(package_id) for package_id in
+                                 instructions[len(DELIVER_WITH):].replace(",", " ").split()]
+        elif instructions.startswith(ONLY_ON_TRUCK):
+            self.required_truck = int(instructions[len(ONLY_ON_TRUCK):])
+        elif instructions.startswith(DELAYED):
+            self.delayed = True
+        elif instructions == WRONG_ADDRESS:
+            self.wrong_address = True
+
+
+class _Unit:
+    """
+    Packages that must be loaded onto the same truck, with their combined constraints
+    """
+    __slots__ = ("packages", "required_trucks", "delayed", "wrong_address", "deadline")
+
+    def __init__(self):
+        self.packages = []
+        self.required_trucks = set()
+        self.delayed = False
+        self.wrong_address = False
+        self.deadline = None
+
+    def add(self, constraints):
+        """
+        Add a package and its constraints to the unit
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        package = constraints.package
+        self.packages.append(package)
+        if constraints.required_truck is not None:
+            self.required_trucks.add(constraints.required_truck)
+        self.delayed = self.delayed or constraints.delayed
+        self.wrong_address = self.wrong_address or constraints.wrong_address
+        if self.deadline is None or package.deadline < self.deadline:
+            self.deadline = package.deadline
+
+
+class _OpenTrucks:
+    """
+    Finds the nearest truck with room in either direction, full trucks are skipped with path-halving union-find
+    so each lookup is amortized near O(1)
+    """
+    def __init__(self, num_trucks):
+        self._next = list(range(num_trucks + 1))  # _next[t] leads to first open truck >= t, num_trucks if none
+        self._previous = list(range(num_trucks + 1))  # _previous[t + 1] leads to last open truck <= t, plus 1
+
+    def next_open(self, truck):
+        """
+        Index of first open truck at or after truck, number of trucks if there is none
+
+        Worst Case Runtime Complexity: O(log T)
+        Best Case Runtime Complexity: O(1)
+        """
+        parent = self._next
+        while parent[truck] != truck:
+            parent[truck] = parent[parent[truck]]
+            truck = parent[truck]
+        return truck
+
+    def previous_open(self, truck):
+        """
+        Index of last open truck at or before truck, -1 if there is none
+
+        Worst Case Runtime Complexity: O(log T)
+        Best Case Runtime Complexity: O(1)
+        """
+        parent = self._previous
+        index = truck + 1
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index - 1
+
+    def close(self, truck):
+        """
+        Mark truck as full
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._next[truck] = truck + 1
+        self._previous[truck + 1] = truck
+
+
+def assign_packages(packages, trucks, start_of_day, end_of_day, corrected_locations=None, clusters=None,
+                    locations=None):
+    """
+    Load packages onto trucks, respecting each truck's package limit and the packages' special instructions
+        packages that must be delivered together share a truck
+        "Can only be on truck N" packages go on truck N
+        delayed packages go on any truck but the first, which leaves before the delayed flight lands
+        packages with a wrong address go on the last truck, which leaves last
+        packages with a deadline fill the earliest trucks, the rest fill the latest trucks
+        packages with an address that is not in the distance table are not loaded
+        a package joins a truck that already stops at its location when that truck can take it,
+        failing that a truck already serving its cluster
+    :param packages: packages to load :Iterable<Package>
+    :param trucks: trucks in dispatch order :List<Truck>
+    :param start_of_day: start of day time :str
+    :param end_of_day: end of day time :str
+    :param corrected_locations: package id -> correct location of packages with a wrong address, their truck
+                                plans a stop there :dict
+    :param clusters: location id -> cluster number from cluster_stops, packages of a cluster share a truck
+                     where constraints allow :dict
+    :param locations: locations graph, vertex index is location id, None to load packages without checking
+                      their addresses are in it :Graph
+    :return: packages that could not be loaded and why :List<2-tuple<Package, str>>
+
+    Worst Case Runtime Complexity: O(N log N + N * T) (Only when groups do not fit the first open trucks)
+    Best Case Runtime Complexity: O(N log N)
+    """
+    end_of_day_seconds = Clock.seconds_since_start(end_of_day, start_of_day)
+    corrected_locations = corrected_locations or {}
+    clusters = clusters or {}
+    unassigned = []
+
+    # Compile constraints and join packages that must be delivered together with union-find
+    # Worst Case Runtime Complexity: O(N log N)
+    # Best Case Runtime Complexity: O(N)
+    constraints = {}
+    for package in packages:
+        package_constraints = PackageConstraints(package)
+
+        # A truck can only plan a route through stops in the distance table
+        stops = [package.location]
+        if package_constraints.wrong_address and package.package_id in corrected_locations:
+            stops.append(corrected_locations[package.package_id])
+        if locations is not None and any(stop.location_id is None or stop.location_id >= locations.size
+                                         for stop in stops):
+            unassigned.append((package, "address not in distance table"))
+            continue
+        constraints[package.package_id] = package_constraints
+
+    group_of = {package_id: package_id for package_id in constraints}
+
+    def find(package_id):
+        while group_of[package_id] != package_id:
+            group_of[package_id] = group_of[group_of[package_id]]
+            package_id = group_of[package_id]
+        return package_id
+
+    for package_id, package_constraints in constraints.items():
+        for other_id in package_constraints.deliver_with:
+            if other_id in constraints:
+                group_of[find(other_id)] = find(package_id)
+
+    units = {}
+    for package_id, package_constraints in constraints.items():
+        root = find(package_id)
+        if root not in units:
+            units[root] = _Unit()
+        units[root].add(package_constraints)
+
+    # Most constrained units first, then by deadline
+    # Worst Case Runtime Complexity: O(N log N)
+    # Best Case Runtime Complexity: O(N log N)
+    def rank(unit):
+        if unit.required_trucks:
+            return RANK_REQUIRED_TRUCK
+        if len(unit.packages) > 1:
+            return RANK_GROUP
+        if unit.wrong_address:
+            return RANK_WRONG_ADDRESS
+        if unit.delayed:
+            return RANK_DELAYED
+        if unit.deadline < end_of_day_seconds:
+            return RANK_DEADLINE
+        return RANK_END_OF_DAY
+
+    def stop_of(package):
+        return corrected_locations.get(package.package_id, package.location).location_id
+
+    # Units of a cluster are placed one after another so they fill the same truck
+    ordered = sorted(units.values(), key=lambda unit: (rank(unit), unit.deadline,
+                                                       clusters.get(stop_of(unit.packages[0]), -1),
+                                                       unit.packages[0].package_id))
+
+    num_trucks = len(trucks)
+    room = [truck.package_limit - truck.get_package_count() for truck in trucks]
+    open_trucks = _OpenTrucks(num_trucks)
+    for index in range(num_trucks):
+        if room[index] <= 0:
+            open_trucks.close(index)
+    truck_at_location = {}  # location id -> index of a truck that stops there
+    truck_of_cluster = {}  # cluster number -> index of the truck the cluster's packages are loaded onto
+
+    # largest_from[t] is the largest package limit of trucks t and after
+    largest_from = [0] * (num_trucks + 1)
+    for index in range(num_trucks - 1, -1, -1):
+        largest_from[index] = max(largest_from[index + 1], trucks[index].package_limit)
+
+    # Worst Case Runtime Complexity: O(N * T)
+    # Best Case Runtime Complexity: O(N)
+    for unit in ordered:
+        size = len(unit.packages)
+
+        # Range of trucks the unit can go on
+        first, last = (1 if unit.delayed else 0), num_trucks - 1
+        if unit.wrong_address:
+            first = max(first, num_trucks - 1)
+        reason = None
+        if len(unit.required_trucks) > 1:
+            reason = f"must be on trucks {', '.join(str(x) for x in sorted(unit.required_trucks))} at once"
+        elif unit.required_trucks:
+            required = next(iter(unit.required_trucks)) - 1
+            if not 0 <= required < num_trucks:
+                reason = f"can only be on truck {required + 1}, which does not exist"
+            elif required < first:
+                reason = f"can only be on truck {required + 1}, which leaves before the package is ready"
+            first = last = required
+        if reason is None and first > last:
+            reason = "no truck leaves after the package is ready"
+        # Every range ends at the last truck unless it is a single truck
+        if reason is None and size > (trucks[first].package_limit if first == last else largest_from[first]):
+            reason = f"group of {size} packages does not fit on one truck"
+        if reason is not None:
+            for package in unit.packages:
+                unassigned.append((package, reason))
+            continue
+
+        # Earliest open truck for deadlines, latest for end of day
+        has_deadline = unit.deadline < end_of_day_seconds
+        if has_deadline:
+            index = open_trucks.next_open(first)
+            while index <= last and room[index] < size:
+                index = open_trucks.next_open(index + 1)
+            chosen = index if index <= last else None
+        else:
+            index = open_trucks.previous_open(last)
+            while index >= first and room[index] < size:
+                index = open_trucks.previous_open(index - 1)
+            chosen = index if index >= first else None
+
+        # A truck already stopping at one of the unit's locations is better, then a truck serving its cluster,
+        # unless it leaves later than the chosen truck and the unit has a deadline
+        cluster = clusters.get(stop_of(unit.packages[0]))
+        preferred = [truck_at_location.get(stop_of(package)) for package in unit.packages]
+        preferred.append(truck_of_cluster.get(cluster))
+        for index in preferred:
+            if (index is not None and first <= index <= last and room[index] >= size and
+                    (chosen is None or not has_deadline or index <= chosen)):
+                chosen = index
+                break
+
+        if chosen is None:
+            for package in unit.packages:
+                unassigned.append((package, "no truck has room"))
+            continue
+
+        # Packages with a wrong address stop at their correct location instead of the listed one
+        truck = trucks[chosen]
+        for package in unit.packages:
+            package.truck = truck.truck_id
+            truck.load_package(package)
+            location = package.location
+            if constraints[package.package_id].wrong_address:
+                location = corrected_locations.get(package.package_id)
+                if location is None:
+                    continue
+                truck.add_stop(location)
+            truck_at_location.setdefault(location.location_id, chosen)
+        room[chosen] -= size
+        if room[chosen] <= 0:
+            open_trucks.close(chosen)
+
+        # Rest of the cluster follows this truck until it is full
+        if cluster is not None and (cluster not in truck_of_cluster or room[truck_of_cluster[cluster]] <= 0):
+            truck_of_cluster[cluster] = chosen
+
+    return unassigned
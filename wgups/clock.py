@@ -54,6 +54,18 @@ class Clock:
         """
         self._time += 1
 
+    def advance_to(self, time):
+        """
+        Advance time directly to the given time, time never moves backwards
+        :param time: time in seconds since start :int
+        :return: Void
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        if time > self._time:
+            self._time = time
+
     def forward_seconds(self, seconds):
         """
         Calculate time after given number of seconds
@@ -0,0 +1,101 @@
+import math
+
+
+def cluster_stops(locations, packages, capacity, hub_index=0, max_iterations=10, corrected_locations=None):
+    """
+    Partition package stops into clusters of nearby stops with at most capacity packages each (capacity-bounded
+    k-medoids on the distance matrix)
+        k is the fewest clusters that can hold every package, medoids start spread out (farthest first)
+        stops are assigned to the nearest medoid with room, stops with the most to lose from a worse medoid first
+        each medoid then moves to the member with the smallest total distance to the rest of its cluster
+    A stop that fits in no cluster goes to the least loaded one.
+    :param locations: locations graph, vertex index is location id :Graph
+    :param packages: packages to deliver :Iterable<Package>
+    :param capacity: largest number of packages in a cluster, usually a truck's package limit :int
+    :param hub_index: location id of the hub, not part of any cluster :int
+    :param max_iterations: maximum number of assign and update rounds :int
+    :param corrected_locations: package id -> correct location of packages with a wrong address :dict
+    :return: location id -> cluster number, for every stop with packages :dict
+
+    Worst Case Runtime Complexity: O(I * (S K log S + S^2)) (S is number of stops, K number of clusters)
+    Best Case Runtime Complexity: O(S K log S)
+    """
+    corrected_locations = corrected_locations or {}
+
+    # Number of packages due at each stop
+    demand = {}
+    for package in packages:
+        location_id = corrected_locations.get(package.package_id, package.location).location_id
+        if location_id is not None and location_id != hub_index and location_id < locations.size:
+            demand[location_id] = demand.get(location_id, 0) + 1
+    if not demand:
+        return {}
+
+    distance = locations.matrix.get
+    stops = sorted(demand)
+    num_clusters = max(1, math.ceil(sum(demand.values()) / capacity))
+    num_clusters = min(num_clusters, len(stops))
+
+    # Farthest-first medoids, starting with the stop farthest from the hub
+    # Worst Case Runtime Complexity: O(S K)
+    # Best Case Runtime Complexity: O(S K)
+    medoids = [max(stops, key=lambda stop: (distance(hub_index, stop), -stop))]
+    closest = {stop: distance(medoids[0], stop) for stop in stops}
+    while len(medoids) < num_clusters:
+        medoid = max(stops, key=lambda stop: (closest[stop], -stop))
+        medoids.append(medoid)
+        for stop in stops:
+            closest[stop] = min(closest[stop], distance(medoid, stop))
+
+    clusters = {}
+    for iteration in range(max_iterations):
+        clusters = _assign(stops, medoids, demand, capacity, distance)
+
+        # Move each medoid to the member closest to the rest of its cluster
+        # Worst Case Runtime Complexity: O(S^2)
+        # Best Case Runtime Complexity: O(S)
+        members = [[] for medoid in medoids]
+        for stop, cluster in clusters.items():
+            members[cluster].append(stop)
+        new_medoids = []
+        for cluster, medoid in enumerate(medoids):
+            if not members[cluster]:
+                new_medoids.append(medoid)
+                continue
+            new_medoids.append(min(members[cluster], key=lambda candidate: (
+                sum(distance(candidate, stop) * demand[stop] for stop in members[cluster]), candidate)))
+
+        if new_medoids == medoids:
+            break
+        medoids = new_medoids
+    return clusters
+
+
+def _assign(stops, medoids, demand, capacity, distance):
+    """
+    Assign each stop to the nearest medoid whose cluster has room
+    Stops that gain the most from their nearest medoid over their second nearest are placed first
+    :return: location id -> cluster number :dict
+
+    Worst Case Runtime Complexity: O(S K log K)
+    Best Case Runtime Complexity: O(S K log K)
+    """
+    preferences = {}
+    for stop in stops:
+        preferences[stop] = sorted(range(len(medoids)), key=lambda cluster: (distance(stop, medoids[cluster]), cluster))
+
+    def regret(stop):
+        order = preferences[stop]
+        if len(order) < 2:
+            return 0
+        return distance(stop, medoids[order[1]]) - distance(stop, medoids[order[0]])
+
+    load = [0] * len(medoids)
+    clusters = {}
+    for stop in sorted(stops, key=lambda stop: (-regret(stop), stop)):
+        # Nearest cluster with room, or the least loaded one when none has room
+        cluster = next((x for x in preferences[stop] if load[x] + demand[stop] <= capacity),
+                       min(range(len(medoids)), key=lambda x: (load[x], x)))
+        clusters[stop] = cluster
+        load[cluster] += demand[stop]
+    return clusters
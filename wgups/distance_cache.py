@@ -0,0 +1,250 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from data_structures.matrix import MappedMatrix
+
+# Compiled distance table, written next to the csv as <distance table>.cache
+#   header (HEADER_SIZE bytes), size x size float64 matrix (row-major or tiled, see MappedMatrix),
+#   size x size int32 next hops (only for a metric closure, see Graph.next_hops), location rows as JSON
+# When next hops are present the matrix holds shortest path lengths instead of the csv's distances
+# The cache belongs to the csv with the size, modification time and SHA-256 recorded in the header
+CACHE_SUFFIX = ".cache"
+MAGIC = b"WGUPSDM3"
+# magic, byte order, size, tile size, csv size, csv mtime, csv sha256, locations offset, locations length,
+# next hops offset (0 if there are none)
+HEADER = struct.Struct("<8s8sIIqq32sqqq")
+HEADER_SIZE = 128  # matrix starts here, a multiple of 8 so weights are aligned
+
+
+def cache_path(distance_table):
+    """
+    Path of the cache file for a distance table
+    :param distance_table: path to distance table csv file :str
+    :return: path to cache file :str
+
+    Worst Case Runtime Complexity: O(1)
+    Best Case Runtime Complexity: O(1)
+    """
+    return distance_table + CACHE_SUFFIX
+
+
+def file_digest(file_name):
+    """
+    SHA-256 digest of a file's contents
+    :param file_name: path to file :str
+    :return: digest :bytes
+
+    Worst Case Runtime Complexity: O(N) (N is file size)
+    Best Case Runtime Complexity: O(N)
+    """
+    digest = hashlib.sha256()
+    with open(file_name, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+def read_cache(distance_table, metric_closure=False):
+    """
+    Memory-map the cache of a distance table if it matches the csv
+    The cache matches if the csv's size and modification time are unchanged, or failing that its contents are,
+    and it holds a metric closure exactly when one is asked for
+    :param distance_table: path to distance table csv file :str
+    :param metric_closure: look for a cache of shortest path lengths and next hops :bool
+    :return: location rows (name, address, city, state, zipcode), distance matrix and next hops (None without
+             metric closure), None if there is no matching cache :3-tuple<List<List<str>>, MappedMatrix, memoryview>,
+             None
+
+    Worst Case Runtime Complexity: O(N^2) (Only when csv was touched and has to be hashed)
+    Best Case Runtime Complexity: O(N) (N is number of locations)
+    """
+    try:
+        csv_stat = os.stat(distance_table)
+        with open(cache_path(distance_table), 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, byte_order, size, tile_size, csv_size, csv_mtime, csv_digest,
+         locations_offset, locations_length, next_hops_offset) = HEADER.unpack_from(mapped)
+        if magic != MAGIC or byte_order.rstrip(b"\0").decode() != sys.byteorder or csv_size != csv_stat.st_size:
+            return None
+        if bool(next_hops_offset) != metric_closure:
+            return None
+        if csv_mtime != csv_stat.st_mtime_ns and csv_digest != file_digest(distance_table):
+            return None
+
+        location_rows = json.loads(mapped[locations_offset:locations_offset + locations_length].decode("utf-8"))
+        if len(location_rows) != size:
+            return None
+        next_hops = None
+        if next_hops_offset:
+            next_hops = memoryview(mapped)[next_hops_offset:next_hops_offset + size * size * 4].cast("i")
+        return location_rows, MappedMatrix(mapped, size, HEADER_SIZE, tile_size), next_hops
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def write_cache(distance_table, csv_stat, location_rows, matrix, next_hops=None):
+    """
+    Write the cache of a distance table
+    The cache is written to a temporary file and then moved into place, so readers never see a partial cache.
+    Nothing is written if the csv changed since csv_stat was taken.
+    :param distance_table: path to distance table csv file :str
+    :param csv_stat: os.stat of the csv taken before it was read :os.stat_result
+    :param location_rows: name, address, city, state and zipcode of each location :List<List<str>>
+    :param matrix: distances between locations, row i is location i :ListMatrix, NumpyMatrix, MappedMatrix
+    :param next_hops: next hops when matrix is a metric closure, see Graph.next_hops :array
+    :return: True if cache written, False otherwise :bool
+
+    Worst Case Runtime Complexity: O(N^2)
+    Best Case Runtime Complexity: O(N^2)
+    """
+    size = len(location_rows)
+    path = cache_path(distance_table)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(bytes(HEADER_SIZE))
+            for index in range(size):
+                f.write(array("d", matrix.row(index)[:size]).tobytes())
+        return _finish(distance_table, csv_stat, temp_path, location_rows, size, 0, next_hops, next_hops is not None)
+    except OSError:
+        _remove(temp_path)
+        return False
+
+
+def _finish(distance_table, csv_stat, temp_path, location_rows, size, tile_size, next_hops=None, closure=False):
+    """
+    Append next hops, location rows and header to a cache whose matrix has been written, then move it into place
+    Nothing is moved into place if the csv changed since csv_stat was taken
+    With closure set and no next_hops, next hops have already been written in place after the matrix
+    :return: True if cache moved into place, False otherwise :bool
+
+    Worst Case Runtime Complexity: O(F + N^2) (F is csv file size)
+    Best Case Runtime Complexity: O(F)
+    """
+    digest = file_digest(distance_table)
+    current_stat = os.stat(distance_table)
+    if (current_stat.st_size, current_stat.st_mtime_ns) != (csv_stat.st_size, csv_stat.st_mtime_ns):
+        _remove(temp_path)
+        return False
+
+    locations = json.dumps(location_rows).encode("utf-8")
+    next_hops_offset = 0
+    locations_offset = HEADER_SIZE + MappedMatrix.num_cells(size, tile_size) * 8
+    if closure:
+        next_hops_offset = locations_offset
+        locations_offset += size * size * 4
+    header = HEADER.pack(MAGIC, sys.byteorder.encode(), size, tile_size, csv_stat.st_size, csv_stat.st_mtime_ns,
+                         digest, locations_offset, len(locations), next_hops_offset)
+    with open(temp_path, 'r+b') as f:
+        if next_hops is not None:
+            f.seek(next_hops_offset)
+            f.write(next_hops.tobytes())
+        f.seek(locations_offset)
+        f.write(locations)
+        f.truncate()
+        f.seek(0)
+        f.write(header)
+    os.replace(temp_path, cache_path(distance_table))
+    return True
+
+
+def _remove(temp_path):
+    """
+    Remove a partly written cache if it exists
+    :return: None
+
+    Worst Case Runtime Complexity: O(1)
+    Best Case Runtime Complexity: O(1)
+    """
+    try:
+        os.remove(temp_path)
+    except FileNotFoundError:
+        pass
+
+
+class CacheBuilder:
+    """
+    Builds a cache in place, the matrix is a writable memory-mapped file that is filled while the csv is read,
+    so the distance matrix never has to fit in memory, nor do next hops for a metric closure
+    """
+    def __init__(self, distance_table, size, tile_size=0, metric_closure=False):
+        """
+        Create a zero-filled cache file and map its matrix
+        :param distance_table: path to distance table csv file :str
+        :param size: number of locations in the distance table :int
+        :param tile_size: rows and columns per tile, 0 for row-major layout :int
+        :param metric_closure: also map room for next hops, which the metric closure is written to :bool
+
+        Worst Case Runtime Complexity: O(1) (file is created sparse where the file system allows)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._distance_table = distance_table
+        self._csv_stat = os.stat(distance_table)
+        self._size = size
+        self._tile_size = tile_size
+        self._temp_path = f"{cache_path(distance_table)}.{os.getpid()}.tmp"
+        self._metric_closure = metric_closure
+        next_hops_offset = HEADER_SIZE + MappedMatrix.num_cells(size, tile_size) * 8
+        with open(self._temp_path, 'wb') as f:
+            f.truncate(next_hops_offset + (size * size * 4 if metric_closure else 0))
+        with open(self._temp_path, 'r+b') as f:
+            self._mapped = mmap.mmap(f.fileno(), 0)
+        self.matrix = MappedMatrix(self._mapped, size, HEADER_SIZE, tile_size)
+        self.next_hops = None  # next hops of the metric closure, see Graph.next_hops
+        if metric_closure:
+            self.next_hops = memoryview(self._mapped)[next_hops_offset:next_hops_offset + size * size * 4].cast("i")
+
+    def finish(self, location_rows):
+        """
+        Write location rows and header and move the cache into place
+        The builder's matrix and next hops must not be used afterwards, read the cache with read_cache instead
+        :param location_rows: name, address, city, state and zipcode of each location :List<List<str>>
+        :return: True if cache moved into place, False if the csv changed while it was read :bool
+
+        Worst Case Runtime Complexity: O(F)
+        Best Case Runtime Complexity: O(F)
+        """
+        self._close()
+        if len(location_rows) != self._size:
+            _remove(self._temp_path)
+            raise ValueError(f"Distance table has {len(location_rows)} locations, expected {self._size}")
+        try:
+            return _finish(self._distance_table, self._csv_stat, self._temp_path, location_rows, self._size,
+                           self._tile_size, closure=self._metric_closure)
+        except OSError:
+            _remove(self._temp_path)
+            raise
+
+    def abort(self):
+        """
+        Discard the partly built cache
+        :return: None
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._close()
+        _remove(self._temp_path)
+
+    def _close(self):
+        """
+        Flush and unmap the matrix
+        :return: None
+
+        Worst Case Runtime Complexity: O(N^2) (Only when pages are still waiting to be written)
+        Best Case Runtime Complexity: O(1)
+        """
+        if self.matrix is not None:
+            self.matrix.release()
+            self.matrix = None
+        if self.next_hops is not None:
+            self.next_hops.release()
+            self.next_hops = None
+        self._mapped.flush()
+        self._mapped.close()
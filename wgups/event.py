@@ -0,0 +1,38 @@
+class Event:
+    """
+    Scheduled simulation event
+        events are ordered by time, then by event type, then by sequence number
+        so that events happening at the same second are handled in the same order every run
+    """
+
+    # Event types, in the order they are handled within a single second
+    ADDRESS_CORRECTION = 0
+    TRUCK_ARRIVAL = 1
+    FLIGHT_ARRIVAL = 2
+    DISPATCH_CHECK = 3
+
+    def __init__(self, time, event_type, truck=None, sequence=0):
+        """
+        Create an Event object
+        :param time: time event happens in seconds since start :int
+        :param event_type: type of event :int
+        :param truck: truck the event applies to, if any :Truck
+        :param sequence: tie breaker for events of the same type at the same time :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self.time = time
+        self.event_type = event_type
+        self.truck = truck
+        self.sequence = sequence
+
+    def __lt__(self, other):
+        """
+        :param other: event to be compared with
+        :return: True if this event happens before the other event :Boolean
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return (self.time, self.event_type, self.sequence) < (other.time, other.event_type, other.sequence)
@@ -0,0 +1,483 @@
+import math
+import time
+
+from data_structures.priority_queue import PriorityQueue
+from .assignment import PackageConstraints
+from .clock import Clock
+from .routing import next_departure
+from .truck import seconds_to_accumulate
+
+# Smallest change in miles counted as an improvement, smaller changes are rounding noise
+EPSILON = 1e-9
+
+
+class _Stop:
+    """
+    Packages one truck delivers at one location, they always move between trucks together
+    """
+    __slots__ = ("packages", "fixed", "delayed", "deadline", "due")
+
+    def __init__(self):
+        self.packages = []
+        self.fixed = False  # a package must stay on its truck, or no package is due here
+        self.delayed = False  # a package arrives on the delayed flight
+        self.deadline = False  # a package is due before end of day
+        self.due = math.inf  # earliest deadline of the packages in seconds since start
+
+    def merge(self, other):
+        """
+        Add the packages and constraints of another stop at the same location
+
+        Worst Case Runtime Complexity: O(K) (K is number of packages at other)
+        Best Case Runtime Complexity: O(K)
+        """
+        self.packages.extend(other.packages)
+        self.fixed = self.fixed or other.fixed
+        self.delayed = self.delayed or other.delayed
+        self.deadline = self.deadline or other.deadline
+        self.due = min(self.due, other.due)
+
+
+class _Fleet:
+    """
+    Closed routes of every truck as lists of location ids, starting and ending at the hub, with the stops, package
+    counts and planned lateness needed to check a move between trucks
+    """
+    def __init__(self, trucks, distance, hub_index, flight_time):
+        self.distance = distance
+        self.flight_time = flight_time
+        self.routes = [truck.route_location_ids() or [hub_index, hub_index] for truck in trucks]
+        self.speed = [truck.speed for truck in trucks]
+        self.seconds = [seconds_to_accumulate(self.speed[index], self.route_distance(route))
+                        for index, route in enumerate(self.routes)]  # seconds each route takes
+        self.arrivals_of = [[] for truck in trucks]  # arrivals of each route, set once stops are known
+        self.lateness = 0.0  # planned lateness of the fleet, set once stops are known
+        self.limit = [truck.package_limit for truck in trucks]
+        self.load = [truck.get_package_count() for truck in trucks]
+        self.stops = [{} for truck in trucks]  # stops[t][location id] -> _Stop
+        self.positions = [None] * len(trucks)  # positions[t][location id] -> index in routes[t]
+        self.on_routes = {}  # location id -> indexes of trucks stopping there
+        for index in range(len(trucks)):
+            self.index_route(index)
+            for location_id in self.routes[index][1:-1]:
+                self.on_routes.setdefault(location_id, set()).add(index)
+
+    def index_route(self, index):
+        """
+        Rebuild the position of every stop on a route after it changed
+
+        Worst Case Runtime Complexity: O(S) (S is number of stops on the route)
+        Best Case Runtime Complexity: O(S)
+        """
+        self.positions[index] = {location_id: num for num, location_id in enumerate(self.routes[index])}
+
+    def can_move(self, location_id, source, target):
+        """
+        True if the stop may leave truck source for truck target
+            delayed packages cannot go on the first truck, which leaves before the delayed flight lands
+            packages with a deadline cannot go on a truck that leaves later
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        stop = self.stops[source][location_id]
+        return not (stop.fixed or (stop.delayed and target == 0) or (stop.deadline and target > source))
+
+    def size(self, index, location_id):
+        return len(self.stops[index][location_id].packages)
+
+    def move_stop(self, location_id, source, target):
+        """
+        Move the stop's packages and constraints to another truck, the caller updates the routes
+
+        Worst Case Runtime Complexity: O(K) (K is number of packages at the stop)
+        Best Case Runtime Complexity: O(K)
+        """
+        stop = self.stops[source].pop(location_id)
+        count = len(stop.packages)
+        self.load[source] -= count
+        self.load[target] += count
+        if location_id in self.stops[target]:
+            self.stops[target][location_id].merge(stop)
+        else:
+            self.stops[target][location_id] = stop
+        trucks = self.on_routes[location_id]
+        trucks.discard(source)
+        trucks.add(target)
+
+    def removal_gain(self, index, position):
+        """
+        Miles saved by removing the stop at position from its route
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        route = self.routes[index]
+        before, stop, after = route[position - 1], route[position], route[position + 1]
+        return self.distance(before, stop) + self.distance(stop, after) - self.distance(before, after)
+
+    def route_distance(self, route):
+        """
+        Miles driven on a route
+
+        Worst Case Runtime Complexity: O(S)
+        Best Case Runtime Complexity: O(S)
+        """
+        return sum(self.distance(route[num - 1], route[num]) for num in range(1, len(route)))
+
+    def arrivals(self, index, route, moved=None):
+        """
+        Seconds after leaving the hub each stop with a deadline is reached on a route, estimated as distance / speed
+        the way find_route checks deadlines
+        :param moved: location id -> earliest deadline of each stop moving onto the truck :dict
+        :return: (seconds after departure, deadline) of each stop :List<2-tuple<float, int>>
+
+        Worst Case Runtime Complexity: O(S)
+        Best Case Runtime Complexity: O(S)
+        """
+        moved = moved or {}
+        stops = self.stops[index]
+        speed = self.speed[index]
+        arrivals = []
+        distance = 0.0
+        for num in range(1, len(route) - 1):
+            location_id = route[num]
+            distance += self.distance(route[num - 1], location_id)
+            due = min(stops[location_id].due if location_id in stops else math.inf, moved.get(location_id, math.inf))
+            if due != math.inf:
+                arrivals.append((distance / speed, due))
+        return arrivals
+
+    def planned_lateness(self, changes=None):
+        """
+        Seconds stops are planned to be reached after their earliest deadline over the whole fleet, with each truck
+        leaving as Simulation._plan_routes expects, so a longer route that delays a later truck is counted
+        :param changes: truck index -> new route and location id -> earliest deadline of each stop moving onto the
+                        truck :dict
+        :return: planned lateness, seconds each route takes, arrivals of each route :3-tuple<float, List, List>
+
+        Worst Case Runtime Complexity: O(N + T log T) (N is number of stops)
+        Best Case Runtime Complexity: O(N + T log T)
+        """
+        changes = changes or {}
+        seconds, arrivals = list(self.seconds), list(self.arrivals_of)
+        for index, (route, moved) in changes.items():
+            seconds[index] = seconds_to_accumulate(self.speed[index], self.route_distance(route))
+            arrivals[index] = self.arrivals(index, route, moved)
+
+        lateness = 0.0
+        returns = PriorityQueue()
+        for index in range(len(self.routes)):
+            departure = next_departure(index, self.flight_time, returns)
+            returns.push(departure + seconds[index])
+            for arrival, due in arrivals[index]:
+                if departure + arrival > due:
+                    lateness += departure + arrival - due
+        return lateness, seconds, arrivals
+
+    def accept(self, changes):
+        """
+        Check a move would not make the fleet's planned lateness worse, and record its lateness if so
+        The caller then replaces the routes of the changed trucks
+        :param changes: see planned_lateness :dict
+        :return: True if the move can be made :bool
+
+        Worst Case Runtime Complexity: O(N + T log T)
+        Best Case Runtime Complexity: O(N + T log T)
+        """
+        lateness, seconds, arrivals = self.planned_lateness(changes)
+        if lateness > self.lateness + EPSILON:
+            return False
+        self.lateness, self.seconds, self.arrivals_of = lateness, seconds, arrivals
+        return True
+
+    def insertion_cost(self, location_id, before, after):
+        """
+        Miles added by visiting location_id between before and after
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self.distance(before, location_id) + self.distance(location_id, after) - self.distance(before, after)
+
+
+def improve_fleet(trucks, locations, start_of_day, end_of_day, corrected_locations=None, time_limit=1.0,
+                  max_iterations=100, candidates=10, hub_index=0, flight_time=0):
+    """
+    Shorten the fleet's total planned miles by moving stops between trucks, after every truck has planned a route
+    with find_route
+        relocate: move a stop to the cheapest place next to one of its nearest neighbors on another truck,
+                  a stop another truck already makes costs nothing to join
+        swap: exchange a stop with one of its nearest neighbors on another truck
+        2-opt*: join the start of one route to the end of another and the other way around
+    Every move is priced from the edges it adds and removes and is only made when it shortens the fleet's miles.
+    A stop moves with all its packages, and only when no package is bound to its truck ("Can only be on truck",
+    "Must be delivered with" and packages with a wrong address stay put, as do their corrected stops), the other
+    truck has room, a delayed package would not go on the first truck and a package with a deadline would not go on
+    a later truck. A longer route brings its truck back later and holds back the trucks that leave when it returns,
+    so moves are also only made when the fleet's planned lateness, with departures estimated as the simulation
+    dispatches trucks, does not grow.
+    Trucks whose stops changed plan their routes again with find_route.
+    :param trucks: trucks in dispatch order, each with a planned route :List<Truck>
+    :param locations: locations graph, vertex index is location id :Graph
+    :param start_of_day: start of day time :str
+    :param end_of_day: end of day time :str
+    :param corrected_locations: package id -> correct location of packages with a wrong address :dict
+    :param time_limit: maximum seconds spent searching, no limit if None :float
+    :param max_iterations: maximum passes over every stop :int
+    :param candidates: nearest neighbors of a stop tried as its new neighbor :int
+    :param hub_index: location id of the hub every route starts and ends at :int
+    :param flight_time: seconds since start the delayed flight lands, when the second truck leaves :int
+    :return: indexes of trucks whose packages changed :Set<int>
+
+    Worst Case Runtime Complexity: O(I * N K T (N + T log T)) (N is number of stops, K candidates, T number of
+                                                               trucks)
+    Best Case Runtime Complexity: O(N K)
+    """
+    if len(trucks) < 2 or max_iterations <= 0:
+        return set()
+    end_of_day_seconds = Clock.seconds_since_start(end_of_day, start_of_day)
+    corrected_ids = {location.location_id for location in (corrected_locations or {}).values()}
+    fleet = _Fleet(trucks, locations.matrix.get, hub_index, flight_time)
+
+    # Packages bound to their truck
+    # Worst Case Runtime Complexity: O(N)
+    # Best Case Runtime Complexity: O(N)
+    constraints = {}
+    truck_of = {}  # package id -> index of the truck it is on
+    for index, truck in enumerate(trucks):
+        for package in truck.get_package_list():
+            constraints[package.package_id] = PackageConstraints(package)
+            truck_of[package.package_id] = index
+    grouped = set()
+    for package_id, package_constraints in constraints.items():
+        if package_constraints.deliver_with:
+            grouped.add(package_id)
+            grouped.update(package_constraints.deliver_with)
+
+    for index, truck in enumerate(trucks):
+        for location_id in fleet.routes[index][1:-1]:
+            stop = _Stop()
+            stop.packages = truck.packages_at(location_id)
+            stop.fixed = not stop.packages or location_id in corrected_ids
+            for package in stop.packages:
+                package_constraints = constraints[package.package_id]
+                stop.fixed = stop.fixed or (package_constraints.required_truck is not None or
+                                            package_constraints.wrong_address or package.package_id in grouped)
+                stop.delayed = stop.delayed or package_constraints.delayed
+                stop.deadline = stop.deadline or package.deadline < end_of_day_seconds
+                stop.due = min(stop.due, package.deadline)
+            fleet.stops[index][location_id] = stop
+    fleet.arrivals_of = [fleet.arrivals(index, route) for index, route in enumerate(fleet.routes)]
+    fleet.lateness = fleet.planned_lateness()[0]
+
+    _search(fleet, locations.nearest_neighbors(candidates), time_limit, max_iterations)
+
+    # Move packages onto the truck now holding their stop
+    # Worst Case Runtime Complexity: O(N)
+    # Best Case Runtime Complexity: O(N)
+    changed = set()
+    for index, truck in enumerate(trucks):
+        for stop in fleet.stops[index].values():
+            for package in stop.packages:
+                if truck_of[package.package_id] != index:
+                    changed.add(index)
+                    changed.add(truck_of[package.package_id])
+                    trucks[truck_of[package.package_id]].deliver_package(package)
+                    truck.load_package(package)
+                    package.truck = truck.truck_id
+    return changed
+
+
+def _search(fleet, neighbors, time_limit, max_iterations):
+    """
+    Make the first improving move found for each stop, passes repeat until no move improves
+
+    Worst Case Runtime Complexity: O(I * N K T (N + T log T))
+    Best Case Runtime Complexity: O(N K)
+    """
+    stop_time = None if time_limit is None else time.perf_counter() + time_limit
+    for iteration in range(max_iterations):
+        improved = False
+        for index in range(len(fleet.routes)):
+            position = 0
+            while position < len(fleet.routes[index]) - 1:
+                if stop_time is not None and time.perf_counter() > stop_time:
+                    return
+                if (_relocate(fleet, index, position, neighbors) or _swap(fleet, index, position, neighbors) or
+                        _two_opt_star(fleet, index, position, neighbors)):
+                    improved = True
+                else:
+                    position += 1
+        if not improved:
+            return
+
+
+def _relocate(fleet, index, position, neighbors):
+    """
+    Move the stop at position to another truck, next to one of its nearest neighbors
+    Moves are tried shortest fleet miles first, the first that does not add planned lateness is made
+    :return: indexes of the two trucks changed, None if no move shortens the fleet's miles without adding lateness
+
+    Worst Case Runtime Complexity: O(K T (N + T log T)) (N is number of stops on all routes)
+    Best Case Runtime Complexity: O(1)
+    """
+    route = fleet.routes[index]
+    if position == 0:
+        return None
+    location_id = route[position]
+    gain = fleet.removal_gain(index, position)
+    size = fleet.size(index, location_id)
+
+    moves = []  # (change in miles, target truck, position on target route or None to join its stop)
+    for neighbor in [location_id] + neighbors[location_id]:
+        for target in fleet.on_routes.get(neighbor, ()):
+            if target == index or fleet.load[target] + size > fleet.limit[target]:
+                continue
+            if not fleet.can_move(location_id, index, target):
+                continue
+            if neighbor == location_id:
+                # Target truck already stops here, the packages join that stop
+                if -gain < -EPSILON:
+                    moves.append((-gain, target, None))
+                continue
+            if location_id in fleet.positions[target]:
+                continue
+            other = fleet.routes[target]
+            at = fleet.positions[target][neighbor]
+            for insert_at in (at, at + 1):
+                delta = fleet.insertion_cost(location_id, other[insert_at - 1], other[insert_at]) - gain
+                if delta < -EPSILON:
+                    moves.append((delta, target, insert_at))
+
+    moves.sort(key=lambda move: move[0])
+    due = {location_id: fleet.stops[index][location_id].due}
+    for delta, target, insert_at in moves:
+        other = fleet.routes[target]
+        if insert_at is not None:
+            other = other[:insert_at] + [location_id] + other[insert_at:]
+        if not fleet.accept({index: (route[:position] + route[position + 1:], {}), target: (other, due)}):
+            continue
+        fleet.move_stop(location_id, index, target)
+        del route[position]
+        fleet.index_route(index)
+        fleet.routes[target] = other
+        fleet.index_route(target)
+        return {index, target}
+    return None
+
+
+def _swap(fleet, index, position, neighbors):
+    """
+    Exchange the stop at position with one of its nearest neighbors on another truck, each takes the other's place
+    Moves are tried shortest fleet miles first, the first that does not add planned lateness is made
+    :return: indexes of the two trucks changed, None if no move shortens the fleet's miles without adding lateness
+
+    Worst Case Runtime Complexity: O(K T (N + T log T))
+    Best Case Runtime Complexity: O(1)
+    """
+    route = fleet.routes[index]
+    if position == 0:
+        return None
+    location_id = route[position]
+    size = fleet.size(index, location_id)
+    before, after = route[position - 1], route[position + 1]
+    removed = fleet.distance(before, location_id) + fleet.distance(location_id, after)
+
+    moves = []  # (change in miles, target truck, stop exchanged with)
+    for neighbor in neighbors[location_id]:
+        if neighbor in fleet.positions[index]:
+            continue
+        for target in fleet.on_routes.get(neighbor, ()):
+            if target == index or location_id in fleet.positions[target]:
+                continue
+            other_size = fleet.size(target, neighbor)
+            if (fleet.load[index] - size + other_size > fleet.limit[index] or
+                    fleet.load[target] - other_size + size > fleet.limit[target]):
+                continue
+            if not (fleet.can_move(location_id, index, target) and fleet.can_move(neighbor, target, index)):
+                continue
+            other = fleet.routes[target]
+            at = fleet.positions[target][neighbor]
+            other_before, other_after = other[at - 1], other[at + 1]
+            delta = (fleet.distance(before, neighbor) + fleet.distance(neighbor, after) - removed +
+                     fleet.distance(other_before, location_id) + fleet.distance(location_id, other_after) -
+                     fleet.distance(other_before, neighbor) - fleet.distance(neighbor, other_after))
+            if delta < -EPSILON:
+                moves.append((delta, target, neighbor))
+
+    moves.sort(key=lambda move: move[0])
+    for delta, target, neighbor in moves:
+        other = fleet.routes[target]
+        at = fleet.positions[target][neighbor]
+        new_route = route[:position] + [neighbor] + route[position + 1:]
+        new_other = other[:at] + [location_id] + other[at + 1:]
+        if not fleet.accept({index: (new_route, {neighbor: fleet.stops[target][neighbor].due}),
+                             target: (new_other, {location_id: fleet.stops[index][location_id].due})}):
+            continue
+        fleet.move_stop(location_id, index, target)
+        fleet.move_stop(neighbor, target, index)
+        route[position], other[at] = neighbor, location_id
+        fleet.index_route(index)
+        fleet.index_route(target)
+        return {index, target}
+    return None
+
+
+def _two_opt_star(fleet, index, position, neighbors):
+    """
+    Replace edge (a, a next) of this route and edge (b, b next) of another with (a, b next) and (b, a next),
+    this route keeps its start and takes the other's end, the other route takes this route's end
+    b next is one of a's nearest neighbors
+    :return: indexes of the two trucks changed, None if no move shortens the fleet's miles without adding lateness
+
+    Worst Case Runtime Complexity: O(K T (N + T log T))
+    Best Case Runtime Complexity: O(1)
+    """
+    route = fleet.routes[index]
+    location_id, following = route[position], route[position + 1]
+    removed = fleet.distance(location_id, following)
+    tail = route[position + 1:-1]
+
+    for neighbor in neighbors[location_id]:
+        for target in fleet.on_routes.get(neighbor, ()):
+            if target == index:
+                continue
+            other = fleet.routes[target]
+            at = fleet.positions[target][neighbor]
+            previous = other[at - 1]
+            delta = (fleet.distance(location_id, neighbor) + fleet.distance(previous, following) - removed -
+                     fleet.distance(previous, neighbor))
+            if delta >= -EPSILON:
+                continue
+
+            # Both ends must be allowed on, fit on and not already be stopped at by their new truck
+            other_tail = other[at:-1]
+            tail_load = sum(fleet.size(index, x) for x in tail)
+            other_tail_load = sum(fleet.size(target, x) for x in other_tail)
+            if (fleet.load[index] - tail_load + other_tail_load > fleet.limit[index] or
+                    fleet.load[target] - other_tail_load + tail_load > fleet.limit[target]):
+                continue
+            if not (all(fleet.can_move(x, index, target) for x in tail) and
+                    all(fleet.can_move(x, target, index) for x in other_tail)):
+                continue
+            if any(x in fleet.positions[target] for x in tail):
+                continue
+            if any(x in fleet.positions[index] for x in other_tail):
+                continue
+            new_route = route[:position + 1] + other[at:]
+            new_other = other[:at] + route[position + 1:]
+            if not fleet.accept({index: (new_route, {x: fleet.stops[target][x].due for x in other_tail}),
+                                 target: (new_other, {x: fleet.stops[index][x].due for x in tail})}):
+                continue
+
+            for x in tail:
+                fleet.move_stop(x, index, target)
+            for x in other_tail:
+                fleet.move_stop(x, target, index)
+            fleet.routes[index] = new_route
+            fleet.routes[target] = new_other
+            fleet.index_route(index)
+            fleet.index_route(target)
+            return {index, target}
+    return None
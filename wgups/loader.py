@@ -0,0 +1,278 @@
+import csv
+import os
+from array import array
+from configparser import ConfigParser
+
+from data_structures.graph import Graph
+from data_structures.matrix import ListMatrix, NumpyMatrix, PackedMatrix
+from .clock import Clock
+from .distance_cache import CacheBuilder, read_cache, write_cache
+from .location_registry import LocationRegistry
+from .package import Package
+from .routing import RoutingOptions
+from .simulation import Simulation
+
+
+def read_config(config_file):
+    """
+    Read application config file
+    File paths in the config are relative to the directory containing the config file
+    :param config_file: path to config file :str
+    :return: configuration values :dict
+
+    Worst Case Runtime Complexity: O(1)
+    Best Case Runtime Complexity: O(1)
+    """
+    parser = ConfigParser()
+    if not parser.read(config_file):
+        raise FileNotFoundError(f"Config file not found: {config_file}")
+
+    config_dir = os.path.dirname(os.path.abspath(config_file))
+    return {
+        "start_of_day": parser.get("application", "start_of_day"),
+        "end_of_day": parser.get("application", "end_of_day"),
+        "delayed_flight_time": parser.get("application", "delayed_flight_time"),
+        "package_file": os.path.join(config_dir, parser.get("files", "package_file")),
+        "distance_table": os.path.join(config_dir, parser.get("files", "distance_table")),
+        "num_trucks": int(parser.get("trucks", "num_trucks")),
+        "num_drivers": int(parser.get("trucks", "num_drivers")),
+        "packages_per_truck": int(parser.get("trucks", "packages_per_truck")),
+        "truck_mph": int(parser.get("trucks", "truck_mph")),
+        "cluster_stops": parser.getboolean("trucks", "cluster_stops", fallback=False),
+        "matrix": parser.get("graph", "matrix", fallback="list"),
+        "matrix_dtype": parser.get("graph", "matrix_dtype", fallback="float64"),
+        "distance_cache": parser.getboolean("graph", "distance_cache", fallback=True),
+        "matrix_tile": parser.getint("graph", "matrix_tile", fallback=0),
+        "metric_closure": parser.getboolean("graph", "metric_closure", fallback=True),
+        "improve_iterations": parser.getint("routing", "improve_iterations", fallback=100),
+        "improve_time_limit": parser.getfloat("routing", "improve_time_limit", fallback=1.0),
+        "exact_threshold": parser.getint("routing", "exact_threshold", fallback=13),
+        "neighbor_candidates": parser.getint("routing", "neighbor_candidates", fallback=10),
+        "fleet_time_limit": parser.getfloat("routing", "fleet_time_limit", fallback=1.0),
+        "deadline_aware": parser.getboolean("routing", "deadline_aware", fallback=True),
+        "route_workers": parser.getint("routing", "route_workers", fallback=1),
+    }
+
+
+def create_matrix(config, capacity=0):
+    """
+    Create an empty in-memory distance matrix of the type selected in the config
+    Mapped matrices are created by CacheBuilder instead
+    :param config: configuration values from read_config :dict
+    :param capacity: number of locations to allocate room for up front :int
+    :return: empty matrix :ListMatrix, NumpyMatrix, PackedMatrix
+
+    Worst Case Runtime Complexity: O(C^2) (C is capacity)
+    Best Case Runtime Complexity: O(1)
+    """
+    if config["matrix"] == "list":
+        return ListMatrix()
+    if config["matrix"] == "numpy":
+        return NumpyMatrix(config["matrix_dtype"], capacity)
+    if config["matrix"] == "packed":
+        typecodes = {"float64": "d", "float32": "f"}
+        if config["matrix_dtype"] not in typecodes:
+            raise ValueError(f"Packed matrix weight type must be float64 or float32: {config['matrix_dtype']}")
+        return PackedMatrix(typecodes[config["matrix_dtype"]])
+    raise ValueError(f"Unknown distance matrix type: {config['matrix']}")
+
+
+def load_packages(simulation, package_file, start_of_day, end_of_day):
+    """
+    Read package data from file and add each package to the simulation
+    :param simulation: simulation packages are added to :Simulation
+    :param package_file: path to package csv file :str
+    :param start_of_day: start of day time :str
+    :param end_of_day: end of day time :str
+    :return: None
+
+    Worst Case Runtime Complexity: O(N^2)
+    Best Case Runtime Complexity: O(N)
+    """
+    with open(package_file, 'r') as f:
+        reader = csv.reader(f)
+        for row in reader:
+            # Look up registered location, registering it if it is not in the distance table
+            location = simulation.location_registry.intern(row[1], row[2], row[3], row[4])
+
+            # If deadline is EOD convert to time for end of day
+            deadline = row[5]
+            if deadline == "EOD":
+                deadline = end_of_day
+
+            # Create package object and insert into hashtable
+            package = Package(int(row[0]), location, Clock.seconds_since_start(deadline, start_of_day), float(row[6]),
+                              row[7])
+            simulation.add_package(package)
+
+
+def load_distance_table(locations, distance_table, registry):
+    """
+    Read lower-triangular distance table from file into a locations graph
+    Each row holds a location followed by its distances to every location in the rows before it and itself
+    Locations are registered in row order so each location's id is its index in the graph
+    :param locations: empty graph locations are added to :Graph
+    :param distance_table: path to distance table csv file :str
+    :param registry: empty registry locations are interned in :LocationRegistry
+    :return: name, address, city, state and zipcode of each location in row order :List<List<str>>
+
+    Worst Case Runtime Complexity: O(N^2)
+    Best Case Runtime Complexity: O(N^2)
+    """
+    location_rows = []
+    with open(distance_table, 'r') as f:
+        reader = csv.reader(f)
+        for row in reader:
+            # Register location and add it to locations graph
+            add_location(locations, registry, row[:5])
+            location_rows.append(row[:5])
+
+            # Add undirected edges from new location to every location read so far
+            locations.set_undirected_edges(locations.get_vertex_by_index(locations.size - 1),
+                                           [float(distance) for distance in row[5:]])
+    return location_rows
+
+
+def add_location(locations, registry, location_row):
+    """
+    Register a distance table location and add it to the locations graph as the next vertex
+    :param locations: graph locations are added to :Graph
+    :param registry: registry locations are interned in :LocationRegistry
+    :param location_row: name, address, city, state and zipcode of location :List<str>
+    :return: None
+
+    Worst Case Runtime Complexity: O(N) (Only when the matrix grows)
+    Best Case Runtime Complexity: O(1)
+    """
+    name, address, city, state, zipcode = location_row
+    location = registry.intern(address, city, state, zipcode, name)
+    if location.location_id != locations.size:
+        raise ValueError(f"Location listed more than once in distance table: {location}")
+    locations.add_vertex(location.name, location)
+
+
+def load_cached_distance_table(config, cache, registry):
+    """
+    Create a locations graph from a memory-mapped distance table cache
+    Mapped matrices use the cache in place, otherwise rows and next hops are copied into a matrix of the type
+    selected in the config
+    :param config: configuration values from read_config :dict
+    :param cache: location rows, distance matrix and next hops returned by read_cache :3-tuple
+    :param registry: empty registry locations are interned in :LocationRegistry
+    :return: locations graph :Graph
+
+    Worst Case Runtime Complexity: O(N^2)
+    Best Case Runtime Complexity: O(N) (Only for mapped matrix)
+    """
+    location_rows, cached_matrix, next_hops = cache
+    if config["matrix"] == "mapped":
+        matrix = cached_matrix
+    else:
+        matrix = create_matrix(config, cached_matrix.size)
+        matrix.grow(cached_matrix.size)
+        for index in range(cached_matrix.size):
+            matrix.set_row(index, cached_matrix.row(index))
+        if next_hops is not None:
+            next_hops = array("i", next_hops)
+
+    locations = Graph(matrix)
+    for location_row in location_rows:
+        add_location(locations, registry, location_row)
+    if next_hops is not None:
+        locations.set_next_hops(next_hops)
+    return locations
+
+
+def count_rows(file_name):
+    """
+    Count number of rows in a file
+    :param file_name: path to file :str
+    :return: number of rows :int
+
+    Worst Case Runtime Complexity: O(N)
+    Best Case Runtime Complexity: O(N)
+    """
+    with open(file_name, 'r') as f:
+        return sum(1 for line in f if line.strip())
+
+
+def load_locations(config, registry):
+    """
+    Create the locations graph from the distance table, using its cache when there is one
+    Mapped matrices always go through the cache, on a cache miss it is built straight from the csv
+    without holding the matrix in memory
+    With metric_closure set, distances are replaced by shortest path lengths, which are cached with their next hops,
+    for mapped matrices a block of rows at a time straight in the cache being built
+    :param config: configuration values from read_config :dict
+    :param registry: empty registry locations are interned in :LocationRegistry
+    :return: locations graph, vertex index is location id :Graph
+
+    Worst Case Runtime Complexity: O(N^3) (Only for metric closure without a cache)
+    Best Case Runtime Complexity: O(N) (Only for mapped matrix with a cache)
+    """
+    distance_table = config["distance_table"]
+    mapped = config["matrix"] == "mapped"
+    closure = config["metric_closure"]
+    cache = read_cache(distance_table, closure) if config["distance_cache"] or mapped else None
+    if cache is not None:
+        return load_cached_distance_table(config, cache, registry)
+
+    if mapped:
+        builder = CacheBuilder(distance_table, count_rows(distance_table), config["matrix_tile"], closure)
+        try:
+            built = Graph(builder.matrix)
+            location_rows = load_distance_table(built, distance_table, LocationRegistry())
+            if closure:
+                built.metric_closure(builder.next_hops)
+        except (OSError, ValueError, IndexError):
+            builder.abort()
+            raise
+        cache = read_cache(distance_table, closure) if builder.finish(location_rows) else None
+        if cache is None:
+            raise ValueError(f"Distance table changed while it was read: {distance_table}")
+        return load_cached_distance_table(config, cache, registry)
+
+    csv_stat = os.stat(distance_table)
+
+    # Allocate the distance matrix once at its final size when the matrix type supports it
+    capacity = count_rows(distance_table) if config["matrix"] != "list" else 0
+    locations = Graph(create_matrix(config, capacity))
+    location_rows = load_distance_table(locations, distance_table, registry)
+    if closure:
+        locations.metric_closure()
+    if config["distance_cache"]:
+        write_cache(distance_table, csv_stat, location_rows, locations.matrix, locations.next_hops)
+    return locations
+
+
+def load_simulation(config, verbose=True):
+    """
+    Create a simulation and load its package and distance data, simulation is not set up yet
+    :param config: configuration values from read_config :dict
+    :param verbose: print delivery activity as it happens :bool
+    :return: loaded simulation :Simulation
+
+    Worst Case Runtime Complexity: O(N^2)
+    Best Case Runtime Complexity: O(N^2)
+    """
+    simulation = Simulation(config["start_of_day"], config["delayed_flight_time"], 120, verbose)
+
+    # Distance table is read first so location ids match distance matrix indexes
+    simulation.locations = load_locations(config, simulation.location_registry)
+    load_packages(simulation, config["package_file"], config["start_of_day"], config["end_of_day"])
+    return simulation
+
+
+def setup_simulation(simulation, config):
+    """
+    Load trucks and plan their routes using the values from the config
+    :param simulation: loaded simulation :Simulation
+    :param config: configuration values from read_config :dict
+    :return: None
+
+    Worst Case Runtime Complexity: O(N^2)
+    Best Case Runtime Complexity: O(N^2)
+    """
+    simulation.setup(config["num_trucks"], config["packages_per_truck"], config["truck_mph"],
+                     config["start_of_day"], config["end_of_day"], RoutingOptions.from_config(config),
+                     config["cluster_stops"])
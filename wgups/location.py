@@ -1,14 +1,18 @@
 class Location:
     """
     Represents a package location (address)
+        locations created by a LocationRegistry have a location_id, equal locations from the same
+        registry are the same object and are compared by id
     """
-    def __init__(self, address, city, state, zipcode, name=""):
+    def __init__(self, address, city, state, zipcode, name="", location_id=None):
         """
         Creates a Location object
         :param address: location address
         :param city: location city
         :param state: location state
         :param zipcode: location zipcode
+        :param name: location name
+        :param location_id: id given by a LocationRegistry, None if not registered :int
 
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
@@ -18,6 +22,22 @@ class Location:
         self.state = state
         self.zipcode = zipcode
         self.name = name
+        self.location_id = location_id
+        self.key = Location.make_key(address, zipcode)
+
+    @staticmethod
+    def make_key(address, zipcode):
+        """
+        Normalized address used to decide whether two locations are the same place
+        Case and extra whitespace are ignored
+        :param address: location address :str
+        :param zipcode: location zipcode :str
+        :return: normalized address and zipcode :2-tuple
+
+        Worst Case Runtime Complexity: O(L) (L is length of address)
+        Best Case Runtime Complexity: O(L)
+        """
+        return " ".join(address.split()).casefold(), zipcode.strip()
 
     def __str__(self):
         """
@@ -37,4 +57,20 @@ class Location:
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
-        return self.address == other.address and self.zipcode == other.zipcode
+        if self is other:
+            return True
+        if not isinstance(other, Location):
+            return NotImplemented
+        if self.location_id is not None and other.location_id is not None:
+            return self.location_id == other.location_id
+        return self.key == other.key
+
+    def __hash__(self):
+        """
+        Hash of normalized address, equal locations have equal hashes
+        :return: hash value :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return hash(self.key)
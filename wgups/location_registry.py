@@ -0,0 +1,92 @@
+from .location import Location
+
+
+class LocationRegistry:
+    """
+    Interns locations so each address is represented by one Location object with a dense integer id
+        ids are given in the order locations are first registered, so when the distance table is
+        registered first a location's id is its row in the distance matrix
+
+    space complexity: O(N)
+    """
+    def __init__(self):
+        """
+        Create an empty registry
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._locations = []  # location id -> Location
+        self._ids = {}  # normalized address -> location id
+
+    def __len__(self):
+        """
+        Number of registered locations
+        :return: number of locations :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return len(self._locations)
+
+    def intern(self, address, city, state, zipcode, name=""):
+        """
+        Return the registered location for an address, registering it first if it is new
+        If the location is already registered without a name it is given the new name
+        :param address: location address :str
+        :param city: location city :str
+        :param state: location state :str
+        :param zipcode: location zipcode :str
+        :param name: location name :str
+        :return: registered location :Location
+
+        Worst Case Runtime Complexity: O(L) (L is length of address)
+        Best Case Runtime Complexity: O(L)
+        """
+        key = Location.make_key(address, zipcode)
+        location_id = self._ids.get(key)
+        if location_id is not None:
+            location = self._locations[location_id]
+            if name and not location.name:
+                location.name = name
+            return location
+
+        location = Location(address.strip(), city.strip(), state.strip(), zipcode.strip(), name,
+                            len(self._locations))
+        self._ids[key] = location.location_id
+        self._locations.append(location)
+        return location
+
+    def find(self, address, zipcode):
+        """
+        Find registered location for an address
+        :param address: location address :str
+        :param zipcode: location zipcode :str
+        :return: registered location or None if not registered :Location, None
+
+        Worst Case Runtime Complexity: O(L)
+        Best Case Runtime Complexity: O(L)
+        """
+        location_id = self._ids.get(Location.make_key(address, zipcode))
+        return None if location_id is None else self._locations[location_id]
+
+    def get(self, location_id):
+        """
+        Return location with the given id
+        :param location_id: id of location :int
+        :return: location :Location
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._locations[location_id]
+
+    def __iter__(self):
+        """
+        Iterate over locations in id order
+        :return: iterator over locations
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return iter(self._locations)
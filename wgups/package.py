@@ -25,7 +25,20 @@ class Package:
         self._mass = mass
         self._special_instructions = special_instructions
         self._status = status
+        self._truck = None
         self.time_delivered = None
+        self.store = None  # PackageStore holding this package, notified when indexed fields change
+
+    def __getstate__(self):
+        """
+        State for pickling, without the store back-reference, which would pickle every package in the store
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        state = self.__dict__.copy()
+        state["store"] = None
+        return state
 
     # read-only package id
     @property
@@ -95,7 +108,10 @@ class Package:
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
+        old_deadline = self._deadline
         self._deadline = time
+        if self.store is not None:
+            self.store.package_changed(self, "deadline", old_deadline)
 
     @property
     def mass(self):
@@ -164,7 +180,36 @@ class Package:
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
+        old_status = self._status
         self._status = status
+        if self.store is not None:
+            self.store.package_changed(self, "status", old_status)
+
+    @property
+    def truck(self):
+        """
+        Returns number of truck package is loaded on
+        :return: truck number, None if not assigned to a truck :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._truck
+
+    @truck.setter
+    def truck(self, truck):
+        """
+        Set number of truck package is loaded on
+        :param truck: truck number :int
+        :return: none
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        old_truck = self._truck
+        self._truck = truck
+        if self.store is not None:
+            self.store.package_changed(self, "truck", old_truck)
 
     def has_special_instructions(self):
         """
@@ -0,0 +1,182 @@
+from data_structures.hashtable import HashTable
+
+
+class PackageStore:
+    """
+    Package storage with secondary indexes
+        packages are stored in a HashTable by package id, and indexed by status, truck number and deadline.
+        Indexes are kept up to date by the packages themselves, changing a package's status, truck or
+        deadline moves it to the matching index bucket.
+
+    space complexity: O(N)
+    """
+    def __init__(self, table_size=10):
+        """
+        Create an empty package store
+        :param table_size: initial size of the hashtable :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._table = HashTable(table_size)
+
+        # index value -> {package id: package}
+        self._by_status = {}
+        self._by_truck = {}
+        self._by_deadline = {}
+
+    @property
+    def num_items(self):
+        """
+        Number of packages in the store
+        :return: number of packages :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._table.num_items
+
+    def insert(self, package):
+        """
+        Add a package to the store and its indexes
+        :param package: package to be added :Package
+        :return: True if package added, False if a package with the same id is already stored
+
+        Worst Case Runtime Complexity: O(N) (Only when table is resized)
+        Best Case Runtime Complexity: O(1)
+        """
+        if not self._table.insert(package):
+            return False
+
+        package.store = self
+        self._add_to_index(self._by_status, package.status, package)
+        self._add_to_index(self._by_truck, package.truck, package)
+        self._add_to_index(self._by_deadline, package.deadline, package)
+        return True
+
+    def search(self, package_id):
+        """
+        Find package by id
+        :param package_id: id of package :int
+        :return: package or None if not found :Package, None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(1)
+        """
+        return self._table.search(package_id)
+
+    def package_changed(self, package, field, old_value):
+        """
+        Move package to the right index bucket after one of its indexed fields changed
+        Called by Package when its status, truck or deadline is set
+        :param package: package that changed :Package
+        :param field: name of field that changed, "status", "truck" or "deadline" :str
+        :param old_value: value of field before the change
+        :return: None
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        index = {"status": self._by_status, "truck": self._by_truck, "deadline": self._by_deadline}[field]
+        self._remove_from_index(index, old_value, package)
+        self._add_to_index(index, getattr(package, field), package)
+
+    def with_status(self, status):
+        """
+        Packages with the given status
+        :param status: package status :str
+        :return: matching packages :List<Package>
+
+        Worst Case Runtime Complexity: O(K) (K is number of matching packages)
+        Best Case Runtime Complexity: O(K)
+        """
+        return list(self._by_status.get(status, {}).values())
+
+    def without_status(self, status):
+        """
+        Packages with any status except the given status
+        :param status: package status :str
+        :return: matching packages :List<Package>
+
+        Worst Case Runtime Complexity: O(K + S) (S is number of different statuses)
+        Best Case Runtime Complexity: O(K + S)
+        """
+        result = []
+        for other_status, packages in self._by_status.items():
+            if other_status != status:
+                result.extend(packages.values())
+        return result
+
+    def on_truck(self, truck_number):
+        """
+        Packages assigned to the given truck
+        :param truck_number: truck number, None for packages not assigned to a truck :int
+        :return: matching packages :List<Package>
+
+        Worst Case Runtime Complexity: O(K)
+        Best Case Runtime Complexity: O(K)
+        """
+        return list(self._by_truck.get(truck_number, {}).values())
+
+    def truck_numbers(self):
+        """
+        Numbers of trucks that have packages assigned to them
+        :return: sorted truck numbers :List<int>
+
+        Worst Case Runtime Complexity: O(T log T) (T is number of trucks)
+        Best Case Runtime Complexity: O(T log T)
+        """
+        return sorted(number for number, packages in self._by_truck.items() if number is not None and packages)
+
+    def due_by(self, time):
+        """
+        Packages with a deadline at or before the given time
+        :param time: time in seconds since start :int
+        :return: matching packages :List<Package>
+
+        Worst Case Runtime Complexity: O(K + D) (D is number of different deadlines)
+        Best Case Runtime Complexity: O(K + D)
+        """
+        result = []
+        for deadline, packages in self._by_deadline.items():
+            if deadline <= time:
+                result.extend(packages.values())
+        return result
+
+    @staticmethod
+    def _add_to_index(index, value, package):
+        """
+        Add package to an index bucket
+        :return: None
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        if value not in index:
+            index[value] = {}
+        index[value][package.package_id] = package
+
+    @staticmethod
+    def _remove_from_index(index, value, package):
+        """
+        Remove package from an index bucket
+        :return: None
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        bucket = index.get(value)
+        if bucket is not None:
+            bucket.pop(package.package_id, None)
+            if not bucket:
+                del index[value]
+
+    def __iter__(self):
+        """
+        Iterate over every package in the store
+        :return: iterator over packages
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return iter(self._table)
@@ -0,0 +1,63 @@
+class RoutingOptions:
+    """
+    Settings for how trucks plan their delivery routes
+    """
+    def __init__(self, improve_iterations=100, improve_time_limit=1.0, exact_threshold=13, neighbor_candidates=10,
+                 fleet_time_limit=1.0, deadline_aware=True, route_workers=1):
+        """
+        Create a RoutingOptions object
+        :param improve_iterations: maximum 2-opt/Or-opt passes over each tour, 0 turns improvement off :int
+        :param improve_time_limit: maximum seconds spent improving each tour, no limit if None :float
+        :param exact_threshold: routes with this many stops or fewer are solved exactly, 0 turns it off :int
+        :param neighbor_candidates: nearest neighbors tried from each stop when building and improving tours :int
+        :param fleet_time_limit: maximum seconds spent moving stops between trucks, 0 turns it off,
+                                 no limit if None :float
+        :param deadline_aware: reorder routes so stops are reached by their deadlines where possible :bool
+        :param route_workers: processes solving truck routes at once, 1 solves them in this process,
+                              0 uses one per CPU :int
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self.improve_iterations = improve_iterations
+        self.improve_time_limit = improve_time_limit
+        self.exact_threshold = exact_threshold
+        self.neighbor_candidates = neighbor_candidates
+        self.fleet_time_limit = fleet_time_limit
+        self.deadline_aware = deadline_aware
+        self.route_workers = route_workers
+
+    @staticmethod
+    def from_config(config):
+        """
+        Create routing options from the routing values returned by read_config
+        :param config: configuration values :dict
+        :return: routing options :RoutingOptions
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return RoutingOptions(config["improve_iterations"], config["improve_time_limit"], config["exact_threshold"],
+                              config["neighbor_candidates"], config["fleet_time_limit"],
+                              config["deadline_aware"], config["route_workers"])
+
+
+def next_departure(index, flight_time, returns):
+    """
+    Expected departure of a truck, by the rule the simulation dispatches trucks with
+    The first truck leaves at the start of day and the second when the delayed flight lands, each later truck leaves
+    when the earliest truck still on the road returns, but not before the flight lands
+    :param index: truck's place in dispatch order :int
+    :param flight_time: seconds since start the delayed flight lands :int
+    :param returns: expected return times of the trucks before it whose return has not yet let a truck leave,
+                    the earliest is removed :PriorityQueue
+    :return: departure in seconds since start :int
+
+    Worst Case Runtime Complexity: O(log T) (T is number of trucks)
+    Best Case Runtime Complexity: O(1)
+    """
+    if index == 0:
+        return 0
+    if index == 1:
+        return flight_time
+    return max(flight_time, returns.pop())
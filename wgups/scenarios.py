@@ -0,0 +1,81 @@
+import configparser
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .loader import read_config, load_simulation, setup_simulation
+
+# name of the config file expected in every scenario directory
+SCENARIO_CONFIG = "config.ini"
+
+
+def find_scenarios(directory):
+    """
+    Find scenario directories, a scenario is any sub directory containing a config file
+    :param directory: directory holding one sub directory per scenario :str
+    :return: sorted list of scenario directory paths :List<str>
+
+    Worst Case Runtime Complexity: O(N log N)
+    Best Case Runtime Complexity: O(N log N)
+    """
+    scenarios = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if os.path.isfile(os.path.join(path, SCENARIO_CONFIG)):
+            scenarios.append(path)
+    return scenarios
+
+
+def run_scenario(scenario_dir):
+    """
+    Load, set up and run a single scenario without any output
+    Errors are recorded in the result instead of raised so one bad scenario does not stop the others
+    :param scenario_dir: directory containing the scenario's config file :str
+    :return: compact result record :dict
+
+    Worst Case Runtime Complexity: O(N^3)
+    Best Case Runtime Complexity: O(N^3)
+    """
+    result = {"scenario": os.path.basename(os.path.normpath(scenario_dir))}
+    start = time.perf_counter()
+    try:
+        config = read_config(os.path.join(scenario_dir, SCENARIO_CONFIG))
+        # Scenarios already run in a process pool, routes are solved in the scenario's own process
+        config["route_workers"] = 1
+        simulation = load_simulation(config, verbose=False)
+        setup_simulation(simulation, config)
+        result.update(simulation.run_to_completion())
+    except (OSError, ValueError, IndexError, ImportError, configparser.Error) as error:
+        result["error"] = str(error)
+    result["runtime_seconds"] = round(time.perf_counter() - start, 6)
+    return result
+
+
+def run_scenarios(directory, workers=None):
+    """
+    Run every scenario in a directory across a pool of worker processes and merge the results
+    :param directory: directory holding one sub directory per scenario :str
+    :param workers: number of worker processes, defaults to number of CPU cores :int
+    :return: merged report, results are in scenario name order :dict
+
+    Worst Case Runtime Complexity: O(S * N^3) (S is number of scenarios)
+    Best Case Runtime Complexity: O(S * N^3 / W) (W is number of workers)
+    """
+    start = time.perf_counter()
+    scenarios = find_scenarios(directory)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run_scenario, scenarios))
+
+    failed = [x["scenario"] for x in results if "error" in x]
+    late_or_undelivered = [x["scenario"] for x in results
+                           if "error" not in x and (x["late_packages"] or x["undelivered_packages"])]
+
+    return {
+        "scenarios": results,
+        "total_scenarios": len(results),
+        "failed": failed,
+        "late_or_undelivered": late_or_undelivered,
+        "total_miles": round(sum(x["total_miles"] for x in results if "error" not in x), 2),
+        "runtime_seconds": round(time.perf_counter() - start, 6),
+    }
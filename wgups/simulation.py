@@ -1,35 +1,58 @@
+import os
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
+from wgups.assignment import assign_packages
 from wgups.clock import Clock
-from wgups.truck import Truck
-from wgups.location import Location
-from data_structures.hashtable import HashTable
+from wgups.clustering import cluster_stops
+from wgups.event import Event
+from wgups.fleet import improve_fleet
+from wgups.routing import RoutingOptions, next_departure
+from wgups.truck import Truck, accumulated_distance, solve_route_problem
+from wgups.location_registry import LocationRegistry
+from wgups.package_store import PackageStore
+from data_structures.priority_queue import PriorityQueue
 from data_structures.queue import Queue
 from data_structures.graph import Graph
 
+# Package whose address is corrected during the day, and its correct address
+CORRECTED_PACKAGE_ID = 9
+CORRECTED_ADDRESS = ("410 S State St", "Salt Lake City", "UT", "84111")
+
 
 class Simulation:
-    def __init__(self, start_time, delayed_flight_time, table_size):
+    def __init__(self, start_time, delayed_flight_time, table_size, verbose=True):
         """
         Create a Simulation Object
         :param start_time: start time of simulation
         :param delayed_flight_time: time delayed packages arrive on flight
         :param table_size: size of the hashtable
+        :param verbose: print delivery activity as it happens, False for headless runs :bool
 
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
         self._start_time = start_time
         self._clock = Clock(0, start_time)
-        self._packages = HashTable(table_size)
+        self._packages = PackageStore(table_size)
         self._active_trucks = []
         self._trucks = Queue()
+        self._trucks_by_id = {}
         self.simulation_over = False
         self._delayed_flight_time = Clock.seconds_since_start(delayed_flight_time, start_time)
         self._delayed_packages_departed = False
         self._total_miles = 0.0
+        self._truck_seconds = 0  # seconds driven by all trucks
         self.locations = Graph()
+        self.location_registry = LocationRegistry()
         self.wrong_address_fixed = False
+        self._events = PriorityQueue()
+        self._dispatch_count = 0
+        self.verbose = verbose
+        self._planned_miles_saved = 0.0
+        self._route_planning_time = 0.0
+        self._unassigned_packages = []  # (package, reason) for packages no truck could take
+        self._planned_late_packages = []  # packages whose planned route reaches them after their deadline
 
     def add_package(self, package):
         """
@@ -42,7 +65,8 @@ class Simulation:
         """
         self._packages.insert(package)
 
-    def setup(self, num_trucks, packages_per_truck, truck_mph, start_of_day, end_of_day):
+    def setup(self, num_trucks, packages_per_truck, truck_mph, start_of_day, end_of_day, routing_options=None,
+              clustering=False):
         """
         Sets up simulations by loading and queueing up trucks
         :param num_trucks: number of trucks available
@@ -50,6 +74,8 @@ class Simulation:
         :param truck_mph: speed of truck in miles per hour
         :param start_of_day: start time of simulation
         :param end_of_day: time of end of day
+        :param routing_options: route planning settings, defaults are used if None :RoutingOptions
+        :param clustering: group nearby stops with cluster_stops so each truck serves one area :bool
         :return: None
 
         Worst Case Runtime Complexity: O(N^2)
@@ -57,16 +83,98 @@ class Simulation:
         """
         truck_list = []
         for truck_id in range(1, num_trucks + 1):
-            truck_list.append(Truck(truck_id, packages_per_truck, truck_mph, start_of_day, self.locations.get_vertex_by_index(0).data))
-
-        truck_queue = Queue()
-        for truck in Truck.sort_packages([x for x in self._packages], truck_list, start_of_day, end_of_day):
+            truck_list.append(Truck(truck_id, packages_per_truck, truck_mph, start_of_day,
+                                    self.locations.get_vertex_by_index(0).data, self.verbose))
+
+        # Packages no truck can take stay at the hub and are reported
+        corrected_locations = {CORRECTED_PACKAGE_ID: self.location_registry.intern(*CORRECTED_ADDRESS)}
+        clusters = None
+        if clustering:
+            clusters = cluster_stops(self.locations, self._packages, packages_per_truck,
+                                     corrected_locations=corrected_locations)
+        self._unassigned_packages = assign_packages(self._packages, truck_list, start_of_day, end_of_day,
+                                                    corrected_locations, clusters, self.locations)
+        if self.verbose:
+            for package, reason in self._unassigned_packages:
+                print(f"Package {package.package_id} could not be loaded: {reason}")
+
+        if routing_options is None:
+            routing_options = RoutingOptions()
+        for truck in truck_list:
             # Add location data for packages in truck
             truck.set_locations(self.locations)
-            truck.find_route()
+        self._plan_routes(truck_list, routing_options)
+
+        # Move stops between trucks, then trucks whose packages changed plan again
+        if routing_options.fleet_time_limit != 0:
+            fleet_start = time.perf_counter()
+            planned_distance = sum(truck.planned_distance for truck in truck_list)
+            changed = improve_fleet(truck_list, self.locations, start_of_day, end_of_day, corrected_locations,
+                                    routing_options.fleet_time_limit, routing_options.improve_iterations,
+                                    routing_options.neighbor_candidates, flight_time=self._delayed_flight_time)
+            self._route_planning_time += time.perf_counter() - fleet_start
+            for index in changed:
+                truck_list[index].set_locations(self.locations)
+            self._plan_routes(truck_list, routing_options, changed)
+            self._planned_miles_saved += planned_distance - sum(truck.planned_distance for truck in truck_list)
+            if self.verbose and changed:
+                print(f"Stops moved between trucks {', '.join(str(truck_list[x].truck_id) for x in sorted(changed))}")
+
+        for truck in truck_list:
+            self._planned_miles_saved += truck.distance_saved
+            self._planned_late_packages.extend(truck.get_planned_late_packages())
+            if self.verbose and truck.stop_slack:
+                least_slack = min(slack for location, slack in truck.stop_slack)
+                print(f"Truck {truck.truck_id} leaves at "
+                      f"{Clock.to_time_string(truck.planned_departure, self._start_time)} for "
+                      f"{truck.planned_distance:.1f} miles, least slack {least_slack // 60} minutes")
+                print(f"Truck {truck.truck_id} route planned by {truck.route_method} in "
+                      f"{truck.route_solve_time:.3f} seconds, {truck.lateness_removed / 60:.0f} minutes of lateness "
+                      f"removed")
+                for package in truck.get_planned_late_packages():
+                    print(f"Package {package.package_id} is planned to be late on truck {truck.truck_id}")
 
             # Add truck to truck queue
             self._trucks.push(truck)
+            self._trucks_by_id[truck.truck_id] = truck
+
+    def _plan_routes(self, trucks, routing_options, replan=None):
+        """
+        Plan routes in dispatch order, each from the time its truck is expected to leave the hub
+            the first truck leaves at start of day, the second when the delayed flight lands,
+            the rest when one of the two trucks on the road is expected back
+        Shortest routes do not depend on departure times, so they are solved first, in a pool of
+        route_workers processes when that is more than 1. Departure times then finish each route in order.
+        A truck not in replan is only finished again when its expected departure changed.
+        :param trucks: trucks in dispatch order :List<Truck>
+        :param routing_options: route planning settings :RoutingOptions
+        :param replan: indexes of trucks to plan again, every truck is planned if None :Set<int>
+        :return: None
+
+        Worst Case Runtime Complexity: O(T * R) (R is runtime of find_route)
+        Best Case Runtime Complexity: O(T * R / W) (W is number of workers)
+        """
+        plan_start = time.perf_counter()
+        pending = list(range(len(trucks))) if replan is None else sorted(replan)
+        workers = routing_options.route_workers or os.cpu_count() or 1
+        if workers > 1 and len(pending) > 1:
+            # Workers only get each truck's own distances and deadlines, the solved routes are handed back in order
+            with ProcessPoolExecutor(min(workers, len(pending))) as pool:
+                solved_routes = pool.map(solve_route_problem, [trucks[index].route_problem() for index in pending],
+                                         [routing_options] * len(pending))
+                for index, solved_route in zip(pending, solved_routes):
+                    trucks[index].set_solved_route(solved_route)
+        else:
+            for index in pending:
+                trucks[index].solve_route(routing_options)
+
+        on_road = PriorityQueue()  # expected return times of trucks on the road
+        for index, truck in enumerate(trucks):
+            departure = next_departure(index, self._delayed_flight_time, on_road)
+            if index in pending or truck.planned_departure != departure:
+                truck.finish_route(routing_options, departure)
+            on_road.push(departure + truck.seconds_to_travel(truck.planned_distance))
+        self._route_planning_time += time.perf_counter() - plan_start
 
     def main_menu(self):
         """
@@ -133,10 +241,10 @@ class Simulation:
         elif selection == 3:
             print()
             print("---------------------------------------------------------------------------------------------------")
-            for num in range(1, 4):
+            for num in self._packages.truck_numbers():
                 print(f"{Clock.to_time_string(self._clock.time, self._start_time)} : Truck {num} Packages:")
-                for package in self._packages:
-                    if package.truck == num and package.status != "DELIVERED":
+                for package in self._packages.on_truck(num):
+                    if package.status != "DELIVERED":
                         package.print(self._start_time)
         elif selection == 4:
             self.main_menu()
@@ -185,9 +293,7 @@ class Simulation:
         Worst Case Runtime Complexity: O(N^2)
         Best Case Runtime Complexity: O(1)
         """
-        self._active_trucks.append(self._trucks.pop())
-        for truck in self._active_trucks:
-            truck.start_route(self._clock.time)
+        self.begin()
         while not self.simulation_over:
             self.main_menu()
         print()
@@ -198,113 +304,248 @@ class Simulation:
         for package in self._packages:
             package.print(self._start_time)
 
+    def begin(self):
+        """
+        Schedule fixed events for the day and send out the first truck
+        :return: None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        # Events can happen no earlier than one second after start
+        self._schedule_event(Event(max(Clock.seconds_since_start("10:20 AM", self._start_time), 1),
+                                   Event.ADDRESS_CORRECTION))
+        self._schedule_event(Event(max(self._delayed_flight_time, 1), Event.FLIGHT_ARRIVAL))
+
+        self._dispatch_truck()
+
+    def run_to_completion(self):
+        """
+        Run whole simulation without user input
+        :return: summary of the simulation :dict
+
+        Worst Case Runtime Complexity: O(E log E) (E is number of events)
+        Best Case Runtime Complexity: O(E log E)
+        """
+        self.begin()
+        while not self.simulation_over and not self._events.is_empty():
+            self.advance_simulation(self._events.peek().time)
+        return self.get_summary()
+
+    def get_summary(self):
+        """
+        Summary information for simulation in a machine-readable form
+        :return: summary of the simulation :dict
+
+        Worst Case Runtime Complexity: O(N log N)
+        Best Case Runtime Complexity: O(N log N)
+        """
+        late_packages = sorted(x.package_id for x in self.get_late_packages())
+        undelivered_packages = sorted(x.package_id for x in self._packages.without_status("DELIVERED"))
+
+        return {
+            "total_miles": round(self._total_miles, 2),
+            "planned_miles_saved": round(self._planned_miles_saved, 2),
+            "route_planning_seconds": round(self._route_planning_time, 6),
+            "packages": self._packages.num_items,
+            "packages_delivered": len(self._packages.with_status("DELIVERED")),
+            "late_packages": late_packages,
+            "undelivered_packages": undelivered_packages,
+            "planned_late_packages": sorted(package.package_id for package in self._planned_late_packages),
+            "unassigned_packages": [{"package_id": package.package_id, "reason": reason}
+                                    for package, reason in sorted(self._unassigned_packages,
+                                                                  key=lambda x: x[0].package_id)],
+            "routes": [{"truck": truck.truck_id, "method": truck.route_method,
+                        "solve_seconds": round(truck.route_solve_time, 6),
+                        "lateness_removed_seconds": round(truck.lateness_removed, 2)}
+                       for truck in self._trucks_by_id.values()],
+            "duration_seconds": self._clock.time,
+            "end_time": Clock.to_time_string(self._clock.time, self._start_time),
+        }
+
+    def get_late_packages(self):
+        """
+        Packages delivered after their deadline
+        :return: late packages :List<Package>
+
+        Worst Case Runtime Complexity: O(K) (K is number of delivered packages)
+        Best Case Runtime Complexity: O(K)
+        """
+        return [x for x in self._packages.with_status("DELIVERED") if x.time_delivered > x.deadline]
+
     def print_summary(self):
         """
         Print summary information for simulation
         :return: None
 
-        Worst Case Runtime Complexity: O(1)
+        Worst Case Runtime Complexity: O(N)
         Best Case Runtime Complexity: O(1)
         """
         print(f"Total Distance: {self._total_miles:.2f} Miles")
 
-        late_packages = 0
+        late_packages = self.get_late_packages()
         print("-------------------------------------------------------------------------------------------------------")
         print("Late Packages:")
-        for package in self._packages:
-            if package.time_delivered is not None and package.time_delivered > package.deadline:
-                late_packages += 1
-                package.print(self._start_time)
-        print(f"Total Late Packages: {late_packages}")
+        for package in late_packages:
+            package.print(self._start_time)
+        print(f"Total Late Packages: {len(late_packages)}")
         print("-------------------------------------------------------------------------------------------------------")
         print("Undelivered Packages:")
-        undelivered_packages = 0
-        for package in self._packages:
-            if package.status != "DELIVERED":
-                undelivered_packages += 1
-                package.print(self._start_time)
-        print(f"Total Undelivered Packages: {undelivered_packages}")
+        undelivered_packages = self._packages.without_status("DELIVERED")
+        for package in undelivered_packages:
+            package.print(self._start_time)
+        print(f"Total Undelivered Packages: {len(undelivered_packages)}")
+        if self._planned_late_packages:
+            print(f"Packages planned to be late: {', '.join(str(x.package_id) for x in self._planned_late_packages)}")
+        if self._unassigned_packages:
+            print("Packages no truck could take:")
+            for package, reason in self._unassigned_packages:
+                print(f"\tPackage {package.package_id}: {reason}")
         print("-------------------------------------------------------------------------------------------------------")
         print(f"Total distance traveled: {self._total_miles:.2f} miles")
-        print(f"Packages delivered: {self._packages.num_items}")
+        print(f"Packages delivered: {len(self._packages.with_status('DELIVERED'))}")
         duration = Clock.total_duration(self._clock.time)
         print(f"Duration: {duration[0]} Hours {duration[1]} Minutes {duration[2]} Seconds")
 
     def advance_simulation(self, time_amount):
         """
         Move simulation forward
+        The clock jumps from one scheduled event to the next instead of stepping one second at a time
         :param time_amount: amount of time to move simulation forward
         :return: None
 
-        Worst Case Runtime Complexity: O(N^2)
-        Best Case Runtime Complexity: O(N^2)
+        Worst Case Runtime Complexity: O(E log E) (E is number of events)
+        Best Case Runtime Complexity: O(1)
         """
-        # Run simulation for amount of time selected in clock menu
-        while self._clock.time < time_amount and not self.simulation_over:
-
-            # advance time forward
-            self._clock.advance_time()
-
-            # Fix wrong address package if current time is 10:20 AM or later
-            # Worst Case Runtime Complexity: O(1)
-            # Best Case Runtime Complexity: O(1)
-            if self._clock.time >= Clock.seconds_since_start("10:20 AM", self._start_time) \
-                    and not self.wrong_address_fixed:
-                new_location = Location("410 S State St", "Salt Lake City", "UT", "84111", "")
-                self._packages.search(9).location = new_location
-                self.wrong_address_fixed = True
-                print(f"{Clock.to_time_string(self._clock.time, self._start_time)} : Package 9 address changed to {new_location}")
-
-            # for each truck update truck and package data
-            # Worst Case Runtime Complexity: O(N)
-            # Best Case Runtime Complexity: O(N)
-            for truck in self._active_trucks:
-
-                # move truck for one second
-                self._total_miles += truck.move_truck()
-
-                # if truck distance is greater or equal to distance to next location
-                if truck.distance_traveled >= truck.next_location[1]:
-
-                    # deliver packages for current location
-                    # Worst Case Runtime Complexity: O(N)
-                    # Best Case Runtime Complexity: O(N)
-                    delivered_packages = [x for x in truck.get_package_list() if x.location == truck.next_location[0].data]
-                    for package in delivered_packages:
-                        truck.deliver_package(package)
-                        # set status of delivered package to delivered
-                        self._packages.search(package.package_id).status = "DELIVERED"
-
-                        # set time delivered for delivered package to current time
-                        self._packages.search(package.package_id).time_delivered = self._clock.time
-
-                        # Display information about current delivery
-                        print(f"{Clock.to_time_string(self._clock.time, self._start_time)} : Package {package.package_id} "
-                              f"delivered to {truck.next_location[0].data.name}, {truck.next_location[0].data}")
-
-                        # wait a short time so that delivery activity can be read more easily
-                        time.sleep(.2)
-
-                    # Get truck's next location
-                    truck.get_next_location(self._clock.time)
-
-                    # if truck's route is done, remove it from active trucks
-                    if truck.is_route_done():
-                        self._active_trucks.remove(truck)
-
-            # When delayed packages arrive send out second truck
-            if self._clock.time >= self._delayed_flight_time and not self._delayed_packages_departed:
-                self._active_trucks.append(self._trucks.pop())
-                self._delayed_packages_departed = True
-                self._active_trucks[-1].start_route(self._clock.time)
+        # Handle every event scheduled up to the time selected in clock menu
+        while not self.simulation_over and not self._events.is_empty() and self._events.peek().time <= time_amount:
+            current_time = self._events.peek().time
+            self._clock.advance_to(current_time)
+
+            # Handle all events that happen at the current time
+            # Worst Case Runtime Complexity: O(N log E)
+            # Best Case Runtime Complexity: O(log E)
+            while not self._events.is_empty() and self._events.peek().time == current_time:
+                self._handle_event(self._events.pop())
 
             # If active trucks is less than 2 and delayed packages have left send out next truck
             if self._delayed_packages_departed and len(self._active_trucks) < 2 and not self._trucks.is_empty():
-                self._active_trucks.append(self._trucks.pop())
-                self._active_trucks[-1].start_route(self._clock.time)
+                self._dispatch_truck()
+
+                # Only one truck leaves per second, check again next second if still short on trucks
+                if len(self._active_trucks) < 2 and not self._trucks.is_empty():
+                    self._schedule_event(Event(current_time + 1, Event.DISPATCH_CHECK))
 
             # If not more active trucks, end simulation
             if len(self._active_trucks) == 0:
                 self.simulation_over = True
-                self.print_summary()
-                break
+                if self.verbose:
+                    self.print_summary()
+
+        if not self.simulation_over:
+            self._clock.advance_to(time_amount)
+
+    def _schedule_event(self, event):
+        """
+        Add an event to the event queue
+        :param event: event to be scheduled :Event
+        :return: None
+
+        Worst Case Runtime Complexity: O(log E)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._events.push(event)
+
+    def _dispatch_truck(self):
+        """
+        Send out next truck in truck queue and schedule its first arrival
+        :return: None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        truck = self._trucks.pop()
+        self._active_trucks.append(truck)
+        self._dispatch_count += 1
+        truck.dispatch_order = self._dispatch_count
+        truck.start_route(self._clock.time)
+        self._schedule_event(Event(truck.arrival_time(), Event.TRUCK_ARRIVAL, truck, truck.dispatch_order))
+
+    def _handle_event(self, event):
+        """
+        Update truck and package data for a single event
+        :param event: event to be handled :Event
+        :return: None
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(1)
+        """
+        # Fix wrong address package
+        # Worst Case Runtime Complexity: O(1)
+        # Best Case Runtime Complexity: O(1)
+        if event.event_type == Event.ADDRESS_CORRECTION:
+            new_location = self.location_registry.intern(*CORRECTED_ADDRESS)
+            package = self._packages.search(CORRECTED_PACKAGE_ID)
+            old_location = package.location
+            package.location = new_location
+
+            # Package is now unloaded at its new stop
+            truck = self._trucks_by_id.get(package.truck)
+            if truck is not None and truck.is_on_truck(package.package_id):
+                truck.package_moved(package, old_location)
+            self.wrong_address_fixed = True
+            if self.verbose:
+                print(f"{Clock.to_time_string(self._clock.time, self._start_time)} : "
+                      f"Package {CORRECTED_PACKAGE_ID} address changed to {new_location}")
+
+        # Truck reached next location on its route
+        # Worst Case Runtime Complexity: O(N)
+        # Best Case Runtime Complexity: O(N)
+        elif event.event_type == Event.TRUCK_ARRIVAL:
+            truck = event.truck
+
+            # Truck stood still after this event was scheduled, arrival is later
+            arrival = truck.arrival_time()
+            if arrival > self._clock.time:
+                self._schedule_event(Event(arrival, Event.TRUCK_ARRIVAL, truck, truck.dispatch_order))
+                return
+
+            # Total distance is speed added once for every second any truck drove, all trucks drive at the same speed
+            self._truck_seconds += truck.drive_until(self._clock.time)
+            self._total_miles = accumulated_distance(truck.speed, self._truck_seconds)
+
+            # deliver packages for current location
+            delivered_packages = truck.unload_packages(truck.next_location[0].data.location_id)
+            for package in delivered_packages:
+                # set status of delivered package to delivered
+                self._packages.search(package.package_id).status = "DELIVERED"
+
+                # set time delivered for delivered package to current time
+                self._packages.search(package.package_id).time_delivered = self._clock.time
+
+                if self.verbose:
+                    # Display information about current delivery
+                    print(f"{Clock.to_time_string(self._clock.time, self._start_time)} : Package {package.package_id} "
+                          f"delivered to {truck.next_location[0].data.name}, {truck.next_location[0].data}")
+
+                    # wait a short time so that delivery activity can be read more easily
+                    time.sleep(.2)
+
+            # Get truck's next location
+            truck.get_next_location(self._clock.time)
+
+            # if truck's route is done, remove it from active trucks, otherwise schedule next arrival
+            # The truck after a finished truck in active trucks does not move this second
+            if truck.is_route_done():
+                index = self._active_trucks.index(truck)
+                self._active_trucks.remove(truck)
+                if index < len(self._active_trucks):
+                    self._active_trucks[index].stand_still(self._clock.time)
+            else:
+                self._schedule_event(Event(truck.arrival_time(), Event.TRUCK_ARRIVAL, truck, truck.dispatch_order))
+
+        # When delayed packages arrive send out second truck
+        elif event.event_type == Event.FLIGHT_ARRIVAL:
+            if not self._delayed_packages_departed:
+                self._delayed_packages_departed = True
+                self._dispatch_truck()
@@ -1,14 +1,18 @@
+import math
+import time
+
 from data_structures.graph import Graph, Vertex
+from data_structures.matrix import ListMatrix, SubMatrix
 from data_structures.queue import Queue
 from .clock import Clock
-from .location import Location
+from .routing import RoutingOptions
 
 
 class Truck:
     """
     Truck class to hold packages and deliver to destination
     """
-    def __init__(self, truck_id, package_limit, speed, start_of_day, hub_location):
+    def __init__(self, truck_id, package_limit, speed, start_of_day, hub_location, verbose=True):
         """
         Create Truck Object
         :param truck_id: id of the truck :int
@@ -16,6 +20,7 @@ class Truck:
         :param speed: speed of truck in miles per hour :int
         :param start_of_day: time of start of day :str
         :param hub_location: location of hub :Location
+        :param verbose: print route activity as it happens :bool
         :return: Truck Object
 
         Worst Case Runtime Complexity: O(1)
@@ -24,16 +29,32 @@ class Truck:
         self._id = truck_id
         self._package_limit = package_limit
         self._speed = (speed / 60) / 60  # truck speed in miles per second
-        self._locations = Graph()
-        self._packages = []
+        self._locations = Graph()  # replaced by a view of the full distance matrix in set_locations
+        self._packages = {}  # package id -> package, in loading order
+        self._packages_by_location = {}  # location id -> {package id: package} for packages due there
+        self._extra_stops = []  # locations to plan a stop at that no package is due at yet
         self._start_of_day = start_of_day
         self._locations.add_vertex(hub_location.name, hub_location)
         self._route = Queue()
         self._departure_time = None  # departure time in seconds since start
+        self._seconds_stopped = 0  # seconds since departure the truck did not move
+        self._seconds_driven = 0
+        self._earliest_arrival = None  # first second truck can reach its next location
         self._distance_traveled = 0.0
         self._current_location = None
         self._next_location = None
         self._route_done = False
+        self._verbose = verbose
+        self.distance_saved = 0.0  # distance removed from nearest neighbor route by route planning
+        self.planned_distance = 0.0  # length of planned route, set by find_route
+        self.route_method = None  # how route was planned, set by find_route
+        self.route_solve_time = 0.0  # seconds spent planning route
+        self.lateness_removed = 0.0  # seconds of lateness removed by deadline aware routing
+        self.planned_departure = 0  # departure time the route was planned for, set by find_route
+        self.stop_slack = []  # (location, seconds before earliest deadline) for each stop, set by find_route
+        self._planned_arrivals = {}  # location id -> planned arrival time, set by find_route
+        self._solved_route = None  # (vertex indexes, distance saved, route method, seconds) from solve_route
+        self.dispatch_order = None  # order truck left the hub, set by simulation
 
     @property
     def truck_id(self):
@@ -88,12 +109,14 @@ class Truck:
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
+        self._earliest_arrival = time + 1
         if not self._route.is_empty():
             self._next_location = self._route.pop()
         else:
             self._route_done = True
-            print(f"{Clock.to_time_string(time, self._start_of_day)}: "
-                  f"Truck {self.truck_id} finished route ({self.distance_traveled:.2f} miles driven)")
+            if self._verbose:
+                print(f"{Clock.to_time_string(time, self._start_of_day)}: "
+                      f"Truck {self.truck_id} finished route ({self.distance_traveled:.2f} miles driven)")
 
     def start_route(self, time):
         """
@@ -105,11 +128,13 @@ class Truck:
         Best Case Runtime Complexity: O(N)
         """
         self._next_location = self._route.pop()
-        for package in self._packages:
+        for package in self._packages.values():
             package.status = "EN ROUTE"
         self._departure_time = time
+        self._earliest_arrival = time + 1
         self._next_location = self._route.pop()
-        print(f"{Clock.to_time_string(time, self._start_of_day)}: Truck {self.truck_id} leaving Hub")
+        if self._verbose:
+            print(f"{Clock.to_time_string(time, self._start_of_day)}: Truck {self.truck_id} leaving Hub")
 
     def get_package_count(self):
         """
@@ -121,18 +146,69 @@ class Truck:
         """
         return len(self._packages)
 
-    def move_truck(self):
+    @property
+    def speed(self):
         """
-        Move truck forward
-        :return: distance moved
+        Read-only truck speed. Cannot be changed after Object creation
+        :return: speed in miles per second :float
 
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
-        if not self._route_done:
-            self._distance_traveled += self._speed
-            return self._speed
-        return 0
+        return self._speed
+
+    def drive_until(self, time):
+        """
+        Move truck forward to the given time
+        Distance is added up one second at a time, the same as a truck moved once every second
+        :param time: current time
+        :return: number of seconds moved :int
+
+        Worst Case Runtime Complexity: O(log T) (T is seconds driven)
+        Best Case Runtime Complexity: O(1)
+        """
+        if self._route_done:
+            return 0
+        seconds = time - self._departure_time - self._seconds_stopped
+        moved = seconds - self._seconds_driven
+        self._seconds_driven = seconds
+        self._distance_traveled = accumulated_distance(self._speed, seconds)
+        return moved
+
+    def stand_still(self, time):
+        """
+        Keep truck where it is for one second, it neither moves nor reaches a location at the given time
+        :param time: current time
+        :return: None
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._seconds_stopped += 1
+        self._earliest_arrival = max(self._earliest_arrival, time + 1)
+
+    def seconds_to_travel(self, distance):
+        """
+        Return number of whole seconds truck must drive to cover given distance
+        :param distance: distance in miles :float
+        :return: smallest number of seconds after which distance driven >= distance :int
+
+        Worst Case Runtime Complexity: O(log T) (T is seconds returned)
+        Best Case Runtime Complexity: O(1)
+        """
+        return seconds_to_accumulate(self._speed, distance)
+
+    def arrival_time(self):
+        """
+        Return time truck arrives at next_location
+        A truck arrives at no more than one location per second
+        :return: arrival time in seconds since start :int
+
+        Worst Case Runtime Complexity: O(log T) (T is seconds driven)
+        Best Case Runtime Complexity: O(1)
+        """
+        return max(self._earliest_arrival, self._departure_time + self._seconds_stopped
+                   + self.seconds_to_travel(self._next_location[1]))
 
     def is_route_done(self):
         """
@@ -149,10 +225,10 @@ class Truck:
         Returns list of packages on truck
         :return: list of packages :List<Package>
 
-        Worst Case Runtime Complexity: O(1)
-        Best Case Runtime Complexity: O(1)
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
         """
-        return self._packages
+        return list(self._packages.values())
 
     def is_on_truck(self, package_id):
         """
@@ -160,13 +236,21 @@ class Truck:
         :param package_id: package_id to search for
         :return: True if package on truck, otherwise False
 
-        Worst Case Runtime Complexity: O(N)
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        return package_id in self._packages
+
+    def packages_at(self, location_id):
+        """
+        Returns packages on truck due at a location
+        :param location_id: id of location :int
+        :return: packages due at the location, in loading order :List<Package>
+
+        Worst Case Runtime Complexity: O(K) (K is number of packages due at the location)
         Best Case Runtime Complexity: O(1)
         """
-        for package in self._packages:
-            if package.package_id == package_id:
-                return True
-        return False
+        return list(self._packages_by_location.get(location_id, {}).values())
 
     def load_package(self, package):
         """
@@ -177,34 +261,66 @@ class Truck:
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
-        self._packages.append(package)
+        self._packages[package.package_id] = package
+        location_id = package.location.location_id
+        if location_id not in self._packages_by_location:
+            self._packages_by_location[location_id] = {}
+        self._packages_by_location[location_id][package.package_id] = package
 
-    def set_locations(self, locations_graph):
+    def package_moved(self, package, old_location):
         """
-        Populate _locations graph with package locations and set edges for the graph
-        :param locations_graph: Graph with locations data for all locations
+        Move package to the stop for its new location after its address changed
+        :param package: package on truck whose location changed :Package
+        :param old_location: location of package before the change :Location
         :return: Void
 
-        Worst Case Runtime Complexity: O(N^2)
-        Best Case Runtime Complexity: O(N^2)
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
         """
-        for package in self._packages:
-            if package.location not in map(lambda x: x.data, self._locations.get_vertex_list()):
-                for vertex in locations_graph.get_vertex_list():
-                    if vertex.data == package.location:
-                        self._locations.add_vertex(vertex.data.name, vertex.data)
-                        break
+        stop = self._packages_by_location.get(old_location.location_id)
+        if stop is not None:
+            stop.pop(package.package_id, None)
+            if not stop:
+                del self._packages_by_location[old_location.location_id]
+        self.load_package(package)
 
-        for location in map(lambda x: x.data, self._locations.get_vertex_list()):
-            # index in truck graph
-            index = self._locations.get_vertex_list().index(self._locations.get_vertex(location.name))
+    def add_stop(self, location):
+        """
+        Plan a stop at a location no package on the truck is due at yet, such as a corrected address
+        Must be called before set_locations
+        :param location: location to stop at :Location
+        :return: Void
 
-            # index in graph of all locations
-            all_locations_index = locations_graph.get_vertex_list().index(locations_graph.get_vertex(location.name))
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._extra_stops.append(location)
 
-            for num, loc in enumerate(map(lambda x: x.data, self._locations.get_vertex_list())):
-                cur_index = locations_graph.get_vertex(loc.name).index
-                self._locations.adjacency_matrix[index][num] = locations_graph.adjacency_matrix[all_locations_index][cur_index]
+    def set_locations(self, locations_graph):
+        """
+        Create _locations graph of the hub and package locations
+        Its distances are a view of locations_graph's matrix, no distances are copied
+        Raises ValueError if a package or stop location is not in locations_graph
+        :param locations_graph: Graph with locations data for all locations, vertex index is location id
+        :return: Void
+
+        Worst Case Runtime Complexity: O(N) (N is number of packages)
+        Best Case Runtime Complexity: O(N)
+        """
+        # locations of truck graph vertices, in vertex order, starting with the hub
+        locations = [self._locations.get_vertex_by_index(0).data]
+        added = {locations[0].location_id}
+        for location in [package.location for package in self._packages.values()] + self._extra_stops:
+            location_id = location.location_id
+            if location_id is None or location_id >= locations_graph.size:
+                raise ValueError(f"Location is not in the distance table: {location}")
+            if location_id not in added:
+                added.add(location_id)
+                locations.append(locations_graph.get_vertex_by_index(location_id).data)
+
+        self._locations = Graph(SubMatrix(locations_graph.matrix, [x.location_id for x in locations]))
+        for location in locations:
+            self._locations.add_vertex(location.name, location)
 
     def deliver_package(self, package):
         """
@@ -215,23 +331,136 @@ class Truck:
         Worst Case Runtime Complexity: O(1)
         Best Case Runtime Complexity: O(1)
         """
-        return self._packages.pop(self._packages.index(package)).package_id
+        location_id = package.location.location_id
+        stop = self._packages_by_location.get(location_id)
+        if stop is not None:
+            stop.pop(package.package_id, None)
+            if not stop:
+                del self._packages_by_location[location_id]
+        return self._packages.pop(package.package_id).package_id
+
+    def unload_packages(self, location_id):
+        """
+        Remove every package due at a location from the truck
+        :param location_id: id of location truck is stopped at :int
+        :return: packages unloaded, in loading order :List<Package>
+
+        Worst Case Runtime Complexity: O(K) (K is number of packages unloaded)
+        Best Case Runtime Complexity: O(1)
+        """
+        stop = self._packages_by_location.pop(location_id, None)
+        if stop is None:
+            return []
+        for package_id in stop:
+            del self._packages[package_id]
+        return list(stop.values())
+
+    def get_planned_late_packages(self):
+        """
+        Returns packages on truck that the planned route reaches after their deadline
+        :return: packages planned to be late :List<Package>
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        return [package for package in self._packages.values()
+                if self._planned_arrivals.get(package.location.location_id, -math.inf) > package.deadline]
+
+    def route_location_ids(self):
+        """
+        Returns location ids of the planned route, starting and ending at the hub
+        Must be called after find_route and before start_route
+        :return: location ids in visiting order, empty if no route is planned :List<int>
+
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
+        """
+        return [vertex.data.location_id for vertex, distance in self._route]
 
     def print_packages(self):
-        for package in self._packages:
+        for package in self._packages.values():
             package.print(self._start_of_day)
 
-    def find_route(self):
+    def find_route(self, options=None, departure_time=0):
         """
-        Calculate delivery route
+        Calculate delivery route, replacing any route planned before
+        With deadline_aware routing, stops reached after their earliest deadline are moved earlier where that
+        removes lateness, and the time left before each stop's deadline is kept in stop_slack
+        :param options: route planning settings, defaults are used if None :RoutingOptions
+        :param departure_time: time truck is expected to leave the hub in seconds since start :int
         :return: Void
 
-        Worst Case Runtime Complexity: O(N^2)
+        Worst Case Runtime Complexity: O(2^T * T^2) (T is exact_threshold)
+        Best Case Runtime Complexity: O(N^2 log K) (K is neighbor_candidates)
+        """
+        if options is None:
+            options = RoutingOptions()
+        self.solve_route(options)
+        self.finish_route(options, departure_time)
+
+    def solve_route(self, options):
+        """
+        Shortest route through the truck's stops, the part of find_route that does not depend on departure time
+        The route is kept until finish_route turns it into the truck's planned route
+        :param options: route planning settings :RoutingOptions
+        :return: Void
+
+        Worst Case Runtime Complexity: O(2^T * T^2) (T is exact_threshold)
+        Best Case Runtime Complexity: O(N^2 log K) (K is neighbor_candidates)
+        """
+        self.set_solved_route(solve_tour(self._locations, self._stop_deadlines(), self._speed, options))
+
+    def route_problem(self):
+        """
+        Everything solve_route needs, small enough to send to another process: the truck's own distances,
+        the earliest deadline at each stop and the truck's speed
+        :return: distance rows, vertex index -> deadline, speed in miles per second :3-tuple
+
+        Worst Case Runtime Complexity: O(N^2) (N is number of stops)
         Best Case Runtime Complexity: O(N^2)
         """
-        # Worst Case Runtime Complexity: O(N^2)
-        # Best Case Runtime Complexity: O(N^2)
-        route = self._locations.calculate_tour(self._locations.get_vertex_list()[0])
+        rows = [list(self._locations.matrix.row(index)) for index in range(self._locations.size)]
+        return rows, self._stop_deadlines(), self._speed
+
+    def set_solved_route(self, solved_route):
+        """
+        Use a route solved from this truck's route_problem, as if solve_route had found it
+        :param solved_route: vertex indexes in route order, distance saved, route method, seconds spent :4-tuple
+        :return: Void
+
+        Worst Case Runtime Complexity: O(1)
+        Best Case Runtime Complexity: O(1)
+        """
+        self._solved_route = solved_route
+        self.route_method = solved_route[2]
+
+    def finish_route(self, options, departure_time=0):
+        """
+        Turn the route found by solve_route into the truck's planned route for a departure time,
+        can be called again when the expected departure time changes
+        :param options: route planning settings :RoutingOptions
+        :param departure_time: time truck is expected to leave the hub in seconds since start :int
+        :return: Void
+
+        Worst Case Runtime Complexity: O(I * L * N * (N + K)) (L is number of late stops)
+        Best Case Runtime Complexity: O(N)
+        """
+        finish_start = time.perf_counter()
+        order, self.distance_saved, self.route_method, solve_time = self._solved_route
+        route = Queue(self._locations.get_vertex_by_index(index) for index in order)
+        self._route = Queue()
+
+        # Worst Case Runtime Complexity: O(I * L * N * (N + K))
+        # Best Case Runtime Complexity: O(N)
+        self.lateness_removed = 0.0
+        if options.deadline_aware:
+            distance = self._locations.tour_distance(route)
+            route, self.lateness_removed = self._locations.repair_time_windows(
+                route, self._stop_deadlines(), self._speed, departure_time, options.improve_iterations,
+                options.improve_time_limit, options.neighbor_candidates)
+            self.distance_saved -= self._locations.tour_distance(route) - distance
+        self.route_solve_time = solve_time + time.perf_counter() - finish_start
+
         start = route.peek()
         total_distance = 0.0
         last_location = start
@@ -241,107 +470,195 @@ class Truck:
             total_distance += distance
             self._route.push((current_location, total_distance))
             last_location = current_location
+        self.planned_distance = total_distance
+        self.planned_departure = departure_time
 
-    @staticmethod
-    def sort_packages(packages, trucks, start_of_day, end_of_day):
+        # Seconds between planned arrival and earliest deadline at each stop, negative when late
+        # Worst Case Runtime Complexity: O(N)
+        # Best Case Runtime Complexity: O(N)
+        deadlines = self._stop_deadlines()
+        self._planned_arrivals = {}
+        self.stop_slack = []
+        for vertex, distance in self._route:
+            if vertex.index in deadlines and vertex.data.location_id not in self._planned_arrivals:
+                arrival = departure_time + self.seconds_to_travel(distance)
+                self._planned_arrivals[vertex.data.location_id] = arrival
+                self.stop_slack.append((vertex.data, deadlines[vertex.index] - arrival))
+
+    def _stop_deadlines(self):
         """
-        Sort packages into trucks
-        :param packages: list of packages to load
-        :param trucks: list of trucks
-        :param start_of_day: start of day time
-        :param end_of_day: end of day time
-        :return: trucks with packages loaded :List<Truck>
+        Earliest deadline of the packages due at each stop
+        :return: truck graph vertex index -> deadline in seconds since start :dict
 
-        Worst Case Runtime Complexity: O(N^2)
-        Best Case Runtime Complexity: O(N^2)
+        Worst Case Runtime Complexity: O(N)
+        Best Case Runtime Complexity: O(N)
         """
+        location_deadlines = {}
+        for package in self._packages.values():
+            location_id = package.location.location_id
+            if package.deadline < location_deadlines.get(location_id, math.inf):
+                location_deadlines[location_id] = package.deadline
+        deadlines = {}
+        for vertex in self._locations.get_vertex_list():
+            if vertex.data.location_id in location_deadlines:
+                deadlines[vertex.index] = location_deadlines[vertex.data.location_id]
+        return deadlines
 
-        # Load packages that must be on same truck onto truck 1 along with any packages with same address
-        # Worst Case Runtime Complexity: O(N^2)
-        # Best Case Runtime Complexity: O(N^2)
-        same_truck_packages = []
-        for package in filter(lambda x: x.special_instructions.startswith("Must be delivered with"), packages):
-            deliver_with = package.special_instructions[23:].split(", ")
-            if package not in same_truck_packages:
-                same_truck_packages.append(package)
 
-            for cur_package in filter(lambda x: str(x.package_id) in deliver_with, packages):
-                if cur_package not in same_truck_packages:
-                    same_truck_packages.append(cur_package)
+def accumulated_distance(speed, seconds):
+    """
+    Distance driven in the given number of seconds, added up one second at a time in floating point
+    :param speed: speed in miles per second :float
+    :param seconds: number of seconds driven :int
+    :return: distance in miles :float
 
-        # Worst Case Runtime Complexity: O(N)
-        # Best Case Runtime Complexity: O(N)
-        same_locations = []
-        for package in same_truck_packages:
-            if package.location not in same_locations:
-                same_locations.append(package.location)
-            package.truck = 1
-            trucks[0].load_package(package)
-            packages.remove(package)
+    Worst Case Runtime Complexity: O(log T) (T is seconds)
+    Best Case Runtime Complexity: O(1)
+    """
+    return _accumulate(speed, seconds, math.inf)[1]
 
-        # Worst Case Runtime Complexity: O(N)
-        # Best Case Runtime Complexity: O(N)
-        found_packages = []
-        for package in packages:
-            if package.location in same_locations and not package.has_special_instructions():
-                found_packages.append(package)
 
-        # Worst Case Runtime Complexity: O(N)
-        # Best Case Runtime Complexity: O(N)
-        for package in found_packages:
-            package.truck = 1
-            trucks[0].load_package(package)
-            packages.remove(package)
+def seconds_to_accumulate(speed, distance):
+    """
+    Seconds needed for distance added up one second at a time to reach the given distance
+    :param speed: speed in miles per second :float
+    :param distance: distance in miles :float
+    :return: smallest number of seconds for which accumulated_distance(speed, seconds) >= distance :int
 
-        # Load remaining packages with special instructions
-        # Worst Case Runtime Complexity: O(N)
-        # Best Case Runtime Complexity: O(N)
-        for package in filter(lambda x: x.has_special_instructions(), packages):
-            if package.special_instructions == "Wrong address listed":
-                package.truck = len(trucks)
-                trucks[-1].load_package(package)
-                packages.remove(package)
-
-                for pckg in packages:
-                    new_location = Location("410 S State St", "Salt Lake City", "UT", "84111")
-                    if pckg.location == new_location and pckg.deadline == Clock.seconds_since_start(end_of_day, start_of_day):
-                        pckg.truck = len(trucks)
-                        trucks[-1].load_package(pckg)
-                        packages.remove(pckg)
-
-            elif package.special_instructions.startswith("Delayed on flight"):
-                package.truck = 2
-                trucks[1].load_package(package)
-                packages.remove(package)
-
-            elif package.special_instructions.startswith("Can only be on truck") and package in packages:
-                package.truck = int(package.special_instructions[-1])
-                trucks[int(package.special_instructions[-1]) - 1].load_package(package)
-                packages.remove(package)
-
-        # Load packages with no deadline onto truck 3
-        # Worst Case Runtime Complexity: O(N)
-        # Best Case Runtime Complexity: O(N)
-        no_deadline = []
-        for package in filter(lambda x: not x.deadline < Clock.seconds_since_start(end_of_day, start_of_day), packages):
-            no_deadline.append(package)
-
-        for package in no_deadline:
-            if len(trucks[-1]._packages) < 16:
-                package.truck = len(trucks)
-                trucks[-1].load_package(package)
-                packages.remove(package)
-            else:
-                package.truck = len(trucks) - 1
-                trucks[-2].load_package(package)
-                packages.remove(package)
-
-        current_truck = 0
-        while len(packages) > 0:
-            while current_truck < 3 and trucks[current_truck].get_package_count() < 16 and len(packages) > 0:
-                packages[-1].truck = current_truck + 1
-                trucks[current_truck].load_package(packages[-1])
-                packages.remove(packages[-1])
-            current_truck += 1
-
-        return trucks
+    Worst Case Runtime Complexity: O(log T) (T is seconds returned)
+    Best Case Runtime Complexity: O(1)
+    """
+    return _accumulate(speed, math.inf, distance)[0]
+
+
+def _accumulate(speed, max_seconds, target):
+    """
+    Add speed to a running total once per second until max_seconds have passed or the total reaches target
+    While the total stays in one power of two range every addition rounds to the same step, so runs of seconds
+    are added at once and only the seconds crossing into the next range are added one at a time
+    :param speed: speed in miles per second :float
+    :param max_seconds: most seconds to add :int
+    :param target: distance to stop at :float
+    :return: seconds added, total distance :2-tuple
+
+    Worst Case Runtime Complexity: O(log T) (T is seconds added)
+    Best Case Runtime Complexity: O(1)
+    """
+    range_units = 2 ** 53  # units of one ulp in a power of two range
+    seconds = 0
+    distance = 0.0
+    while seconds < max_seconds and distance < target:
+        if distance > 0:
+            ulp = math.ulp(distance)
+            ratio = speed / ulp
+
+            # a tie rounds to even and alternates between steps, add those one at a time
+            if ratio < range_units and ratio - math.floor(ratio) != 0.5:
+                step = round(ratio)
+                if step == 0:
+                    # total no longer grows
+                    return (max_seconds if target == math.inf else math.inf), distance
+                units = int(distance / ulp)
+                count = min((range_units - 1 - units) // step, max_seconds - seconds)
+                if target != math.inf:
+                    count = min(count, -((units - math.ceil(target / ulp)) // step))
+                if count > 0:
+                    seconds += count
+                    distance = float(units + count * step) * ulp
+                    continue
+        seconds += 1
+        distance += speed
+    return seconds, distance
+
+
+def solve_tour(locations, deadlines, speed, options):
+    """
+    Shortest tour from vertex 0 through every vertex of a graph and back
+    Nearest neighbor, then exact for few enough vertices or shortened by local search, then driven in the direction
+    where the latest vertex is least late
+    :param locations: graph of the stops, vertex 0 is the hub :Graph
+    :param deadlines: vertex index -> earliest deadline in seconds since start :dict
+    :param speed: speed in miles per second :float
+    :param options: route planning settings :RoutingOptions
+    :return: vertex indexes in route order, distance saved, route method, seconds spent :4-tuple
+
+    Worst Case Runtime Complexity: O(2^T * T^2) (T is exact_threshold)
+    Best Case Runtime Complexity: O(N^2 log K) (K is neighbor_candidates)
+    """
+    solve_start = time.perf_counter()
+    hub = locations.get_vertex_list()[0]
+
+    # Worst Case Runtime Complexity: O(N^2)
+    # Best Case Runtime Complexity: O(N^2 log K)
+    route = locations.calculate_tour(hub, options.neighbor_candidates)
+
+    # Few enough stops for an exact route, otherwise shorten nearest neighbor route with local search
+    # Worst Case Runtime Complexity: O(2^T * T^2)
+    # Best Case Runtime Complexity: O(1)
+    if locations.size - 1 <= options.exact_threshold:
+        nearest_neighbor_distance = locations.tour_distance(route)
+        route = locations.calculate_exact_tour(hub)
+        distance_saved = nearest_neighbor_distance - locations.tour_distance(route)
+        route_method = "exact"
+    elif options.improve_iterations > 0:
+        route, distance_saved = locations.improve_tour(route, options.improve_iterations, options.improve_time_limit,
+                                                       options.neighbor_candidates)
+        route_method = "improved"
+    else:
+        distance_saved = 0.0
+        route_method = "nearest neighbor"
+
+    if route_method != "nearest neighbor":
+        route = _choose_direction(locations, route, deadlines, speed)
+    return [vertex.index for vertex in route], distance_saved, route_method, time.perf_counter() - solve_start
+
+
+def solve_route_problem(problem, options):
+    """
+    Solve a route from a truck's route_problem, such as in a worker process
+    :param problem: distance rows, vertex index -> deadline, speed in miles per second :3-tuple
+    :param options: route planning settings :RoutingOptions
+    :return: solved route for the truck's set_solved_route :4-tuple
+
+    Worst Case Runtime Complexity: O(2^T * T^2) (T is exact_threshold)
+    Best Case Runtime Complexity: O(N^2 log K) (K is neighbor_candidates)
+    """
+    rows, deadlines, speed = problem
+    locations = Graph(ListMatrix())
+    for index in range(len(rows)):
+        locations.add_vertex(index)
+    for index, row in enumerate(rows):
+        locations.matrix.set_row(index, row)
+    return solve_tour(locations, deadlines, speed, options)
+
+
+def _choose_direction(locations, route, deadlines, speed):
+    """
+    A tour is the same length in either direction, so drive it in the direction
+    where the latest package is least late
+    Lateness is measured as if the truck left at start of day, the departure time
+    shifts both directions equally so it does not change which is chosen
+    :param locations: graph of the stops :Graph
+    :param route: Queue of vertices starting and ending at the hub
+    :param deadlines: vertex index -> earliest deadline in seconds since start :dict
+    :param speed: speed in miles per second :float
+    :return: route in the chosen direction :Queue
+
+    Worst Case Runtime Complexity: O(N)
+    Best Case Runtime Complexity: O(N)
+    """
+    vertices = list(route)
+
+    def worst_lateness(order):
+        worst = -math.inf
+        distance = 0.0
+        for num in range(1, len(order)):
+            distance += locations.get_edge_weight(order[num - 1], order[num])
+            if order[num].index in deadlines:
+                worst = max(worst, distance / speed - deadlines[order[num].index])
+        return worst
+
+    if worst_lateness(vertices[::-1]) < worst_lateness(vertices):
+        vertices.reverse()
+
+    return Queue(vertices)